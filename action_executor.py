@@ -0,0 +1,119 @@
+"""
+Action Executor - Run character actions with classified error handling
+Classifies API errors by code and retries or skips each class correctly,
+so recoverable errors never count as failed hunts
+"""
+import random
+import threading
+import time
+from api_client import endpoint_class, install_middleware
+from metrics import metrics
+from rate_limiter import parse_retry_after, parse_status_code
+from trace_recorder import trace_span
+
+# Error classes
+COOLDOWN = 'cooldown'
+ALREADY_AT_DESTINATION = 'already_at_destination'
+INVENTORY_FULL = 'inventory_full'
+TRANSIENT = 'transient'
+FATAL = 'fatal'
+
+# Status codes the game uses for each recoverable class
+COOLDOWN_CODES = {486, 499}
+ALREADY_AT_DESTINATION_CODES = {490}
+INVENTORY_FULL_CODES = {497}
+TRANSIENT_CODES = {408, 429, 500, 502, 503, 504, 520, 522, 524}
+
+def classify_error(error):
+    """Map an exception raised by an API call to one of the error classes"""
+    code = parse_status_code(error)
+
+    if code in COOLDOWN_CODES:
+        return COOLDOWN
+    if code in ALREADY_AT_DESTINATION_CODES or "already at destination" in str(error).lower():
+        return ALREADY_AT_DESTINATION
+    if code in INVENTORY_FULL_CODES:
+        return INVENTORY_FULL
+    if code in TRANSIENT_CODES:
+        return TRANSIENT
+    # Network failures (requests' exceptions are OSError subclasses) never carry a status code
+    if code is None and isinstance(error, OSError):
+        return TRANSIENT
+    return FATAL
+
+class ActionExecutor:
+    """Execute actions, retrying or skipping each error class appropriately"""
+
+    def __init__(self, api, max_attempts=4, backoff_base=1.0, backoff_max=20.0):
+        self.api = api
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.stats = {COOLDOWN: 0, ALREADY_AT_DESTINATION: 0, INVENTORY_FULL: 0, TRANSIENT: 0, FATAL: 0}
+        self._local = threading.local()
+
+        # The executor owns the retry policy for actions it runs: stop the wrapper's blind retries
+        install_middleware(api, 'action_executor', self._middleware)
+
+    def _middleware(self, call_next, method, endpoint, **kwargs):
+        if getattr(self._local, 'active', False) and endpoint_class(endpoint) == 'actions':
+            kwargs['retries'] = 0
+        return call_next(method, endpoint, **kwargs)
+
+    def _resync(self):
+        """Refresh the character from the server after an error"""
+        try:
+            self.api.get_character()
+        except Exception:
+            pass
+
+    def _backoff(self, attempt):
+        """Jittered exponential backoff for transient errors"""
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return random.uniform(self.backoff_base / 2, ceiling)
+
+    def run(self, action_name, action_func, *args, **kwargs):
+        """Run an action; returns a result dict with ok, outcome, error_class, result and attempts"""
+        with trace_span(action_name, 'action') as span:
+            outcome = self._run(action_name, action_func, *args, **kwargs)
+            span.update(outcome=outcome['outcome'], attempts=outcome['attempts'])
+            return outcome
+
+    def _run(self, action_name, action_func, *args, **kwargs):
+        attempt = 0
+        while True:
+            attempt += 1
+            self._local.active = True
+            try:
+                result = action_func(*args, **kwargs)
+                return {'ok': True, 'outcome': 'done', 'error_class': None, 'result': result, 'attempts': attempt}
+            except Exception as e:
+                error_class = classify_error(e)
+                error = e
+            finally:
+                self._local.active = False
+
+            self.stats[error_class] += 1
+            metrics.incr(f"actions.{action_name}.{error_class}")
+
+            if error_class == ALREADY_AT_DESTINATION:
+                return {'ok': True, 'outcome': 'skipped', 'error_class': error_class, 'result': None, 'attempts': attempt}
+
+            if error_class == INVENTORY_FULL:
+                return {'ok': False, 'outcome': 'inventory_full', 'error_class': error_class, 'error': error,
+                        'result': None, 'attempts': attempt}
+
+            if error_class == FATAL or attempt >= self.max_attempts:
+                return {'ok': False, 'outcome': 'failed', 'error_class': error_class, 'error': error,
+                        'result': None, 'attempts': attempt}
+
+            # Recoverable: resync with the server's view of the character before retrying
+            self._resync()
+            if error_class == COOLDOWN:
+                # The wrapper waits on the refreshed cooldown_expiration; honour an explicit hint too
+                delay = parse_retry_after(error) or 0
+            else:
+                delay = self._backoff(attempt)
+            if delay > 0:
+                with trace_span('action.retry_wait', 'wait', error_class=error_class):
+                    time.sleep(delay)
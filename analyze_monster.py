@@ -1,11 +1,10 @@
 """
 Combat Analysis - Analyze monster and character stats
 """
-from artifactsmmo_wrapper import wrapper, logger
-from config import config
+from artifactsmmo_wrapper import logger
+from api_client import connect
 
-wrapper.token = config.token
-api = wrapper.character(config.character_name)
+api = connect()
 logger.setLevel("INFO")
 
 # Get Yellow Slime stats - api.monsters.get() returns a single Monster, not a list
@@ -0,0 +1,91 @@
+"""
+API Client - Character API setup and request middleware
+Every script builds its character client here so all API traffic passes
+through the project's shared request middleware (cooldowns, tracing, etc.)
+and the shared transport's rate limiter
+"""
+from config import config
+
+# Positional arguments of ArtifactsAPI._make_request after (method, endpoint)
+REQUEST_ARGS = ('json', 'source', 'retries', 'include_headers')
+
+class ApiError(Exception):
+    """Error response from the API, carrying its HTTP status code"""
+
+    def __init__(self, code, message, retry_after=None):
+        super().__init__(message)
+        self.code = code
+        self.retry_after = retry_after
+
+def endpoint_class(endpoint):
+    """Classify an endpoint as 'actions' (character actions) or 'data' (everything else)"""
+    return 'actions' if '/action/' in f"/{endpoint.strip('/')}/" else 'data'
+
+def install_middleware(api, name, middleware):
+    """Wrap api._make_request so every request passes through middleware
+
+    The middleware is called as middleware(call_next, method, endpoint, **kwargs)
+    and must return the response. Installing the same name twice is a no-op.
+    """
+    installed = api.__dict__.setdefault('_middleware', [])
+    if name in installed:
+        return False
+
+    call_next = api._make_request
+
+    def _make_request(method, endpoint, *args, **kwargs):
+        kwargs.update(zip(REQUEST_ARGS, args, strict=False))
+        return middleware(call_next, method, endpoint, **kwargs)
+
+    # The wrapper's own retries call self._make_request, so they go through the chain too
+    api._make_request = _make_request
+    installed.append(name)
+    return True
+
+def install_error_handling(api):
+    """Raise ApiError (with the status code) for error responses
+
+    The wrapper's own exception classes fail while logging themselves and surface
+    as a TypeError, which hides the status code from callers.
+    """
+    from http_transport import get_transport
+
+    def _raise(code, message):
+        # Already at destination: the wrapper only logs this one
+        if code == 490:
+            return
+        # The server's Retry-After header, which the wrapper's message leaves out
+        retry_after = get_transport().take_retry_after() if code == 429 else None
+        raise ApiError(code, message, retry_after)
+
+    api._raise = _raise
+
+def connect(character_name=None):
+    """Create a character API client with the shared middleware installed"""
+    from artifactsmmo_wrapper import wrapper
+    from cooldown_tracker import install_cooldown_tracker
+    from fleet_supervisor import install_heartbeat
+    from http_transport import install_transport
+    from rate_limiter import install_rate_limiter
+    from shared_cache import enable_wrapper_wal, get_shared_cache, install_shared_cache
+    from single_flight import install_single_flight
+    from state_mirror import install_state_mirror
+    from trace_recorder import install_tracer
+
+    # Installed first so the client's initial character fetch already uses the pool and the limiter
+    install_transport()
+    install_rate_limiter()
+    wrapper.token = config.token
+    api = wrapper.character(character_name or config.character_name)
+    install_error_handling(api)
+    install_cooldown_tracker(api)
+    install_state_mirror(api)
+    install_heartbeat(api)
+    enable_wrapper_wal()
+    if config.shared_cache_file:
+        install_shared_cache(api, get_shared_cache(config.shared_cache_file))
+    # Outermost, so coalesced calls don't take rate-limit tokens
+    install_single_flight(api)
+    # Outermost of all, so a call's span covers its rate-limit stall and cooldown wait
+    install_tracer(api)
+    return api
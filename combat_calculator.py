@@ -2,14 +2,22 @@
 Combat Calculator - Evaluate fight outcomes before engaging
 Calculates win probability based on attack/defense stats, not just level
 """
-from artifactsmmo_wrapper import wrapper, logger
-from config import config
+from timings import FIGHT_SECONDS, MOVE_SECONDS_PER_TILE, TASK_ACTION_SECONDS
+import json
+import time
+
+# Ranking weight for each win probability bucket
+PROB_WEIGHT = {'HIGH': 3, 'MEDIUM': 2, 'LOW': 1}
+
+def _distance(a, b):
+    return abs(a.x - b.x) + abs(a.y - b.y)
 
 class CombatCalculator:
     """Calculate combat outcomes and win probabilities"""
     
-    def __init__(self, api):
+    def __init__(self, api, calibration=None):
         self.api = api
+        self.calibration = calibration
     
     def calculate_damage(self, attacker_stats, defender_resistances):
         """Calculate total damage per turn"""
@@ -44,13 +52,27 @@ class CombatCalculator:
         if not monster:
             return None
         
+        return self.analyze_monster(monster)
+    
+    def analyze_monster(self, monster, char=None):
+        """Analyze combat against an already-loaded monster (defaults to the live character)"""
+        if char is None:
+            char = self.api.char
+        
         # Calculate damage per turn
-        char_damage = self.calculate_damage(self.api.char, monster)
-        monster_damage = self.calculate_damage(monster, self.api.char)
+        raw_char_damage = self.calculate_damage(char, monster)
+        raw_monster_damage = self.calculate_damage(monster, char)
+        
+        # Correct the formula with what real fights against this monster showed
+        char_damage, monster_damage = raw_char_damage, raw_monster_damage
+        if self.calibration is not None:
+            char_factor, monster_factor = self.calibration.factors(monster.code)
+            char_damage = max(1, round(raw_char_damage * char_factor))
+            monster_damage = max(1, round(raw_monster_damage * monster_factor))
         
         # Calculate turns to kill
         char_turns_to_kill = max(1, monster.hp // char_damage) if char_damage > 0 else 999
-        monster_turns_to_kill = max(1, self.api.char.hp // monster_damage) if monster_damage > 0 else 999
+        monster_turns_to_kill = max(1, char.hp // monster_damage) if monster_damage > 0 else 999
         
         # Determine win probability
         if char_turns_to_kill < monster_turns_to_kill:
@@ -67,16 +89,22 @@ class CombatCalculator:
             'monster': monster,
             'char_damage_per_turn': char_damage,
             'monster_damage_per_turn': monster_damage,
+            'raw_char_damage': raw_char_damage,
+            'raw_monster_damage': raw_monster_damage,
             'char_turns_to_kill': char_turns_to_kill,
             'monster_turns_to_kill': monster_turns_to_kill,
             'win_probability': win_prob,
             'can_win': can_win,
-            'hp_ratio': self.api.char.hp / monster.hp if monster.hp > 0 else 1,
+            'hp_ratio': char.hp / monster.hp if monster.hp > 0 else 1,
             'damage_ratio': char_damage / monster_damage if monster_damage > 0 else 999
         }
     
-    def find_winnable_monsters(self, level_range=None, max_distance=20):
-        """Find monsters the character can actually beat"""
+    def find_winnable_monsters(self, level_range=None, max_distance=20, monsters=None, locations_by_code=None):
+        """Find monsters the character can actually beat
+        
+        monsters and locations_by_code (e.g. from warmup.warm_up) are used instead
+        of looking each monster and its tiles up when given.
+        """
         if level_range is None:
             min_level = max(1, self.api.char.level - 2)
             max_level = self.api.char.level + 1
@@ -84,7 +112,10 @@ class CombatCalculator:
             min_level, max_level = level_range
         
         # Get monsters in level range
-        all_monsters = self.api.monsters.get(min_level=min_level, max_level=max_level)
+        if monsters is not None:
+            all_monsters = [m for m in monsters if min_level <= m.level <= max_level]
+        else:
+            all_monsters = self.api.monsters.get(min_level=min_level, max_level=max_level)
         if not hasattr(all_monsters, '__iter__'):
             all_monsters = [all_monsters] if all_monsters else []
         
@@ -93,12 +124,15 @@ class CombatCalculator:
         
         for monster in all_monsters:
             # Analyze combat
-            analysis = self.analyze_combat(monster.code)
+            analysis = self.analyze_monster(monster) if monsters is not None else self.analyze_combat(monster.code)
             if not analysis or not analysis['can_win']:
                 continue
             
             # Find locations
-            locations = self.api.maps.get(content_code=monster.code)
+            if locations_by_code is not None:
+                locations = locations_by_code.get(monster.code)
+            else:
+                locations = self.api.maps.get(content_code=monster.code)
             if not locations:
                 continue
             
@@ -125,15 +159,114 @@ class CombatCalculator:
         
         # Sort by win probability and distance
         def sort_key(m):
-            prob_weight = {'HIGH': 3, 'MEDIUM': 2, 'LOW': 1}[m['analysis']['win_probability']]
+            prob_weight = PROB_WEIGHT[m['analysis']['win_probability']]
             return (prob_weight, -m['distance'])  # High prob first, then close distance
         
         winnable_monsters.sort(key=sort_key, reverse=True)
         return winnable_monsters
     
-    def print_combat_analysis(self, monster_code):
-        """Print detailed combat analysis"""
-        analysis = self.analyze_combat(monster_code)
+    def task_status(self, char=None):
+        """Active monster task: code, progress, remaining kills and reward, or None"""
+        char = char or self.api.char
+        if not char.task or char.task_type != 'monsters':
+            return None
+
+        task = self.api.tasks.get(code=char.task)
+        rewards = getattr(task, 'rewards', None) if task else None
+        if isinstance(rewards, str):
+            rewards = json.loads(rewards)
+        if rewards is not None and not isinstance(rewards, dict):
+            rewards = {'gold': rewards.gold, 'items': rewards.items}
+
+        return {
+            'code': char.task,
+            'progress': char.task_progress,
+            'total': char.task_total,
+            'remaining': max(0, char.task_total - char.task_progress),
+            'rewards': rewards or {'gold': 0, 'items': []},
+        }
+
+    def task_masters(self):
+        """Tiles where monster tasks are accepted and turned in"""
+        return self.api.maps.get(content_type="tasks_master", content_code="monsters") or []
+
+    def plan_task(self, value_index=None, deadline=None, char=None):
+        """Plan the rest of the active monster task and its reward per second
+
+        The kill tile is the one with the least travel from here to it and on to
+        the task master. Returns None without a winnable monster task.
+        """
+        char = char or self.api.char
+        task = self.task_status(char)
+        if not task:
+            return None
+
+        monster = self.api.monsters.get(code=task['code'])
+        masters = self.task_masters()
+        if not monster or not masters:
+            return None
+        analysis = self.analyze_monster(monster, char)
+
+        value_of = value_index.value_of if value_index else (lambda code: 1)
+        per_kill = value_index.value_per_kill(monster.code) if value_index else (monster.min_gold + monster.max_gold) / 2
+        fight_seconds = value_index.fight_seconds.get(monster.code, FIGHT_SECONDS) if value_index else FIGHT_SECONDS
+
+        steps = []
+        travel = 0
+        position = char.pos
+        if task['remaining'] > 0:
+            # Cheapest kill tile for the whole trip, not just the nearest one
+            tiles = self.api.maps.get(content_code=monster.code) or []
+            if not tiles:
+                return None
+            tile = min(tiles, key=lambda t: _distance(position, t) + min(_distance(t, m) for m in masters))
+            travel += _distance(position, tile)
+            steps += [{'action': 'move', 'location': tile}, {'action': 'fight', 'count': task['remaining']}]
+            position = tile
+
+        master = min(masters, key=lambda m: _distance(position, m))
+        travel += _distance(position, master)
+        steps += [{'action': 'move', 'location': master}, {'action': 'complete'}]
+
+        reward = task['rewards'].get('gold', 0) + sum(item['quantity'] * value_of(item['code'])
+                                                      for item in task['rewards'].get('items', []))
+        seconds = travel * MOVE_SECONDS_PER_TILE + task['remaining'] * fight_seconds + TASK_ACTION_SECONDS
+        value = reward + task['remaining'] * per_kill
+
+        return dict(task, **{
+            'monster': monster,
+            'analysis': analysis,
+            'steps': steps,
+            'seconds': seconds,
+            'value': value,
+            'value_per_second': value / seconds if seconds > 0 else 0,
+            'feasible': analysis['can_win'] and (deadline is None or time.time() + seconds <= deadline),
+        })
+
+    def choose_task(self, free_target=None, value_index=None, deadline=None, plan=None):
+        """Task plan if finishing the active task beats free farming, else None
+
+        plan is an earlier plan_task result to compare instead of planning again.
+        """
+        if plan is None:
+            plan = self.plan_task(value_index=value_index, deadline=deadline)
+        if not plan or not plan['feasible']:
+            return None
+        if free_target is None:
+            return plan
+
+        code = free_target['monster'].code
+        travel = free_target['distance'] * MOVE_SECONDS_PER_TILE
+        if value_index:
+            free_rate = value_index.value_per_second(code, travel)
+        else:
+            monster = free_target['monster']
+            free_rate = (monster.min_gold + monster.max_gold) / 2 / (FIGHT_SECONDS + travel)
+        return plan if plan['value_per_second'] >= free_rate else None
+
+    def print_combat_analysis(self, monster_code, analysis=None):
+        """Print detailed combat analysis (looked up unless already given)"""
+        analysis = analysis or self.analyze_combat(monster_code)
         if not analysis:
             print(f"❌ Could not analyze {monster_code}")
             return
@@ -155,8 +288,8 @@ class CombatCalculator:
 # Global calculator instance
 def get_combat_calculator():
     """Get a combat calculator instance"""
-    wrapper.token = config.token
-    api = wrapper.character(config.character_name)
+    from api_client import connect
+    api = connect()
     return CombatCalculator(api)
 
 if __name__ == "__main__":
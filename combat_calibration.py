@@ -0,0 +1,109 @@
+"""
+Combat Calibration - Learn per-monster corrections from real fight results
+Compares each fight's turns, HP lost and outcome with what the formula
+predicted, keeps per-monster damage correction factors and persists them so
+CombatCalculator can apply them at prediction time
+"""
+import json
+import math
+import os
+import threading
+
+CALIBRATION_FILE = 'db/combat_calibration.json'
+
+# Correction factors are kept within these bounds so one odd fight can't dominate
+MIN_FACTOR = 0.2
+MAX_FACTOR = 5.0
+
+def fight_details(response):
+    """The fight block of a fight response, or None"""
+    data = response.get('data') if isinstance(response, dict) else None
+    fight = data.get('fight') if isinstance(data, dict) else None
+    return fight if isinstance(fight, dict) else None
+
+class CombatCalibration:
+    """Per-monster multipliers for predicted character and monster damage"""
+
+    def __init__(self, path=CALIBRATION_FILE, alpha=0.3, save_every=10):
+        self.path = path
+        self.alpha = alpha
+        self.save_every = save_every
+        self._lock = threading.Lock()
+        self._unsaved = 0
+        self.monsters = {}
+        if os.path.exists(path):
+            try:
+                with open(path) as f:
+                    self.monsters = json.load(f)
+            except ValueError:
+                self.monsters = {}
+
+    def factors(self, monster_code):
+        """(character damage factor, monster damage factor) for a monster"""
+        entry = self.monsters.get(monster_code)
+        if entry is None:
+            return 1.0, 1.0
+        return entry['char_factor'], entry['monster_factor']
+
+    def _blend(self, previous, sample):
+        sample = min(MAX_FACTOR, max(MIN_FACTOR, sample))
+        return previous + self.alpha * (sample - previous)
+
+    def record(self, monster, analysis, hp_before, response, hp_after=None):
+        """Feed a fight result back into the monster's correction factors
+
+        analysis is the prediction made before the fight; hp_after defaults to
+        the HP reported in the response's character snapshot.
+        """
+        fight = fight_details(response)
+        if not fight or not fight.get('turns'):
+            return None
+
+        if hp_after is None:
+            character = response['data'].get('character') or {}
+            hp_after = character.get('hp', hp_before)
+
+        won = fight.get('result') == 'win'
+        turns = fight['turns']
+        # The character strikes first, so it gets the odd turns
+        char_turns = math.ceil(turns / 2)
+        monster_turns = max(1, turns // 2)
+        damage_taken = hp_before if not won else max(0, hp_before - hp_after)
+
+        with self._lock:
+            entry = self.monsters.setdefault(monster.code, {
+                'char_factor': 1.0, 'monster_factor': 1.0, 'fights': 0, 'losses': 0, 'mispredicted': 0
+            })
+            entry['fights'] += 1
+            if not won:
+                entry['losses'] += 1
+            if won != analysis['can_win']:
+                entry['mispredicted'] += 1
+
+            # Damage dealt is only known when the monster died
+            if won and analysis['raw_char_damage'] > 0:
+                observed = monster.hp / char_turns
+                entry['char_factor'] = self._blend(entry['char_factor'], observed / analysis['raw_char_damage'])
+            if analysis['raw_monster_damage'] > 0 and damage_taken > 0:
+                observed = damage_taken / monster_turns
+                entry['monster_factor'] = self._blend(entry['monster_factor'], observed / analysis['raw_monster_damage'])
+
+            self._unsaved += 1
+            save = self._unsaved >= self.save_every
+        if save:
+            self.save()
+
+        return {'won': won, 'turns': turns, 'damage_taken': damage_taken, 'predicted_win': analysis['can_win']}
+
+    def save(self):
+        """Persist the factors (atomically replacing the file)"""
+        with self._lock:
+            data = json.dumps(self.monsters)
+            self._unsaved = 0
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, 'w') as f:
+            f.write(data)
+        os.replace(tmp, self.path)
@@ -12,8 +12,8 @@ class Config:
     """Configuration class that loads settings from environment variables"""
     
     def __init__(self):
-        self.token = os.getenv('ARTIFACTS_TOKEN')
-        self.character_name = os.getenv('CHARACTER_NAME')
+        self._token = os.getenv('ARTIFACTS_TOKEN')
+        self._character_name = os.getenv('CHARACTER_NAME')
         self.log_level = os.getenv('LOG_LEVEL', 'INFO')
         
         # Health management thresholds (as percentages)
@@ -21,15 +21,48 @@ class Config:
         self.health_low = int(os.getenv('HEALTH_LOW', '50'))
         self.health_fight_min = int(os.getenv('HEALTH_FIGHT_MIN', '60'))
         
-        # Validate required settings
-        if not self.token:
-            raise ValueError("ARTIFACTS_TOKEN not found in environment variables. Please check your .env file.")
+        # Client-side rate limits (requests per second and burst size)
+        self.rate_limit_actions = float(os.getenv('RATE_LIMIT_ACTIONS', '2'))
+        self.rate_limit_actions_burst = int(os.getenv('RATE_LIMIT_ACTIONS_BURST', '5'))
+        self.rate_limit_data = float(os.getenv('RATE_LIMIT_DATA', '3.3'))
+        self.rate_limit_data_burst = int(os.getenv('RATE_LIMIT_DATA_BURST', '16'))
+        # Shared state file so several bot processes on one token share the same budget
+        self.rate_limit_file = os.getenv('RATE_LIMIT_FILE', 'db/rate_limit.json')
+        
+        # Structured event log (JSON lines) and whether to also render events on the console
+        self.event_log_file = os.getenv('EVENT_LOG_FILE', 'logs/events.jsonl')
+        self.event_log_console = os.getenv('EVENT_LOG_CONSOLE', 'true').lower() in ('1', 'true', 'yes')
+        # The file rotates at this size (MB), keeping this many old files
+        self.event_log_max_mb = int(os.getenv('EVENT_LOG_MAX_MB', '10'))
+        self.event_log_backups = int(os.getenv('EVENT_LOG_BACKUPS', '5'))
+        
+        # Static game data cache shared by all bot processes on this machine; empty to disable
+        self.shared_cache_file = os.getenv('SHARED_CACHE_FILE', 'db/shared_cache.db')
+        
+        # Fleet supervisor: bot script per character, per-worker memory cap (MB),
+        # and the heartbeat file the supervisor hands each worker (empty outside the supervisor)
+        self.fleet_script = os.getenv('FLEET_SCRIPT', 'continuous_hunter.py')
+        self.fleet_memory_mb = int(os.getenv('FLEET_MEMORY_MB', '400'))
+        self.fleet_heartbeat_file = os.getenv('FLEET_HEARTBEAT_FILE', '')
         
-        if not self.character_name:
+        # Chrome/Perfetto trace of actions, API calls and waits, shared by all bot processes; empty to disable
+        self.trace_file = os.getenv('TRACE_FILE', '')
+    
+    # Credentials are validated when first used, so offline tools (simulation, soak test) run without them
+    @property
+    def token(self):
+        if not self._token:
+            raise ValueError("ARTIFACTS_TOKEN not found in environment variables. Please check your .env file.")
+        return self._token
+    
+    @property
+    def character_name(self):
+        if not self._character_name:
             raise ValueError("CHARACTER_NAME not found in environment variables. Please check your .env file.")
+        return self._character_name
     
     def __repr__(self):
-        return f"Config(character_name='{self.character_name}', log_level='{self.log_level}', token={'*' * 10 + '...' if self.token else 'None'})"
+        return f"Config(character_name='{self._character_name}', log_level='{self.log_level}', token={'*' * 10 + '...' if self._token else 'None'})"
 
 # Create global config instance
 config = Config()
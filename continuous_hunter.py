@@ -2,20 +2,49 @@
 Continuous Smart Hunter - Infinite hunting loop with safety features
 Keeps hunting winnable monsters until manually stopped or no targets found
 """
-from artifactsmmo_wrapper import wrapper, logger
+from artifactsmmo_wrapper import logger
 from config import config
+from api_client import connect
 from combat_calculator import CombatCalculator
+from combat_calibration import CombatCalibration
+from target_ranker import TargetRanker
+from drop_value_index import DropValueIndex
+from speculative_planner import SpeculativePlanner
+from action_executor import ActionExecutor
+from inventory_manager import InventoryManager
+from idle_filler import IdleFiller
+from craft_planner import CraftPlanner
+from event_log import get_event_log
+from fleet_supervisor import get_heartbeat
+from warmup import warm_up, print_warmup
+from trace_recorder import trace_span
 import time
 import signal
 import sys
 
 # Load configuration
-wrapper.token = config.token
-api = wrapper.character(config.character_name)
+api = connect()
 logger.setLevel(config.log_level)
 
-# Create combat calculator
-combat_calc = CombatCalculator(api)
+# Hunt events go through a buffered structured log instead of blocking prints
+log = get_event_log('hunter')
+
+# Create combat calculator, corrected by what past fights actually showed
+calibration = CombatCalibration()
+combat_calc = CombatCalculator(api, calibration=calibration)
+
+# Actions go through the executor so recoverable errors are retried or skipped, not failed
+executor = ActionExecutor(api)
+
+# Banks before the inventory fills, on the cheapest detour of the route
+inventory = InventoryManager(api, executor)
+
+# Loot price refresh: how many stale prices to fetch, and how often (in hunts)
+PRICE_REFRESH_BATCH = 20
+PRICE_REFRESH_EVERY = 25
+
+# How often (in hunts) to check for a game update and pick up changed static data
+STATIC_REFRESH_EVERY = 100
 
 # Global flag for graceful shutdown
 running = True
@@ -23,201 +52,381 @@ running = True
 def signal_handler(sig, frame):
     """Handle Ctrl+C gracefully"""
     global running
-    print(f"\n\n🛑 GRACEFUL SHUTDOWN REQUESTED")
-    print("🔄 Finishing current hunt, then stopping...")
+    log.warning('shutdown.requested', "\n\n🛑 GRACEFUL SHUTDOWN REQUESTED\n🔄 Finishing current hunt, then stopping...")
     running = False
 
 # Register signal handler for Ctrl+C
 signal.signal(signal.SIGINT, signal_handler)
 
 # Health management functions
-def get_health_percentage():
-    """Get current health as a percentage"""
-    if api.char.max_hp == 0:
-        return 100
-    return (api.char.hp / api.char.max_hp) * 100
-
 def needs_healing(threshold=50):
     """Check if character needs healing"""
-    return api.char.hp < api.char.max_hp and get_health_percentage() < threshold
+    return api.char.hp < api.char.max_hp and api.state_mirror.health_percentage() < threshold
 
 def rest_until_healed(target_health_pct=80, max_rest_cycles=10):
     """Rest until health reaches target percentage"""
     if not needs_healing(target_health_pct):
         return True
     
-    print(f"💤 Healing: {api.char.hp}/{api.char.max_hp} ({get_health_percentage():.1f}%) -> {target_health_pct}%")
+    log.info('rest.start', f"💤 Healing: {api.char.hp}/{api.char.max_hp} ({api.state_mirror.health_percentage():.1f}%) -> {target_health_pct}%",
+             hp=api.char.hp, max_hp=api.char.max_hp, target_pct=target_health_pct)
     
     cycles = 0
     while api.char.hp < api.char.max_hp and cycles < max_rest_cycles and running:
         cycles += 1
         initial_hp = api.char.hp
         
-        try:
-            api.actions.rest()
-            healed = api.char.hp - initial_hp
-            health_pct = get_health_percentage()
-            
-            if healed > 0:
-                print(f"   ✅ Rest {cycles}: +{healed} HP ({health_pct:.1f}%)")
-            
-            if health_pct >= target_health_pct:
-                print(f"   🎉 Healing complete!")
-                break
-                
-        except Exception as e:
-            print(f"   ❌ Rest failed: {e}")
+        rest = executor.run('rest', api.actions.rest)
+        if not rest['ok']:
+            log.error('rest.failed', f"   ❌ Rest failed: {rest['error']}", error=str(rest['error']))
+            break
+        
+        healed = api.char.hp - initial_hp
+        health_pct = api.state_mirror.health_percentage()
+        
+        if healed > 0:
+            log.debug('rest.cycle', f"   ✅ Rest {cycles}: +{healed} HP ({health_pct:.1f}%)", cycle=cycles, healed=healed, hp_pct=health_pct)
+        
+        if health_pct >= target_health_pct:
+            log.info('rest.done', "   🎉 Healing complete!", cycles=cycles, hp=api.char.hp)
             break
     
-    return get_health_percentage() >= target_health_pct
+    return api.state_mirror.health_percentage() >= target_health_pct
 
-def continuous_hunt(max_distance=20, rest_between_hunts=True, no_target_limit=5):
+def gold_gained(starting_gold):
+    """Gold earned this session, including any deposited in the bank"""
+    return api.char.gold + inventory.stats['gold_deposited'] - starting_gold
+
+def visit_task_master(action_name, action_func, location):
+    """Move to a task master and accept or turn in a task"""
+    move = executor.run('move', api.actions.move, location.x, location.y)
+    if not move['ok']:
+        log.error('task.move_failed', f"❌ Move to task master failed: {move['error']}", error=str(move['error']))
+        return False
+    result = executor.run(action_name, action_func)
+    if not result['ok']:
+        log.error('task.failed', f"❌ Task {action_name} failed: {result['error']}", action=action_name, error=str(result['error']))
+    return result['ok']
+
+def continuous_hunt(max_distance=20, rest_between_hunts=True, no_target_limit=5, do_tasks=True, task_deadline=None):
     """Continuously hunt monsters until stopped"""
     global running
     
     print(f"🔄 CONTINUOUS SMART HUNTER")
     print("="*60)
     print(f"🎮 Character: {config.character_name} (Level {api.char.level})")
-    print(f"💚 Health: {api.char.hp}/{api.char.max_hp} ({get_health_percentage():.1f}%)")
+    print(f"💚 Health: {api.char.hp}/{api.char.max_hp} ({api.state_mirror.health_percentage():.1f}%)")
     print(f"📍 Position: ({api.char.pos.x}, {api.char.pos.y})")
     print(f"🎯 Max Distance: {max_distance} tiles")
     print(f"⚠️  Press Ctrl+C to stop gracefully")
     
-    # Track statistics
-    total_hunts = 0
-    successful_hunts = 0
-    failed_hunts = 0
+    # Track statistics (a restart under the fleet supervisor carries on with the previous run's session)
+    heartbeat = get_heartbeat()
+    resumed = heartbeat.resume_state() if heartbeat else {}
+    total_hunts = resumed.get('total_hunts', 0)
+    successful_hunts = resumed.get('successful_hunts', 0)
+    failed_hunts = resumed.get('failed_hunts', 0)
     no_target_count = 0
-    starting_gold = api.char.gold
+    starting_gold = resumed.get('starting_gold', api.char.gold)
     starting_level = api.char.level
+    if resumed:
+        log.info('hunt.resumed', f"♻️  Resuming session after restart: {total_hunts} hunts so far", **resumed)
+    
+    # Bank, inventory and static data are fetched concurrently before the first decision
+    warm = warm_up(api, combat_calc)
+    print_warmup(warm)
     
-    # Initial health check
-    if needs_healing(80):
-        print(f"\n💚 INITIAL HEALING")
-        if not rest_until_healed(85):
-            print("❌ Could not heal enough for hunting")
-            return False
+    # Target ranking is kept between hunts and only updated for what changed
+    # Expected loot per monster from cached Grand Exchange prices breaks ties between equally safe targets
+    loot_index = DropValueIndex(api, monsters=warm['monsters'])
+    loot_index.refresh_prices(limit=PRICE_REFRESH_BATCH)
+    ranker = TargetRanker(combat_calc, max_distance=max_distance, value_index=loot_index)
+    ranker.update(warm['char'])
+    planner = SpeculativePlanner(ranker)
+    recalibrated = set()
+    
+    # Gathering, crafting, banking or travelling fills the slots where no monster is worth hunting
+    # (built the first time it is needed: most sessions never run out of targets)
+    filler = None
+    
+    # Task masters are static; the task plan is kept until the task, its progress or the position changes
+    task_masters = combat_calc.task_masters() if do_tasks else []
+    planned_task = None
+    cached_task_plan = None
+    
+    # A game update only re-indexes the monsters and tiles that actually changed
+    shared_cache = getattr(api, 'shared_cache', None)
+    static_changed = set()
+    if shared_cache:
+        from shared_cache import changed_codes
+        def on_static_change(kind, changes):
+            codes = changed_codes(kind, changes)
+            if kind == 'monsters':
+                loot_index.update_monsters(codes)
+            if kind in ('monsters', 'maps'):
+                static_changed.update(codes)
+        shared_cache.subscribe(on_static_change)
+    
+    # Calibration learned this session is kept however the loop ends
+    try:
+        # Initial health check
+        if needs_healing(80):
+            log.info('rest.initial', "\n💚 INITIAL HEALING")
+            if not rest_until_healed(85):
+                log.error('rest.insufficient', "❌ Could not heal enough for hunting")
+                return False
     
-    print(f"\n🚀 STARTING CONTINUOUS HUNT...")
-    print(f"   🛑 Will stop after {no_target_limit} consecutive 'no targets found'")
+        log.info('hunt.start', f"\n🚀 STARTING CONTINUOUS HUNT...\n   🛑 Will stop after {no_target_limit} consecutive 'no targets found'",
+                 character=api.char.name, level=api.char.level, max_distance=max_distance)
     
-    while running:
-        total_hunts += 1
-        print(f"\n🎯 HUNT #{total_hunts}")
-        print("-" * 40)
+        while running:
+            total_hunts += 1
+            log.debug('hunt.begin', f"\n🎯 HUNT #{total_hunts}\n" + "-" * 40, hunt=total_hunts)
         
-        # Check if we should stop
-        if not running:
-            print("🛑 Stopping due to shutdown request...")
-            break
+            # Check if we should stop
+            if not running:
+                log.info('hunt.stopping', "🛑 Stopping due to shutdown request...")
+                break
+        
+            # Pick up a monster task when a task master is within reach
+            if do_tasks and not api.char.task:
+                masters = [m for m in task_masters
+                           if abs(m.x - api.char.pos.x) + abs(m.y - api.char.pos.y) <= max_distance]
+                if masters:
+                    master = min(masters, key=lambda m: abs(m.x - api.char.pos.x) + abs(m.y - api.char.pos.y))
+                    log.info('task.accepting', f"📜 Accepting a monster task at ({master.x}, {master.y})...")
+                    if visit_task_master('accept_task', api.actions.taskmaster_accept_task, master):
+                        log.info('task.accepted', f"   Task: {api.char.task_total}x {api.char.task}",
+                                 task=api.char.task, total=api.char.task_total)
+        
+            # Find winnable monsters
+            log.debug('hunt.analyzing', "🔍 Analyzing available monsters...")
+            best_target = planner.resolve()
+        
+            # Fights since the last plan moved the calibration: re-analyze those monsters
+            if recalibrated:
+                planner.invalidate(recalibrated, reanalyze=True)
+                recalibrated.clear()
+                best_target = planner.best()
+        
+            # Game updates: one bot process refreshes the shared cache, every bot re-ranks what changed
+            if shared_cache and total_hunts % STATIC_REFRESH_EVERY == 0:
+                try:
+                    shared_cache.ensure_current(api)
+                except Exception as e:
+                    log.warning('static.refresh_failed', f"⚠️  Static data refresh failed: {e}", error=str(e))
+                shared_cache.poll()
+                if static_changed:
+                    log.info('static.changed', f"🔄 Game data changed for {len(static_changed)} monsters/locations",
+                             codes=sorted(static_changed))
+                    planner.invalidate_static(static_changed)
+                    static_changed.clear()
+                    task_masters = combat_calc.task_masters() if do_tasks else []
+                    planned_task = None
+                    best_target = planner.best()
         
-        # Find winnable monsters
-        print("🔍 Analyzing available monsters...")
-        winnable_monsters = combat_calc.find_winnable_monsters(max_distance=max_distance)
+            # Keep prices fresh a few items at a time; only monsters dropping those items are re-ranked
+            if total_hunts % PRICE_REFRESH_EVERY == 0:
+                # Observed fight cooldowns also move loot per second
+                changed = loot_index.refresh_prices(limit=PRICE_REFRESH_BATCH) | set(loot_index.fight_seconds)
+                if changed:
+                    planner.invalidate(changed)
+                    best_target = planner.best()
         
-        if not winnable_monsters:
-            no_target_count += 1
-            print(f"❌ No winnable monsters found! ({no_target_count}/{no_target_limit})")
+            # Work the active task instead when its reward per second beats free farming
+            # (re-planned only when the task or its progress changed, or after a fight moved the character)
+            if do_tasks:
+                task_key = (api.char.task, api.char.task_progress, api.char.task_total)
+                if task_key != planned_task:
+                    cached_task_plan = combat_calc.plan_task(value_index=loot_index, deadline=task_deadline)
+                    planned_task = task_key
+            task_plan = (combat_calc.choose_task(best_target, value_index=loot_index, deadline=task_deadline,
+                                                 plan=cached_task_plan)
+                         if do_tasks and cached_task_plan else None)
+            if task_plan and task_plan['remaining'] == 0:
+                master = task_plan['steps'][0]['location']
+                log.info('task.turning_in', f"📜 Task {task_plan['code']} done - turning in at ({master.x}, {master.y})...")
+                if visit_task_master('complete_task', api.actions.taskmaster_complete_task, master):
+                    log.info('task.completed', f"   ✅ Task complete! Gold: {api.char.gold}", task=task_plan['code'], gold=api.char.gold)
+                continue
+            if task_plan:
+                location = task_plan['steps'][0]['location']
+                log.debug('task.hunting', f"📜 Task: {task_plan['progress']}/{task_plan['total']} {task_plan['code']} "
+                          f"({task_plan['value_per_second']:.2f} value/s vs free farming)",
+                          task=task_plan['code'], progress=task_plan['progress'], total=task_plan['total'],
+                          value_per_second=task_plan['value_per_second'])
+                best_target = {
+                    'monster': task_plan['monster'],
+                    'analysis': task_plan['analysis'],
+                    'location': location,
+                    'distance': abs(location.x - api.char.pos.x) + abs(location.y - api.char.pos.y),
+                    'loot_value': loot_index.value_per_kill(task_plan['code']),
+                }
+        
+            if not best_target:
+                if filler is None:
+                    filler = IdleFiller(api, executor, ranker, inventory, planner=planner,
+                                        crafting=CraftPlanner(api, items=warm['items'], resources=warm['resources'],
+                                                              monsters=warm['monsters']),
+                                        value_of=loot_index.value_of)
+                option = filler.best()
+                if option:
+                    log.info('idle.fill', f"🧺 No target - {option['kind']} {option['label']} "
+                             f"({option['value_per_second']:.2f} value/s) while monsters are re-checked",
+                             hunt=total_hunts, kind=option['kind'], label=option['label'],
+                             value_per_second=option['value_per_second'])
+                    with trace_span(f"idle.{option['kind']}", 'idle', label=option['label']) as span:
+                        span['ok'] = filler.run(option)
+                    if span['ok']:
+                        continue
+                    # A failed fill counts toward giving up and waits like finding nothing
+                    log.error('idle.failed', f"❌ Idle {option['kind']} failed", kind=option['kind'])
             
-            if no_target_count >= no_target_limit:
-                print(f"\n🛑 STOPPING: No winnable targets found {no_target_limit} times in a row")
-                print("💡 Suggestions:")
-                print("   • Increase max_distance parameter")
-                print("   • Improve equipment/level up")
-                print("   • Try gathering resources first")
-                break
+                no_target_count += 1
+                if heartbeat:
+                    heartbeat.set_phase('searching')
+                reason = f"the idle {option['kind']} failed" if option else "nothing else worth doing"
+                log.warning('hunt.no_target', f"❌ No winnable monsters and {reason}! ({no_target_count}/{no_target_limit})",
+                            count=no_target_count, limit=no_target_limit, idle_failed=bool(option))
             
-            # Wait a bit before trying again
-            print("⏳ Waiting 10 seconds before trying again...")
-            for i in range(10):
-                if not running:
+                if no_target_count >= no_target_limit:
+                    log.warning('hunt.giving_up', f"\n🛑 STOPPING: No winnable targets found {no_target_limit} times in a row\n"
+                                "💡 Suggestions:\n"
+                                "   • Increase max_distance parameter\n"
+                                "   • Improve equipment/level up\n"
+                                "   • Try gathering resources first")
                     break
-                time.sleep(1)
-            continue
+            
+                # Wait a bit before trying again
+                log.debug('hunt.waiting', "⏳ Waiting 10 seconds before trying again...")
+                with trace_span('hunt.no_target_wait', 'idle', count=no_target_count):
+                    for i in range(10):
+                        if not running:
+                            break
+                        time.sleep(1)
+                continue
         
-        # Reset no target counter since we found something
-        no_target_count = 0
+            # Reset no target counter since we found something
+            no_target_count = 0
         
-        # Select best target
-        best_target = winnable_monsters[0]
-        monster = best_target['monster']
-        analysis = best_target['analysis']
-        location = best_target['location']
-        distance = best_target['distance']
+            # Unpack best target
+            monster = best_target['monster']
+            analysis = best_target['analysis']
+            location = best_target['location']
+            distance = best_target['distance']
         
-        color = {"HIGH": "🟢", "MEDIUM": "🟡", "LOW": "🔴"}[analysis['win_probability']]
-        print(f"🎯 Target: {monster.name} (Level {monster.level}) {color}")
-        print(f"   Win Probability: {analysis['win_probability']}")
-        print(f"   Location: ({location.x}, {location.y}) - Distance: {distance}")
-        print(f"   Expected Turns: {analysis['char_turns_to_kill']} to win")
+            color = {"HIGH": "🟢", "MEDIUM": "🟡", "LOW": "🔴"}[analysis['win_probability']]
+            log.info('hunt.target', f"🎯 Target: {monster.name} (Level {monster.level}) {color}\n"
+                     f"   Win Probability: {analysis['win_probability']}\n"
+                     f"   Location: ({location.x}, {location.y}) - Distance: {distance}\n"
+                     f"   Expected Turns: {analysis['char_turns_to_kill']} to win\n"
+                     f"   Expected Loot: {best_target['loot_value']:.1f} gold/kill",
+                     hunt=total_hunts, monster=monster.code, win_probability=analysis['win_probability'],
+                     x=location.x, y=location.y, distance=distance, turns=analysis['char_turns_to_kill'],
+                     loot=best_target['loot_value'])
         
-        # Pre-fight health check
-        health_threshold = 70 if analysis['win_probability'] == 'HIGH' else 80
-        if needs_healing(health_threshold):
-            print(f"💚 Pre-fight healing to {health_threshold}%...")
-            if not rest_until_healed(health_threshold + 5):
-                print("❌ Could not heal enough for this fight")
-                failed_hunts += 1
-                continue
+            # Pre-fight health check
+            health_threshold = 70 if analysis['win_probability'] == 'HIGH' else 80
+            if needs_healing(health_threshold):
+                log.debug('rest.pre_fight', f"💚 Pre-fight healing to {health_threshold}%...")
+                if not rest_until_healed(health_threshold + 5):
+                    log.error('rest.insufficient', "❌ Could not heal enough for this fight")
+                    failed_hunts += 1
+                    continue
+        
+            # Bank first if the inventory is predicted to fill before the next fights
+            if inventory.should_bank():
+                log.info('bank.trip', f"🏦 Inventory almost full ({inventory.free_slots()} free) - banking on the way...",
+                         free=inventory.free_slots())
+                if not inventory.bank_trip(next_location=location):
+                    log.error('bank.failed', "❌ Bank trip failed")
         
-        # Move to target
-        print(f"🚶 Moving to {monster.name}...")
-        try:
-            api.actions.move(location.x, location.y)
-            print(f"✅ Arrived at ({api.char.pos.x}, {api.char.pos.y})")
-        except Exception as e:
-            if "already at destination" in str(e).lower():
-                print(f"✅ Already at destination ({api.char.pos.x}, {api.char.pos.y})")
+            # Move to target
+            move = executor.run('move', api.actions.move, location.x, location.y)
+            if move['ok']:
+                log.debug('hunt.moved', f"✅ At ({api.char.pos.x}, {api.char.pos.y})", x=api.char.pos.x, y=api.char.pos.y)
             else:
-                print(f"❌ Move failed: {e}")
+                log.error('hunt.move_failed', f"❌ Move failed: {move['error']}", error=str(move['error']))
                 failed_hunts += 1
                 continue
         
-        # Fight with confidence!
-        print(f"⚔️ Fighting {monster.name} (PREDICTED WIN!)...")
-        try:
-            fight_result = api.actions.fight()
-            print("🏆 Victory! As predicted by combat analysis!")
-            print(f"💰 Gold: {api.char.gold} (+{api.char.gold - starting_gold} total)")
-            
-            # Check for level up
-            if api.char.level > starting_level:
-                print(f"🎉 LEVEL UP! Now Level {api.char.level}")
-                starting_level = api.char.level
+            # Fight with confidence!
+            log.debug('hunt.fighting', f"⚔️ Fighting {monster.name} (PREDICTED WIN!)...")
+            # Plan the next hunt while the fight request and its cooldown are in flight
+            # (predicted after the rest that follows it, so the plan holds when the next hunt starts)
+            planner.speculate(planner.predict_after_fight(api.char, analysis, rest_below=80 if rest_between_hunts else 60))
+            hp_before = api.char.hp
+            fight = executor.run('fight', api.actions.fight)
+            planned_task = None
+            outcome = calibration.record(monster, analysis, hp_before, fight['result']) if fight['ok'] else None
+            if outcome:
+                recalibrated.add(monster.code)
+            if outcome and not outcome['won']:
+                log.warning('fight.lost', f"💀 Defeated by {monster.name} in {outcome['turns']} turns - calibrating the combat model",
+                            monster=monster.code, turns=outcome['turns'], predicted=analysis['win_probability'])
+                failed_hunts += 1
+                rest_until_healed(70)
+            elif fight['ok']:
+                fight_result = fight['result']
+                loot_index.observe_fight(monster.code, fight_result)
+                inventory.observe(fight_result)
+                log.info('fight.won', f"🏆 Victory! 💰 Gold: {api.char.gold} (+{gold_gained(starting_gold)} total) "
+                         f"💚 HP: {api.char.hp}/{api.char.max_hp} ({api.state_mirror.health_percentage():.1f}%)",
+                         monster=monster.code, turns=outcome['turns'] if outcome else None, gold=api.char.gold,
+                         hp=api.char.hp, max_hp=api.char.max_hp)
             
-            print(f"💚 Post-fight HP: {api.char.hp}/{api.char.max_hp} ({get_health_percentage():.1f}%)")
+                # Check for level up
+                if api.char.level > starting_level:
+                    log.info('character.level_up', f"🎉 LEVEL UP! Now Level {api.char.level}", level=api.char.level)
+                    starting_level = api.char.level
             
-            successful_hunts += 1
+                successful_hunts += 1
             
-            # Post-fight healing if needed
-            if needs_healing(60):
-                print(f"💚 Post-fight healing...")
-                rest_until_healed(75)
+                # Post-fight healing if needed
+                if needs_healing(60):
+                    log.debug('rest.post_fight', "💚 Post-fight healing...")
+                    rest_until_healed(75)
                 
-        except Exception as e:
-            print(f"❌ Fight failed unexpectedly: {e}")
-            print("🤔 This shouldn't happen with our combat analysis!")
-            failed_hunts += 1
+            elif fight['outcome'] == 'inventory_full':
+                log.warning('bank.inventory_full', "🎒 Inventory full - banking before the next fight")
+                if not inventory.bank_trip(next_location=location):
+                    log.error('bank.failed', "❌ Bank trip failed")
+            else:
+                log.error('fight.failed', f"❌ Fight failed unexpectedly: {fight['error']}",
+                          monster=monster.code, error=str(fight['error']), error_class=fight['error_class'])
+                failed_hunts += 1
             
-            # Emergency healing
-            if get_health_percentage() < 40:
-                print(f"🚨 Emergency healing...")
-                rest_until_healed(70)
+                # Emergency healing
+                if api.state_mirror.health_percentage() < 40:
+                    log.warning('rest.emergency', "🚨 Emergency healing...")
+                    rest_until_healed(70)
+        
+            # Rest between fights if requested
+            if rest_between_hunts and running:
+                log.debug('rest.between_hunts', "💤 Quick rest between hunts...")
+                rest_until_healed(80)
         
-        # Rest between fights if requested
-        if rest_between_hunts and running:
-            print("💤 Quick rest between hunts...")
-            rest_until_healed(80)
+            if heartbeat:
+                heartbeat.update(total_hunts=total_hunts, successful_hunts=successful_hunts,
+                                 failed_hunts=failed_hunts, starting_gold=starting_gold)
         
-        # Show running statistics every 5 hunts
-        if total_hunts % 5 == 0:
-            success_rate = (successful_hunts / total_hunts) * 100 if total_hunts > 0 else 0
-            print(f"\n📊 RUNNING STATS (Hunt #{total_hunts}):")
-            print(f"   ✅ Successful: {successful_hunts}")
-            print(f"   ❌ Failed: {failed_hunts}")
-            print(f"   📈 Success Rate: {success_rate:.1f}%")
-            print(f"   💰 Gold Gained: {api.char.gold - starting_gold}")
-            print(f"   ⚔️ Current Level: {api.char.level}")
+            # Show running statistics every 5 hunts
+            if total_hunts % 5 == 0:
+                success_rate = (successful_hunts / total_hunts) * 100 if total_hunts > 0 else 0
+                cooldowns = api.cooldown_tracker.report()
+                log.info('hunt.stats', f"\n📊 RUNNING STATS (Hunt #{total_hunts}): ✅ {successful_hunts} ❌ {failed_hunts} "
+                         f"📈 {success_rate:.1f}% 💰 +{gold_gained(starting_gold)} ⚔️ Lvl {api.char.level} "
+                         f"⏱️ idle {cooldowns['idle_per_hour']:.0f}s/h",
+                         hunt=total_hunts, successful=successful_hunts, failed=failed_hunts, success_rate=success_rate,
+                         gold_gained=gold_gained(starting_gold), level=api.char.level,
+                         bank_trips=inventory.stats['bank_trips'], deposit_actions=inventory.stats['deposit_actions'],
+                         plan_hits=planner.stats['hits'], speculations=planner.stats['speculations'],
+                         idle_fills=filler.stats if filler else None,
+                         idle_per_hour=cooldowns['idle_per_hour'], clock_offset=cooldowns['offset'],
+                         margin=cooldowns['margin'])
+    finally:
+        planner.close()
+        calibration.save()
     
     # Final summary
     print(f"\n🏁 CONTINUOUS HUNT COMPLETE!")
@@ -229,9 +438,14 @@ def continuous_hunt(max_distance=20, rest_between_hunts=True, no_target_limit=5)
     
     success_rate = (successful_hunts / total_hunts) * 100 if total_hunts > 0 else 0
     print(f"   Success Rate: {success_rate:.1f}%")
-    print(f"   Gold Gained: {api.char.gold - starting_gold}")
+    print(f"   Gold Gained: {gold_gained(starting_gold)}")
     print(f"   Final Level: {api.char.level}")
-    print(f"   Final HP: {api.char.hp}/{api.char.max_hp} ({get_health_percentage():.1f}%)")
+    print(f"   Final HP: {api.char.hp}/{api.char.max_hp} ({api.state_mirror.health_percentage():.1f}%)")
+    cooldowns = api.cooldown_tracker.report()
+    print(f"   Idle Lost: {cooldowns['idle_seconds']:.1f}s ({cooldowns['idle_per_hour']:.0f}s/hour, {cooldowns['early_rejections']} early rejections)")
+    log.info('hunt.summary', hunts=total_hunts, successful=successful_hunts, failed=failed_hunts,
+             success_rate=success_rate, gold_gained=gold_gained(starting_gold), level=api.char.level,
+             idle_seconds=cooldowns['idle_seconds'], early_rejections=cooldowns['early_rejections'])
     
     if success_rate >= 90:
         print("🎉 EXCELLENT hunting session!")
@@ -257,6 +471,7 @@ if __name__ == "__main__":
     except KeyboardInterrupt:
         print(f"\n🛑 MANUAL STOP REQUESTED")
     except Exception as e:
+        log.error('hunt.crashed', error=repr(e))
         print(f"\n❌ UNEXPECTED ERROR: {e}")
         print("🔄 Try restarting the script")
     
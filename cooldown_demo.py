@@ -1,10 +1,11 @@
-from artifactsmmo_wrapper import wrapper, logger
+from artifactsmmo_wrapper import logger
 from config import config
+from api_client import connect
+from trace_recorder import trace_span
 import time
 
 # Load configuration from .env file
-wrapper.token = config.token
-api = wrapper.character(config.character_name)
+api = connect()
 logger.setLevel("INFO")  # Override to INFO for cleaner output
 
 def perform_action_with_timing(action_name, action_func):
@@ -15,7 +16,8 @@ def perform_action_with_timing(action_name, action_func):
     
     start_time = time.time()
     try:
-        result = action_func()
+        with trace_span(action_name, 'action'):
+            result = action_func()
         end_time = time.time()
         duration = end_time - start_time
         
@@ -0,0 +1,171 @@
+"""
+Cooldown Tracker - Local cooldown prediction with server clock-skew correction
+Tracks cooldown expirations from action responses, continuously estimates the
+server/local clock offset and fires the next action at the predicted expiry
+plus a small adaptive margin
+"""
+from datetime import datetime, timezone
+import threading
+import time
+from artifactsmmo_wrapper.helpers import CooldownManager
+from api_client import endpoint_class, install_middleware
+from metrics import metrics
+from rate_limiter import parse_status_code
+from trace_recorder import trace_wait
+
+def parse_timestamp(value):
+    """Epoch seconds from an ISO 8601 server timestamp, or None"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+class CooldownTracker:
+    """Estimate clock skew and an adaptive safety margin from action responses"""
+
+    def __init__(self, margin=0.15, min_margin=0.03, max_margin=2.0):
+        self._lock = threading.Lock()
+        self.offset = 0.0          # server clock minus local clock, in seconds
+        self.samples = 0
+        self.best_rtt = None
+        self.margin = margin
+        self.min_margin = min_margin
+        self.max_margin = max_margin
+        self.expiry = None         # local time at which the current cooldown really ends
+        self.idle_seconds = 0.0
+        self.early_rejections = 0
+        self.started = time.time()
+
+    def observe_response(self, sent, received, response):
+        """Update offset and expiry from an action response's cooldown block"""
+        data = response.get('data') if isinstance(response, dict) else None
+        cooldown = data.get('cooldown') if isinstance(data, dict) else None
+        if not isinstance(cooldown, dict):
+            return
+
+        started_at = parse_timestamp(cooldown.get('started_at'))
+        expiration = parse_timestamp(cooldown.get('expiration'))
+        rtt = max(0.0, received - sent)
+
+        with self._lock:
+            if started_at is not None:
+                # The server stamped started_at somewhere inside our round trip; assume the middle
+                sample = started_at - (sent + received) / 2
+                if self.best_rtt is None or rtt < self.best_rtt:
+                    self.best_rtt = rtt
+                else:
+                    # Let the best RTT drift up slowly so a lucky sample doesn't dominate forever
+                    self.best_rtt *= 1.01
+                weight = 0.5 if rtt <= self.best_rtt * 1.5 else 0.1
+                self.offset = sample if self.samples == 0 else self.offset + weight * (sample - self.offset)
+                self.samples += 1
+                metrics.gauge('cooldown.clock_offset', self.offset)
+
+            if expiration is not None:
+                self.expiry = expiration - self.offset
+
+            # Accepted action: tighten the margin slowly
+            self.margin = max(self.min_margin, self.margin * 0.9)
+
+    def note_early_rejection(self):
+        """An action was rejected for being on cooldown: widen the margin"""
+        with self._lock:
+            self.early_rejections += 1
+            self.margin = min(self.max_margin, self.margin * 2 + 0.05)
+        metrics.incr('cooldown.early_rejections')
+
+    def ready_time(self, expiration):
+        """Local time at which an action may be sent for a server cooldown expiration"""
+        server_expiry = parse_timestamp(expiration)
+        if server_expiry is None:
+            return None
+        with self._lock:
+            return server_expiry - self.offset + self.margin
+
+    def note_action_sent(self, now):
+        """Account for idle time between the real cooldown expiry and this action"""
+        with self._lock:
+            if self.expiry is not None and now > self.expiry:
+                idle = now - self.expiry
+                self.idle_seconds += idle
+                metrics.observe('cooldown.idle', idle)
+            self.expiry = None
+
+    def report(self):
+        """Offset, margin and idle time lost per hour"""
+        with self._lock:
+            hours = max(time.time() - self.started, 1e-6) / 3600
+            return {
+                'offset': self.offset,
+                'margin': self.margin,
+                'samples': self.samples,
+                'early_rejections': self.early_rejections,
+                'idle_seconds': self.idle_seconds,
+                'idle_per_hour': self.idle_seconds / hours,
+            }
+
+class SkewCorrectedCooldownManager(CooldownManager):
+    """Wrapper cooldown manager that waits on the skew-corrected expiry"""
+
+    def __init__(self, tracker, logger=None):
+        super().__init__()
+        self.tracker = tracker
+        self.logger = logger
+        self._local = threading.local()
+
+    def set_cooldown_from_expiration(self, expiration_time_str):
+        ready = self.tracker.ready_time(expiration_time_str)
+        if ready is None:
+            return super().set_cooldown_from_expiration(expiration_time_str)
+        with self._lock:
+            self._cooldown_expiration_time = datetime.fromtimestamp(ready, timezone.utc)
+
+    def wait_for_cooldown(self, logger=None, char=None):
+        # Data requests aren't subject to the character cooldown: don't hold them back
+        inflight = getattr(self._local, 'inflight', None)
+        if inflight is None or inflight['sent'] is not None:
+            return
+        start = time.time()
+        super().wait_for_cooldown(logger=logger, char=char)
+        inflight['sent'] = time.time()
+        trace_wait('cooldown.wait', 'cooldown', start, inflight['sent'] - start)
+        self.tracker.note_action_sent(inflight['sent'])
+
+    def middleware(self, call_next, method, endpoint, **kwargs):
+        """Request middleware: time action round trips and feed them to the tracker"""
+        if endpoint_class(endpoint) != 'actions':
+            inflight = getattr(self._local, 'inflight', None)
+            # The wrapper refreshes the character right after the action response arrives
+            if inflight is not None and inflight['sent'] is not None and inflight['received'] is None:
+                inflight['received'] = time.time()
+            return call_next(method, endpoint, **kwargs)
+
+        inflight = self._local.inflight = {'sent': None, 'received': None}
+        try:
+            response = call_next(method, endpoint, **kwargs)
+        except Exception as e:
+            if parse_status_code(e) == 499:
+                self.tracker.note_early_rejection()
+            raise
+        finally:
+            self._local.inflight = None
+
+        sent = inflight['sent'] if inflight['sent'] is not None else time.time()
+        received = inflight['received'] if inflight['received'] is not None else time.time()
+        self.tracker.observe_response(sent, received, response)
+        return response
+
+def install_cooldown_tracker(api, tracker=None):
+    """Replace the wrapper's cooldown manager with the skew-corrected one"""
+    existing = getattr(api, 'cooldown_tracker', None)
+    if existing is not None:
+        return existing
+
+    tracker = tracker or CooldownTracker()
+    manager = SkewCorrectedCooldownManager(tracker, logger=getattr(api._cooldown_manager, 'logger', None))
+    api._cooldown_manager = manager
+    install_middleware(api, 'cooldown_tracker', manager.middleware)
+    api.cooldown_tracker = tracker
+    return tracker
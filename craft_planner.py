@@ -0,0 +1,156 @@
+"""
+Craft Planner - Resolve an item's craft tree into an ordered action plan
+Builds the recipe DAG once from api.items, memoizes each item's sub-tree and
+nets requirements against inventory and bank contents to emit the minimal
+withdraw/gather/fight/craft sequence with its estimated cooldown time
+"""
+import json
+import math
+from timings import BANK_SECONDS, CRAFT_SECONDS_PER_UNIT, DEFAULT_GATHER_SECONDS, FIGHT_SECONDS
+
+def _parse(value):
+    """Craft/drop data comes back as JSON text from the wrapper's list queries"""
+    if isinstance(value, str):
+        try:
+            return json.loads(value)
+        except ValueError:
+            return None
+    return value
+
+def drop_table(entity):
+    """Drops of a monster or resource as (code, rate, average quantity)"""
+    drops = []
+    for drop in _parse(entity.drops) or []:
+        if isinstance(drop, dict):
+            code, rate, low, high = drop['code'], drop['rate'], drop['min_quantity'], drop['max_quantity']
+        else:
+            code, rate, low, high = drop.code, drop.rate, drop.min_quantity, drop.max_quantity
+        drops.append((code, max(1, rate), (low + high) / 2))
+    return drops
+
+def bank_contents(api):
+    """All bank items as {code: quantity}, following pagination"""
+    contents = {}
+    page = 1
+    while True:
+        response = api.account.get_bank_items(page=page)
+        for item in response.get('data') or []:
+            contents[item['code']] = contents.get(item['code'], 0) + item['quantity']
+        if page >= (response.get('pages') or 1):
+            return contents
+        page += 1
+
+class CraftPlanner:
+    """Plan the actions needed to obtain an item, from recipes and drop sources"""
+
+    def __init__(self, api, items=None, resources=None, monsters=None):
+        self.api = api
+        self.recipes = {}
+        self.sources = {}
+        self._order = {}
+
+        for item in items if items is not None else api.items.get():
+            craft = _parse(item.craft)
+            if craft and craft.get('items'):
+                self.recipes[item.code] = {
+                    'skill': craft.get('skill'),
+                    'level': craft.get('level'),
+                    'quantity': craft.get('quantity') or 1,
+                    'items': tuple((part['code'], part['quantity']) for part in craft['items']),
+                }
+
+        # Cheapest source per raw item: fewest expected actions per unit. Resources are
+        # read first and a monster only supplies items nothing can be gathered for
+        for kind, entities in (('gather', resources if resources is not None else api.resources.get()),
+                               ('fight', monsters if monsters is not None else api.monsters.get())):
+            for entity in entities or []:
+                for code, rate, quantity in drop_table(entity):
+                    per_action = quantity / rate
+                    current = self.sources.get(code)
+                    if current is None or (current['action'] == kind and per_action > current['per_action']):
+                        self.sources[code] = {'action': kind, 'source': entity.code, 'per_action': per_action}
+
+    def order(self, code):
+        """Item and its ingredients, each before anything it is made from (memoized)"""
+        cached = self._order.get(code)
+        if cached is not None:
+            return cached
+
+        # Reverse post-order of the recipe DAG: an item comes before all its ingredients
+        visited = set()
+        post = []
+        stack = [(code, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if expanded:
+                post.append(node)
+                continue
+            if node in visited:
+                continue
+            visited.add(node)
+            stack.append((node, True))
+            for part, _ in self.recipes.get(node, {}).get('items', ()):
+                if part not in visited:
+                    stack.append((part, False))
+
+        result = self._order[code] = tuple(reversed(post))
+        return result
+
+    def plan(self, code, quantity=1, inventory=None, bank=None):
+        """Ordered steps to end up with quantity of code, and their estimated seconds
+
+        inventory and bank are {code: quantity}; inventory defaults to the character's.
+        Returns {'steps': [...], 'seconds': float, 'missing': [codes with no known source]}.
+        """
+        if inventory is None:
+            inventory = {item.code: item.quantity for item in self.api.char.inventory if item.code}
+        inventory = dict(inventory)
+        bank = dict(bank or {})
+
+        need = {code: quantity}
+        withdraws, obtains, crafts, missing = [], [], [], []
+
+        for node in self.order(code):
+            required = need.pop(node, 0)
+            if required <= 0:
+                continue
+
+            held = min(inventory.get(node, 0), required)
+            inventory[node] = inventory.get(node, 0) - held
+            required -= held
+
+            stored = min(bank.get(node, 0), required)
+            if stored:
+                bank[node] -= stored
+                required -= stored
+                withdraws.append({'action': 'withdraw', 'code': node, 'quantity': stored, 'seconds': BANK_SECONDS})
+            if required <= 0:
+                continue
+
+            recipe = self.recipes.get(node)
+            if recipe:
+                runs = math.ceil(required / recipe['quantity'])
+                for part, per_run in recipe['items']:
+                    need[part] = need.get(part, 0) + runs * per_run
+                # Ingredients come later in the order, so crafts are collected top-down
+                crafts.append({'action': 'craft', 'code': node, 'quantity': runs, 'skill': recipe['skill'],
+                               'level': recipe['level'], 'seconds': runs * CRAFT_SECONDS_PER_UNIT})
+                continue
+
+            source = self.sources.get(node)
+            if source is None:
+                missing.append(node)
+                continue
+            actions = math.ceil(required / source['per_action'])
+            seconds = DEFAULT_GATHER_SECONDS if source['action'] == 'gather' else FIGHT_SECONDS
+            obtains.append({'action': source['action'], 'code': node, 'source': source['source'],
+                            'quantity': required, 'actions': actions, 'seconds': actions * seconds})
+
+        steps = withdraws + obtains + crafts[::-1]
+        return {'steps': steps, 'seconds': sum(step['seconds'] for step in steps), 'missing': missing}
+
+    def craft(self, executor, code, quantity):
+        """Craft quantity runs of an item through the executor; returns its result"""
+        # Not api.actions.craft_item: it ignores the quantity argument
+        return executor.run('craft', self.api._make_request, "POST", f"my/{self.api.char.name}/action/crafting",
+                            json={'code': code, 'quantity': quantity}, source="craft_item")
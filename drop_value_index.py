@@ -0,0 +1,159 @@
+"""
+Drop Value Index - Expected loot value per kill and per cooldown-second
+Combines every monster's drop table with item prices from a locally cached
+Grand Exchange price source, keeps a reverse item -> monsters index so a price
+change only touches the monsters that drop that item, and serves lookups from
+plain dicts
+"""
+import json
+import os
+import time
+import requests
+from api_client import ApiError
+from craft_planner import drop_table
+from metrics import metrics
+from timings import FIGHT_SECONDS
+
+PRICE_FILE = 'db/prices.json'
+
+# Cached prices older than this are refreshed from the Grand Exchange
+PRICE_MAX_AGE = 3600
+
+class PriceCache:
+    """Item prices persisted to a local JSON file"""
+
+    def __init__(self, path=PRICE_FILE, max_age=PRICE_MAX_AGE):
+        self.path = path
+        self.max_age = max_age
+        self.prices = {}
+        if os.path.exists(path):
+            try:
+                with open(path) as f:
+                    self.prices = json.load(f)
+            except ValueError:
+                self.prices = {}
+
+    def price(self, code, default=0):
+        """Cached price of an item; default when it is unknown or nobody sells it"""
+        entry = self.prices.get(code)
+        return entry['price'] if entry and entry['price'] is not None else default
+
+    def stale(self, codes, now=None):
+        """Codes whose cached price is missing or too old"""
+        now = now or time.time()
+        return [code for code in codes if code not in self.prices or now - self.prices[code]['updated'] > self.max_age]
+
+    def set(self, code, price):
+        """Store a price (None: nobody sells it); returns True if it changed"""
+        previous = self.prices.get(code)
+        self.prices[code] = {'price': price, 'updated': time.time()}
+        return previous is None or previous['price'] != price
+
+    def fetch(self, api, code):
+        """Lowest Grand Exchange sell price for an item, or None if nobody sells it"""
+        orders = api.ge.get_sell_orders(item_code=code) or []
+        prices = [order['price'] for order in orders if order.get('price')]
+        return min(prices) if prices else None
+
+    def save(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump(self.prices, f)
+        os.replace(tmp, self.path)
+
+class DropValueIndex:
+    """Expected loot value per monster, updated incrementally as prices change"""
+
+    def __init__(self, api, prices=None, monsters=None):
+        self.api = api
+        self.prices = prices or PriceCache()
+        self.drops = {}
+        self.gold = {}
+        self.monsters_by_item = {}
+        self.per_kill = {}
+        self.fight_seconds = {}
+
+        for monster in monsters if monsters is not None else api.monsters.get():
+            self._add(monster)
+
+    def _add(self, monster):
+        self.drops[monster.code] = {code: quantity / rate for code, rate, quantity in drop_table(monster)}
+        self.gold[monster.code] = (monster.min_gold + monster.max_gold) / 2
+        for item_code in self.drops[monster.code]:
+            self.monsters_by_item.setdefault(item_code, set()).add(monster.code)
+        self.per_kill[monster.code] = self._compute(monster.code)
+
+    def _remove(self, monster_code):
+        for item_code in self.drops.pop(monster_code, {}):
+            self.monsters_by_item.get(item_code, set()).discard(monster_code)
+        self.gold.pop(monster_code, None)
+        self.per_kill.pop(monster_code, None)
+
+    def _compute(self, monster_code):
+        """Expected gold plus item value of one kill"""
+        value = self.gold[monster_code]
+        for item_code, expected in self.drops[monster_code].items():
+            value += expected * self.prices.price(item_code)
+        return value
+
+    def update_monsters(self, monster_codes):
+        """Re-index monsters whose static data changed (e.g. after a game update)"""
+        for code in monster_codes:
+            self._remove(code)
+            monster = self.api.monsters.get(code=code)
+            if monster:
+                self._add(monster)
+        return set(monster_codes)
+
+    def value_per_kill(self, monster_code):
+        """Expected loot value of one kill"""
+        return self.per_kill.get(monster_code, 0.0)
+
+    def value_per_second(self, monster_code, travel_seconds=0):
+        """Expected loot value per second of fight cooldown (plus travel to the fight)"""
+        seconds = self.fight_seconds.get(monster_code, FIGHT_SECONDS) + travel_seconds
+        return self.per_kill.get(monster_code, 0.0) / seconds if seconds > 0 else 0.0
+
+    def value_of(self, item_code):
+        """Price of one item, for other rankers (e.g. GatheringEngine)"""
+        return self.prices.price(item_code, default=1)
+
+    def observe_fight(self, monster_code, response):
+        """Learn a monster's real fight cooldown from a fight response"""
+        data = response.get('data') if isinstance(response, dict) else None
+        cooldown = data.get('cooldown') if isinstance(data, dict) else None
+        if isinstance(cooldown, dict) and cooldown.get('total_seconds'):
+            previous = self.fight_seconds.get(monster_code)
+            seconds = cooldown['total_seconds']
+            self.fight_seconds[monster_code] = seconds if previous is None else previous + 0.3 * (seconds - previous)
+
+    def update_price(self, item_code, price):
+        """Apply a new price (None if unsold); returns the monster codes whose value changed"""
+        old = self.prices.price(item_code)
+        if not self.prices.set(item_code, price):
+            return set()
+        change = self.prices.price(item_code) - old
+        affected = self.monsters_by_item.get(item_code, set())
+        for monster_code in affected:
+            self.per_kill[monster_code] += self.drops[monster_code][item_code] * change
+        metrics.incr('drop_value.price_updates')
+        return affected
+
+    def refresh_prices(self, limit=None):
+        """Fetch stale prices for dropped items; returns the monster codes whose value changed"""
+        changed = set()
+        for item_code in self.prices.stale(self.monsters_by_item)[:limit]:
+            try:
+                price = self.prices.fetch(self.api, item_code)
+            except (ApiError, requests.RequestException) as e:
+                # Keep the cached price; the item stays stale and is retried next refresh
+                metrics.incr('drop_value.price_fetch_failed')
+                print(f"⚠️  Price fetch failed for {item_code}: {e}")
+                continue
+            # Unsold items keep the default value instead of ranking as worthless
+            changed |= self.update_price(item_code, price)
+        self.prices.save()
+        return changed
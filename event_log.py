@@ -0,0 +1,134 @@
+"""
+Event Log - Buffered structured logging for the bot loops
+Events are handed to a queue and written by a background listener, so the hunt
+loop never blocks on stdout or disk. Each event has a name, a level and
+fields; output is JSON lines for machines and an optional console renderer
+that shows the familiar human-readable lines
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+from config import config
+
+# Rotate the JSON lines file at this size, keeping this many old files
+MAX_BYTES = 10 * 1024 * 1024
+BACKUP_COUNT = 5
+
+# Repetitive events are logged 1 in N times (the first occurrence always is)
+SAMPLE_RATES = {
+    'rest.cycle': 10,
+    'hunt.analyzing': 10,
+    'hunt.moved': 5,
+}
+
+class JsonLinesFormatter(logging.Formatter):
+    """One compact JSON object per event"""
+
+    def format(self, record):
+        entry = {
+            'ts': round(record.created, 3),
+            'level': record.levelname,
+            'event': getattr(record, 'event', record.name),
+        }
+        entry.update(getattr(record, 'fields', {}))
+        message = record.getMessage()
+        if message:
+            entry['msg'] = message
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+class ConsoleRenderer(logging.Formatter):
+    """Human-readable view: just the event's message"""
+
+    def format(self, record):
+        return record.getMessage()
+
+class ConsoleFilter(logging.Filter):
+    """Keep events without a message (pure data) off the console"""
+
+    def filter(self, record):
+        return bool(record.getMessage())
+
+class EventLog:
+    """Structured event logger with a queue-backed handler, levels and sampling"""
+
+    def __init__(self, name='bot', level=None, path=None, console=True, sample_rates=None,
+                 max_bytes=MAX_BYTES, backup_count=BACKUP_COUNT):
+        self.sample_rates = dict(SAMPLE_RATES if sample_rates is None else sample_rates)
+        self._counts = {}
+        self._lock = threading.Lock()
+
+        self.logger = logging.getLogger(f"events.{name}")
+        self.logger.setLevel(level or config.log_level)
+        self.logger.propagate = False
+
+        handlers = []
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            file_handler = logging.handlers.RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count,
+                                                                encoding='utf-8')
+            file_handler.setFormatter(JsonLinesFormatter())
+            handlers.append(file_handler)
+        if console:
+            console_handler = logging.StreamHandler(sys.stdout)
+            console_handler.setFormatter(ConsoleRenderer())
+            console_handler.addFilter(ConsoleFilter())
+            handlers.append(console_handler)
+
+        self._queue = queue.SimpleQueue()
+        self.logger.handlers = [logging.handlers.QueueHandler(self._queue)]
+        self.listener = logging.handlers.QueueListener(self._queue, *handlers, respect_handler_level=True)
+        self.listener.start()
+        atexit.register(self.close)
+
+    def _sampled_out(self, name, fields):
+        """Whether this occurrence of a sampled event should be dropped"""
+        rate = self.sample_rates.get(name)
+        if not rate or rate <= 1:
+            return False
+        with self._lock:
+            count = self._counts.get(name, 0)
+            self._counts[name] = count + 1
+        if count % rate:
+            return True
+        fields['sample_rate'] = rate
+        return False
+
+    def event(self, level, name, message='', **fields):
+        """Log an event; message is the console line, fields the structured data"""
+        if not self.logger.isEnabledFor(level) or self._sampled_out(name, fields):
+            return
+        self.logger.log(level, message, extra={'event': name, 'fields': fields})
+
+    def debug(self, name, message='', **fields):
+        self.event(logging.DEBUG, name, message, **fields)
+
+    def info(self, name, message='', **fields):
+        self.event(logging.INFO, name, message, **fields)
+
+    def warning(self, name, message='', **fields):
+        self.event(logging.WARNING, name, message, **fields)
+
+    def error(self, name, message='', **fields):
+        self.event(logging.ERROR, name, message, **fields)
+
+    def close(self):
+        """Flush queued events and stop the background writer"""
+        if self.listener._thread is not None:
+            self.listener.stop()
+
+_logs = {}
+
+def get_event_log(name='bot'):
+    """Process-wide event log for a component, configured from .env"""
+    if name not in _logs:
+        _logs[name] = EventLog(name, path=config.event_log_file or None, console=config.event_log_console,
+                               max_bytes=config.event_log_max_mb * 1024 * 1024,
+                               backup_count=config.event_log_backups)
+    return _logs[name]
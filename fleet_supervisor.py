@@ -0,0 +1,328 @@
+"""
+Fleet Supervisor - Launch, watch and restart one bot process per character
+Each worker writes a heartbeat file after every completed action. The
+supervisor restarts workers that exit, stall (no action within N x their
+expected cooldown, or no productive action for too long) or exceed their
+memory cap; restarted workers resume their session counters from the last
+heartbeat and start warm from the on-disk caches
+"""
+import json
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from api_client import endpoint_class, install_middleware
+from config import config
+
+FLEET_DIR = 'db/fleet'
+
+# Stall detection: no action completed within STALL_FACTOR x the last cooldown (at least MIN_STALL_SECONDS)
+STALL_FACTOR = 5
+MIN_STALL_SECONDS = 120
+# Actions completed but nothing productive (only rests/moves) for this long also counts as a stall
+PROGRESS_TIMEOUT = 900
+# Time a new worker gets to connect and warm up before its first action
+STARTUP_GRACE = 300
+
+# Per-worker resident memory cap (MB)
+MEMORY_CAP_MB = 400
+
+# Restart backoff after a worker dies; reset once it has run RESTART_RESET seconds
+RESTART_DELAY = 5
+RESTART_DELAY_MAX = 300
+RESTART_RESET = 600
+
+# Seconds to wait after asking a worker to stop before killing it
+STOP_GRACE = {'memory': 60, 'stall': 10, 'shutdown': 60}
+
+# Action endpoints that count as progress (rests and moves alone don't)
+PROGRESS_ACTIONS = ('fight', 'gathering', 'crafting', 'bank', 'task', 'grandexchange')
+
+# Phase shown while an action is in flight (other actions use their endpoint name)
+ACTION_PHASES = {'move': 'moving', 'fight': 'fighting', 'rest': 'resting', 'bank': 'banking',
+                 'task': 'tasks', 'crafting': 'crafting', 'gathering': 'gathering'}
+
+# Character snapshot fields kept in the heartbeat (for the status server)
+CHARACTER_FIELDS = ('name', 'level', 'hp', 'max_hp', 'x', 'y', 'gold', 'xp', 'max_xp', 'task',
+                    'task_progress', 'task_total', 'cooldown_expiration')
+
+class Heartbeat:
+    """Worker side: atomically written liveness and session state file"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self.previous = self._read()
+        self.state = {}
+        self.record = {'pid': os.getpid(), 'started': time.time(), 'last_action': None,
+                       'last_action_ts': None, 'last_progress_ts': None, 'cooldown': 0,
+                       'phase': 'starting', 'character': None}
+        self.beat()
+
+    def _read(self):
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def resume_state(self):
+        """Session state the previous run of this worker left behind (empty on a fresh start)"""
+        if os.getenv('FLEET_RESUME') != '1':
+            return {}
+        return dict(self.previous.get('state') or {})
+
+    def update(self, **state):
+        """Merge session state into the next heartbeat"""
+        with self._lock:
+            self.state.update(state)
+
+    def beat(self, action=None, cooldown=None):
+        """Write the heartbeat, recording a completed action if given"""
+        now = time.time()
+        with self._lock:
+            if action:
+                self.record['last_action'] = action
+                self.record['last_action_ts'] = now
+                if action.split('/')[0] in PROGRESS_ACTIONS:
+                    self.record['last_progress_ts'] = now
+            if cooldown is not None:
+                self.record['cooldown'] = cooldown
+            data = json.dumps(dict(self.record, ts=now, state=self.state))
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, 'w') as f:
+            f.write(data)
+        os.replace(tmp, self.path)
+
+    def set_phase(self, phase):
+        """Record what the worker is doing now (written immediately when it changes)"""
+        with self._lock:
+            changed = self.record.get('phase') != phase
+            self.record['phase'] = phase
+        if changed:
+            self.beat()
+
+    def middleware(self, call_next, method, endpoint, **kwargs):
+        """Request middleware: track the phase and beat after every completed character action"""
+        if endpoint_class(endpoint) != 'actions':
+            return call_next(method, endpoint, **kwargs)
+
+        action = endpoint.strip('/').split('/action/', 1)[-1]
+        self.set_phase(ACTION_PHASES.get(action.split('/')[0], action.split('/')[0]))
+        response = call_next(method, endpoint, **kwargs)
+
+        data = response.get('data') if isinstance(response, dict) else None
+        cooldown = data.get('cooldown') if isinstance(data, dict) else None
+        character = data.get('character') if isinstance(data, dict) else None
+        if isinstance(character, dict):
+            with self._lock:
+                self.record['character'] = {field: character.get(field) for field in CHARACTER_FIELDS}
+        self.beat(action, cooldown.get('total_seconds') if isinstance(cooldown, dict) else None)
+        return response
+
+_heartbeat = None
+
+def get_heartbeat():
+    """This worker's heartbeat, or None when not running under the supervisor"""
+    global _heartbeat
+    if _heartbeat is None and config.fleet_heartbeat_file:
+        _heartbeat = Heartbeat(config.fleet_heartbeat_file)
+    return _heartbeat
+
+def install_heartbeat(api):
+    """Beat on every completed action of a character client (no-op outside the supervisor)"""
+    heartbeat = get_heartbeat()
+    if heartbeat is None:
+        return None
+    install_middleware(api, 'heartbeat', heartbeat.middleware)
+    return heartbeat
+
+def rss_mb(pid):
+    """Resident memory of a process in MB, or None where /proc is unavailable"""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError):
+        pass
+    return None
+
+class Worker:
+    """Supervisor side: one character's bot process and its restart bookkeeping"""
+
+    def __init__(self, name, script, directory):
+        self.name = name
+        self.script = script
+        self.heartbeat_path = os.path.join(directory, f"{name}.json")
+        self.process = None
+        self.started = None
+        self.restarts = 0
+        self.delay = RESTART_DELAY
+        self.next_start = 0
+        self.stopping = None  # (reason, kill deadline)
+        self.last_reason = None
+
+    def heartbeat(self):
+        try:
+            with open(self.heartbeat_path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        # A heartbeat left behind by a previous process doesn't count
+        return data if self.process and data.get('pid') == self.process.pid else None
+
+class FleetSupervisor:
+    """Runs one bot process per character and keeps them healthy"""
+
+    def __init__(self, names, script='continuous_hunter.py', directory=FLEET_DIR, memory_cap_mb=MEMORY_CAP_MB,
+                 stall_factor=STALL_FACTOR, progress_timeout=PROGRESS_TIMEOUT):
+        self.directory = directory
+        self.memory_cap_mb = memory_cap_mb
+        self.stall_factor = stall_factor
+        self.progress_timeout = progress_timeout
+        self.workers = [Worker(name, script, directory) for name in names]
+        self.running = True
+        self.stats = {'starts': 0, 'restarts': 0, 'stalls': 0, 'memory_kills': 0, 'exits': 0}
+        os.makedirs(directory, exist_ok=True)
+
+    def start(self, worker):
+        """Launch a worker; restarts resume from its last heartbeat"""
+        env = dict(os.environ, CHARACTER_NAME=worker.name, FLEET_HEARTBEAT_FILE=worker.heartbeat_path,
+                   FLEET_RESUME='1' if worker.restarts else '0', PYTHONUNBUFFERED='1')
+        worker.process = subprocess.Popen([sys.executable, worker.script], env=env)
+        worker.started = time.time()
+        worker.stopping = None
+        self.stats['starts'] += 1
+        print(f"🚀 {worker.name}: started (pid {worker.process.pid}, restart #{worker.restarts})")
+
+    def stall_reason(self, worker, now):
+        """Why a running worker looks stuck, or None"""
+        heartbeat = worker.heartbeat()
+        last_action = heartbeat and heartbeat.get('last_action_ts')
+        if not last_action:
+            return 'no first action' if now - worker.started > STARTUP_GRACE else None
+
+        limit = max(MIN_STALL_SECONDS, self.stall_factor * (heartbeat.get('cooldown') or 0))
+        if now - last_action > limit:
+            return f"no action for {now - last_action:.0f}s (limit {limit:.0f}s)"
+
+        last_progress = heartbeat.get('last_progress_ts') or heartbeat.get('started') or worker.started
+        if now - last_progress > self.progress_timeout:
+            return f"no progress for {now - last_progress:.0f}s (last action: {heartbeat.get('last_action')})"
+        return None
+
+    def stop(self, worker, reason):
+        """Ask a worker to stop (SIGINT lets the hunter finish its hunt); killed after a grace period"""
+        if worker.stopping or worker.process is None or worker.process.poll() is not None:
+            return
+        kind = reason.split(':')[0]
+        # A stalled worker is likely blocked and won't notice SIGINT
+        worker.process.send_signal(signal.SIGTERM if kind == 'stall' else signal.SIGINT)
+        worker.stopping = (reason, time.time() + STOP_GRACE.get(kind, 30))
+        worker.last_reason = reason
+        print(f"🛑 {worker.name}: stopping ({reason})")
+
+    def check(self, worker, now):
+        """One supervision step for a worker"""
+        process = worker.process
+        if process is None:
+            if self.running and now >= worker.next_start:
+                self.start(worker)
+            return
+
+        if process.poll() is not None:
+            # Exited: schedule a restart with backoff unless it ran long enough to be considered healthy
+            ran = now - worker.started
+            worker.delay = RESTART_DELAY if ran >= RESTART_RESET else min(RESTART_DELAY_MAX, worker.delay * 2)
+            worker.next_start = now + worker.delay
+            worker.process = None
+            worker.restarts += 1
+            self.stats['exits'] += 1
+            self.stats['restarts'] += 1
+            print(f"💀 {worker.name}: exited with {process.returncode} after {ran:.0f}s "
+                  f"({worker.last_reason or 'on its own'}) - restarting in {worker.delay}s")
+            worker.last_reason = None
+            return
+
+        if worker.stopping:
+            if now >= worker.stopping[1]:
+                process.kill()
+            return
+
+        rss = rss_mb(process.pid)
+        if self.memory_cap_mb and rss is not None and rss > self.memory_cap_mb:
+            self.stats['memory_kills'] += 1
+            self.stop(worker, f"memory: {rss:.0f}MB > {self.memory_cap_mb}MB")
+            return
+
+        reason = self.stall_reason(worker, now)
+        if reason:
+            self.stats['stalls'] += 1
+            self.stop(worker, f"stall: {reason}")
+
+    def run(self, poll_interval=5, status_every=60):
+        """Supervise until interrupted, then stop every worker"""
+        last_status = time.time()
+        try:
+            while self.running:
+                now = time.time()
+                for worker in self.workers:
+                    self.check(worker, now)
+                if now - last_status >= status_every:
+                    self.print_status()
+                    last_status = now
+                time.sleep(poll_interval)
+        except KeyboardInterrupt:
+            print(f"\n🛑 Stopping fleet...")
+        self.shutdown()
+
+    def shutdown(self):
+        """Stop every worker gracefully, killing any that don't exit in time"""
+        self.running = False
+        for worker in self.workers:
+            self.stop(worker, 'shutdown')
+        for worker in self.workers:
+            if worker.process is None:
+                continue
+            try:
+                worker.process.wait(timeout=max(0, worker.stopping[1] - time.time()) if worker.stopping else 0)
+            except subprocess.TimeoutExpired:
+                worker.process.kill()
+                worker.process.wait()
+
+    def print_status(self):
+        """One line per worker: pid, memory, last action and session state"""
+        now = time.time()
+        print(f"\n📊 FLEET STATUS ({self.stats['restarts']} restarts, {self.stats['stalls']} stalls, "
+              f"{self.stats['memory_kills']} memory kills)")
+        for worker in self.workers:
+            if worker.process is None:
+                print(f"   {worker.name}: down, restarting in {max(0, worker.next_start - now):.0f}s")
+                continue
+            heartbeat = worker.heartbeat() or {}
+            rss = rss_mb(worker.process.pid)
+            last = heartbeat.get('last_action_ts')
+            state = heartbeat.get('state') or {}
+            print(f"   {worker.name}: pid {worker.process.pid}, {rss or 0:.0f}MB, "
+                  f"last {heartbeat.get('last_action') or '-'} {f'{now - last:.0f}s ago' if last else ''}, "
+                  f"hunts {state.get('total_hunts', 0)}")
+
+if __name__ == "__main__":
+    # python fleet_supervisor.py <character> [<character> ...]
+    if len(sys.argv) < 2:
+        print("Usage: python fleet_supervisor.py Name [Name ...]")
+        sys.exit(1)
+
+    print(f"🛡️ FLEET SUPERVISOR")
+    print("="*60)
+    print(f"   {len(sys.argv) - 1} workers running {config.fleet_script}, memory cap {config.fleet_memory_mb}MB")
+    supervisor = FleetSupervisor(sys.argv[1:], script=config.fleet_script, memory_cap_mb=config.fleet_memory_mb)
+    supervisor.run()
+    print(f"\n👋 Fleet stopped.")
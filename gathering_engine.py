@@ -0,0 +1,214 @@
+"""
+Gathering Engine - Skill-aware continuous gathering
+Ranks resource tiles by skill XP and drop value per second (including travel
+and gather cooldown) and keeps gathering the best one, like continuous_hunter
+does for fights
+"""
+from api_client import connect
+from action_executor import ActionExecutor
+from inventory_manager import InventoryManager
+from timings import DEFAULT_GATHER_SECONDS, MOVE_SECONDS_PER_TILE
+import signal
+import time
+
+GATHERING_SKILLS = ('mining', 'woodcutting', 'fishing')
+
+# Gathers we expect to do on a tile once there, used to amortize the trip
+GATHERS_PER_TRIP = 10
+
+# Weight of an XP point relative to one unit of item value
+XP_WEIGHT = 1.0
+
+def _ewma(previous, value, alpha=0.3):
+    """Exponentially weighted moving average"""
+    return value if previous is None else previous + alpha * (value - previous)
+
+class GatheringEngine:
+    """Rank resource tiles by value per second and track observed gather yields"""
+
+    def __init__(self, api, skills=GATHERING_SKILLS, value_of=None, xp_weight=XP_WEIGHT):
+        self.api = api
+        self.skills = tuple(skills)
+        self.value_of = value_of or (lambda item_code: 1)
+        self.xp_weight = xp_weight
+
+        # Shared across every skill: loaded once, reused for all rankings
+        self.tiles = {}
+        self.resources = {}
+        self._load_index()
+
+        # Observed per-resource yields
+        self.observed_xp = {}
+        self.observed_seconds = {}
+        self.observed_value = {}
+
+    def _load_index(self):
+        """Cache resource tiles and resource data"""
+        tiles = self.api.maps.get(content_type="resource") or []
+        for tile in tiles:
+            self.tiles.setdefault(tile.content_code, []).append(tile)
+
+        for code in self.tiles:
+            resource = self.api.resources.get(code=code)
+            if resource:
+                self.resources[code] = resource
+
+    def skill_level(self, skill, char=None):
+        """Character level in a gathering skill"""
+        char = char or self.api.char
+        return getattr(char, f"{skill}_level", 0)
+
+    def expected_value(self, resource):
+        """Expected item value of one gather (drop rate is '1 in rate')"""
+        if resource.code in self.observed_value:
+            return self.observed_value[resource.code]
+        value = 0.0
+        for drop in resource.drops or []:
+            rate = max(1, drop.rate)
+            quantity = (drop.min_quantity + drop.max_quantity) / 2
+            value += quantity / rate * self.value_of(drop.code)
+        return value
+
+    def expected_xp(self, resource):
+        """Expected skill XP of one gather"""
+        if resource.code in self.observed_xp:
+            return self.observed_xp[resource.code]
+        return resource.level + 5
+
+    def gather_seconds(self, resource):
+        """Expected cooldown of one gather"""
+        return self.observed_seconds.get(resource.code, DEFAULT_GATHER_SECONDS)
+
+    def rank(self, char=None):
+        """Resource tiles the character can gather, best value per second first"""
+        char = char or self.api.char
+        position = (char.pos.x, char.pos.y)
+        ranked = []
+
+        for code, resource in self.resources.items():
+            if resource.skill not in self.skills or self.skill_level(resource.skill, char) < resource.level:
+                continue
+
+            tile = min(self.tiles[code], key=lambda t: abs(t.x - position[0]) + abs(t.y - position[1]))
+            distance = abs(tile.x - position[0]) + abs(tile.y - position[1])
+
+            per_gather = self.xp_weight * self.expected_xp(resource) + self.expected_value(resource)
+            travel = distance * MOVE_SECONDS_PER_TILE / GATHERS_PER_TRIP
+            seconds = self.gather_seconds(resource) + travel
+
+            ranked.append({
+                'resource': resource,
+                'location': tile,
+                'distance': distance,
+                'value_per_second': per_gather / seconds if seconds > 0 else 0
+            })
+
+        ranked.sort(key=lambda r: r['value_per_second'], reverse=True)
+        return ranked
+
+    def best(self, char=None):
+        """Best resource tile right now, or None"""
+        ranked = self.rank(char)
+        return ranked[0] if ranked else None
+
+    def observe(self, resource_code, response):
+        """Learn XP, value and cooldown from a gather response"""
+        data = response.get('data') if isinstance(response, dict) else None
+        if not isinstance(data, dict):
+            return
+
+        details = data.get('details') or {}
+        if 'xp' in details:
+            self.observed_xp[resource_code] = _ewma(self.observed_xp.get(resource_code), details['xp'])
+        if 'items' in details:
+            value = sum(item['quantity'] * self.value_of(item['code']) for item in details['items'])
+            self.observed_value[resource_code] = _ewma(self.observed_value.get(resource_code), value)
+
+        cooldown = data.get('cooldown') or {}
+        if cooldown.get('total_seconds'):
+            self.observed_seconds[resource_code] = _ewma(self.observed_seconds.get(resource_code), cooldown['total_seconds'])
+
+    def gather(self, executor, resource_code, inventory=None):
+        """Gather once through the executor and learn from the response; returns the executor result"""
+        result = executor.run('gather', self.api.actions.gather)
+        if result['ok']:
+            self.observe(resource_code, result['result'])
+            if inventory is not None:
+                inventory.observe(result['result'])
+        return result
+
+running = True
+
+def continuous_gather(api, engine=None, executor=None, inventory=None, max_gathers=None):
+    """Continuously gather the best resource until stopped"""
+    engine = engine or GatheringEngine(api)
+    executor = executor or ActionExecutor(api)
+    inventory = inventory or InventoryManager(api, executor)
+
+    print("⛏️ CONTINUOUS GATHERER")
+    print("="*60)
+    print(f"🎮 Character: {api.char.name}")
+    for skill in engine.skills:
+        print(f"   {skill.capitalize()}: Level {engine.skill_level(skill)}")
+    print("⚠️  Press Ctrl+C to stop gracefully")
+
+    gathers = 0
+    started = time.time()
+
+    while running and (max_gathers is None or gathers < max_gathers):
+        # Re-rank after every gather: observations and skill levels move the best tile
+        target = engine.best()
+        if not target:
+            print("❌ No gatherable resources for the current skill levels")
+            break
+
+        resource = target['resource']
+        location = target['location']
+        if inventory.should_bank():
+            print(f"🏦 Inventory almost full ({inventory.free_slots()} free) - banking")
+            if not inventory.bank_trip(next_location=location):
+                print("❌ Bank trip failed")
+                break
+        if (api.char.pos.x, api.char.pos.y) != (location.x, location.y):
+            print(f"\n🎯 Target: {resource.name} ({resource.skill} lvl {resource.level}) at ({location.x}, {location.y})")
+            print(f"   Value/sec: {target['value_per_second']:.2f} - Distance: {target['distance']}")
+            move = executor.run('move', api.actions.move, location.x, location.y)
+            if not move['ok']:
+                print(f"❌ Move failed: {move['error']}")
+                break
+
+        gather = engine.gather(executor, resource.code, inventory)
+        if gather['outcome'] == 'inventory_full':
+            print("🎒 Inventory full - banking")
+            if not inventory.bank_trip(next_location=location):
+                break
+            continue
+        if not gather['ok']:
+            print(f"❌ Gather failed: {gather['error']}")
+            break
+
+        gathers += 1
+        print(f"   ✅ Gather #{gathers}: {resource.name}")
+
+        if gathers % 10 == 0:
+            hours = (time.time() - started) / 3600
+            print(f"\n📊 {gathers} gathers in {hours * 60:.1f} min ({gathers / hours:.0f}/hour)")
+
+    print(f"\n🏁 Gathering stopped after {gathers} gathers")
+    return gathers
+
+if __name__ == "__main__":
+    def signal_handler(sig, frame):
+        """Handle Ctrl+C gracefully"""
+        global running
+        print("\n\n🛑 GRACEFUL SHUTDOWN REQUESTED")
+        running = False
+
+    signal.signal(signal.SIGINT, signal_handler)
+
+    from drop_value_index import PriceCache
+    prices = PriceCache()
+
+    api = connect()
+    engine = GatheringEngine(api, value_of=lambda code: prices.price(code, default=1))
+    continuous_gather(api, engine=engine)
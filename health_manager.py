@@ -2,24 +2,18 @@
 Health Management Utility
 Automatic health monitoring and healing for safe botting
 """
-from artifactsmmo_wrapper import wrapper, logger
+from artifactsmmo_wrapper import logger
 from config import config
+from api_client import connect
 import time
 
 # Load configuration
-wrapper.token = config.token
-api = wrapper.character(config.character_name)
+api = connect()
 logger.setLevel(config.log_level)
 
-def get_health_percentage():
-    """Get current health as a percentage"""
-    if api.char.max_hp == 0:
-        return 100  # Avoid division by zero
-    return (api.char.hp / api.char.max_hp) * 100
-
 def is_health_low(threshold=50):
     """Check if health is below threshold percentage"""
-    health_pct = get_health_percentage()
+    health_pct = api.state_mirror.health_percentage()
     return health_pct < threshold
 
 def needs_healing(threshold=50):
@@ -29,7 +23,7 @@ def needs_healing(threshold=50):
 def rest_until_healed(target_health_pct=80, max_rest_cycles=10):
     """Rest until health reaches target percentage or max cycles reached"""
     print(f"💤 HEALTH MANAGEMENT")
-    print(f"   Current HP: {api.char.hp}/{api.char.max_hp} ({get_health_percentage():.1f}%)")
+    print(f"   Current HP: {api.char.hp}/{api.char.max_hp} ({api.state_mirror.health_percentage():.1f}%)")
     
     if not needs_healing(target_health_pct):
         print(f"   ✅ Health is good, no rest needed")
@@ -47,7 +41,7 @@ def rest_until_healed(target_health_pct=80, max_rest_cycles=10):
         try:
             api.actions.rest()
             healed = api.char.hp - initial_hp
-            health_pct = get_health_percentage()
+            health_pct = api.state_mirror.health_percentage()
             
             if healed > 0:
                 print(f"   ✅ Healed {healed} HP! Now at {api.char.hp}/{api.char.max_hp} ({health_pct:.1f}%)")
@@ -63,7 +57,7 @@ def rest_until_healed(target_health_pct=80, max_rest_cycles=10):
             print(f"   ❌ Rest failed: {e}")
             break
     
-    final_health_pct = get_health_percentage()
+    final_health_pct = api.state_mirror.health_percentage()
     if final_health_pct >= target_health_pct:
         print(f"   ✅ Healing complete: {api.char.hp}/{api.char.max_hp} ({final_health_pct:.1f}%)")
         return True
@@ -89,7 +83,7 @@ def safe_action(action_func, action_name="action", health_threshold=50, *args, *
         print(f"   ✅ {action_name.capitalize()} completed!")
         
         # Check health after action
-        health_pct = get_health_percentage()
+        health_pct = api.state_mirror.health_percentage()
         print(f"   💚 Post-action HP: {api.char.hp}/{api.char.max_hp} ({health_pct:.1f}%)")
         
         return result
@@ -111,7 +105,7 @@ def safe_move(x, y):
 
 def health_status_report():
     """Print detailed health status"""
-    health_pct = get_health_percentage()
+    health_pct = api.state_mirror.health_percentage()
     print(f"\n💚 HEALTH REPORT")
     print(f"   HP: {api.char.hp}/{api.char.max_hp} ({health_pct:.1f}%)")
     
@@ -0,0 +1,120 @@
+"""
+HTTP Transport - One pooled keep-alive session for all API traffic in a process
+Every character client and data fetch goes through the same requests.Session,
+so many characters reuse a few warm connections instead of opening a new TLS
+connection per request. Connections per host are capped, responses are gzip
+compressed, timeouts are split into connect/read, and sizes are measured
+"""
+from types import SimpleNamespace
+import threading
+import time
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from api_client import endpoint_class
+from metrics import metrics
+from trace_recorder import trace_wait
+
+# Connection pools kept (one per host) and connections per host; callers wait for a free one
+POOL_HOSTS = 4
+POOL_PER_HOST = 8
+
+# Seconds to establish a connection and to wait for a response
+CONNECT_TIMEOUT = 3.05
+READ_TIMEOUT = 10
+
+class Transport:
+    """Shared keep-alive session with per-host connection limits and size metrics"""
+
+    def __init__(self, pool_hosts=POOL_HOSTS, per_host=POOL_PER_HOST,
+                 connect_timeout=CONNECT_TIMEOUT, read_timeout=READ_TIMEOUT):
+        self.timeout = (connect_timeout, read_timeout)
+        self.session = requests.Session()
+        self.session.headers['Accept-Encoding'] = 'gzip, deflate'
+        # Retries stay with the wrapper and the rate limiter, not urllib3
+        adapter = HTTPAdapter(pool_connections=pool_hosts, pool_maxsize=per_host, pool_block=True, max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self._local = threading.local()
+        # Rate limiter every request waits on (set by rate_limiter.install_rate_limiter)
+        self.limiter = None
+
+    def request(self, method, url, timeout=None, **kwargs):
+        """Send a request through the pool (same signature as requests.request)"""
+        # The wrapper passes a single read timeout; keep our connect timeout in front of it
+        if timeout is None or isinstance(timeout, (int, float)):
+            timeout = (self.timeout[0], timeout or self.timeout[1])
+
+        # One token per request actually sent, after any cooldown wait and per wrapper retry
+        limiter = self.limiter
+        cls = endpoint_class(urlsplit(url).path)
+        if limiter is not None:
+            limiter.acquire(cls)
+
+        start = time.time()
+        started = time.perf_counter()
+        response = self.session.request(method, url, timeout=timeout, **kwargs)
+        elapsed = time.perf_counter() - started
+        trace_wait('http', 'http', start, elapsed, status=response.status_code)
+
+        host = urlsplit(url).hostname or 'unknown'
+        body = response.request.body
+        metrics.incr('http.requests')
+        metrics.observe('http.latency', elapsed)
+        metrics.observe('http.request_bytes', len(body) if body else 0)
+        metrics.observe('http.response_bytes', len(response.content))
+        wire = response.headers.get('Content-Length')
+        if wire is not None and wire.isdigit():
+            metrics.observe('http.response_wire_bytes', int(wire))
+        metrics.incr(f'http.host.{host}.requests')
+
+        # The wrapper turns error responses into exceptions without headers; keep the hint for them
+        self._local.retry_after = _retry_after(response) if response.status_code == 429 else None
+        if limiter is not None:
+            if response.status_code == 429:
+                limiter.backoff(cls, self._local.retry_after)
+            else:
+                limiter.clear_strikes(cls)
+        return response
+
+    def take_retry_after(self):
+        """Retry-After seconds of this thread's last response if it was a 429, once"""
+        retry_after = getattr(self._local, 'retry_after', None)
+        self._local.retry_after = None
+        return retry_after
+
+    def close(self):
+        self.session.close()
+
+def _retry_after(response):
+    value = response.headers.get('Retry-After')
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+_transport = None
+_transport_lock = threading.Lock()
+
+def get_transport():
+    """Process-wide transport shared by every character client"""
+    global _transport
+    with _transport_lock:
+        if _transport is None:
+            _transport = Transport()
+        return _transport
+
+def install_transport(transport=None):
+    """Send all of the wrapper's HTTP requests through the shared transport
+
+    The wrapper calls requests.request() directly, so its module reference to
+    requests is swapped for one whose request() uses the pooled session.
+    """
+    from artifactsmmo_wrapper import artifacts
+    transport = transport or get_transport()
+    if getattr(artifacts.requests, 'transport', None) is transport:
+        return transport
+    artifacts.requests = SimpleNamespace(
+        request=transport.request, Timeout=requests.Timeout, Response=requests.Response, transport=transport
+    )
+    return transport
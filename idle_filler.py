@@ -0,0 +1,164 @@
+"""
+Idle Filler - Productive fallback work when the hunter has no target
+Scores gathering, crafting from the inventory, banking and travelling toward
+the nearest winnable monster out of range by value per second, runs the best
+one for a single slot and lets the speculative planner re-check monsters in
+the background while its cooldown runs
+"""
+from craft_planner import CraftPlanner
+from gathering_engine import GatheringEngine, XP_WEIGHT, GATHERS_PER_TRIP
+from timings import CRAFT_SECONDS_PER_UNIT, MOVE_SECONDS_PER_TILE
+
+# Kills expected once a travelled-to hunting ground is reached, used to amortize the trip
+KILLS_PER_TRIP = GATHERS_PER_TRIP
+
+# Value per second of productive time when no other option gives a reference (for banking)
+DEFAULT_REFERENCE_RATE = 1.0
+
+# Bank in an idle slot once the inventory is at least this full
+BANK_MIN_FILL = 0.5
+
+def _distance(a, b):
+    return abs(a.x - b.x) + abs(a.y - b.y)
+
+class IdleFiller:
+    """Pick and run the next best productive action while no monster is worth hunting"""
+
+    def __init__(self, api, executor, ranker, inventory, planner=None, gathering=None, crafting=None,
+                 value_of=None, xp_weight=XP_WEIGHT):
+        self.api = api
+        self.executor = executor
+        self.ranker = ranker
+        self.inventory = inventory
+        self.planner = planner
+        self.value_of = value_of or (lambda item_code: 1)
+        self.xp_weight = xp_weight
+        self.gathering = gathering or GatheringEngine(api, value_of=self.value_of, xp_weight=xp_weight)
+        self.crafting = crafting or CraftPlanner(api)
+
+        self.workshops = {}
+        for tile in api.maps.get(content_type="workshop") or []:
+            self.workshops.setdefault(tile.content_code, []).append(tile)
+
+        self.banks = {(tile.x, tile.y): tile for tile in api.maps.get(content_type="bank") or []}
+        self.stats = {'gather': 0, 'craft': 0, 'bank': 0, 'travel': 0, 'failed': 0}
+
+    def _gather_option(self, char):
+        """Best resource tile, unless the inventory needs emptying first"""
+        if self.inventory.should_bank(char):
+            return None
+        target = self.gathering.best(char)
+        if not target or target['value_per_second'] <= 0:
+            return None
+        return {'kind': 'gather', 'value_per_second': target['value_per_second'], 'location': target['location'],
+                'resource': target['resource'], 'label': target['resource'].code}
+
+    def _craft_option(self, char):
+        """Most valuable craft the inventory alone covers, at the nearest workshop"""
+        held = {item.code: item.quantity for item in char.inventory if item.code}
+        best = None
+        for code, recipe in self.crafting.recipes.items():
+            if getattr(char, f"{recipe['skill']}_level", 0) < (recipe['level'] or 0):
+                continue
+            runs = min(held.get(part, 0) // per_run for part, per_run in recipe['items'])
+            workshops = self.workshops.get(recipe['skill'])
+            if runs <= 0 or not workshops:
+                continue
+
+            workshop = min(workshops, key=lambda tile: _distance(tile, char.pos))
+            value = (runs * recipe['quantity'] * self.value_of(code)
+                     - runs * sum(per_run * self.value_of(part) for part, per_run in recipe['items'])
+                     + self.xp_weight * runs * ((recipe['level'] or 0) + 5))
+            seconds = runs * CRAFT_SECONDS_PER_UNIT + _distance(workshop, char.pos) * MOVE_SECONDS_PER_TILE
+            if value <= 0:
+                continue
+            option = {'kind': 'craft', 'value_per_second': value / seconds, 'location': workshop,
+                      'code': code, 'quantity': runs, 'label': f"{runs}x {code}"}
+            if best is None or option['value_per_second'] > best['value_per_second']:
+                best = option
+        return best
+
+    def _travel_option(self, char):
+        """Nearest winnable monster beyond the hunter's range, valued as a new hunting ground"""
+        # The ranker is shared with the planner's background worker
+        if self.planner:
+            return self.planner.read(lambda ranker: self._travel_from(ranker, char))
+        return self._travel_from(self.ranker, char)
+
+    def _travel_from(self, ranker, char):
+        value_index = ranker.value_index
+        best = None
+        for code, analysis in ranker.analyses.items():
+            if not analysis or not analysis['can_win']:
+                continue
+            for location in ranker.locations.get(code, []):
+                distance = _distance(location, char.pos)
+                if distance <= ranker.max_distance:
+                    continue
+                travel = distance * MOVE_SECONDS_PER_TILE / KILLS_PER_TRIP
+                rate = value_index.value_per_second(code, travel) if value_index else 0.0
+                if best is None or rate > best['value_per_second']:
+                    best = {'kind': 'travel', 'value_per_second': rate, 'location': location,
+                            'code': code, 'distance': distance, 'label': f"{code} ({distance} tiles)"}
+        return best
+
+    def _bank_option(self, char, reference_rate):
+        """Emptying the inventory now saves a bank trip out of productive time later
+
+        The trip is worth its own duration at the reference rate, weighted by how
+        soon it would be needed (the inventory fill fraction).
+        """
+        capacity = getattr(char, 'inventory_max_items', 0) or 0
+        if capacity <= 0 or not self.inventory.banks:
+            return None
+        fill = 1 - self.inventory.free_slots(char) / capacity
+        if fill < BANK_MIN_FILL and not self.inventory.should_bank(char):
+            return None
+        location = self.banks.get(self.inventory.cheapest_bank(char=char))
+        return {'kind': 'bank', 'value_per_second': fill * reference_rate, 'location': location,
+                'label': f"{fill:.0%} full"}
+
+    def options(self, char=None):
+        """Every available fallback action, best value per second first"""
+        char = char or self.api.char
+        options = [option for option in (self._gather_option(char), self._craft_option(char), self._travel_option(char))
+                   if option and option['value_per_second'] > 0]
+        reference = max((option['value_per_second'] for option in options), default=DEFAULT_REFERENCE_RATE)
+        bank = self._bank_option(char, reference)
+        if bank:
+            options.append(bank)
+        options.sort(key=lambda option: option['value_per_second'], reverse=True)
+        return options
+
+    def best(self, char=None):
+        """Best fallback action right now, or None"""
+        options = self.options(char)
+        return options[0] if options else None
+
+    def _move(self, location):
+        if (self.api.char.pos.x, self.api.char.pos.y) == (location.x, location.y):
+            return True
+        return self.executor.run('move', self.api.actions.move, location.x, location.y)['ok']
+
+    def run(self, option):
+        """Run one slot of a fallback action; returns whether it succeeded"""
+        # Monsters are re-ranked for where this leaves the character while its cooldown runs
+        if self.planner and option['location'] is not None:
+            self.planner.speculate(self.planner.predict_after_move(self.api.char, option['location']))
+
+        kind = option['kind']
+        if kind == 'bank':
+            ok = self.inventory.bank_trip()
+        elif kind == 'travel':
+            ok = self._move(option['location'])
+        elif kind == 'gather':
+            ok = self._move(option['location'])
+            if ok:
+                ok = self.gathering.gather(self.executor, option['resource'].code, self.inventory)['ok']
+        else:
+            ok = self._move(option['location'])
+            if ok:
+                ok = self.crafting.craft(self.executor, option['code'], option['quantity'])['ok']
+
+        self.stats[kind if ok else 'failed'] += 1
+        return ok
@@ -0,0 +1,182 @@
+"""
+Inventory Manager - Predict inventory fill and bank on the cheapest detour
+Learns items gained per action from fight/gather responses, banks before the
+inventory fills, picks the bank that adds the least travel to the route and
+deposits everything in as few actions as possible
+"""
+from api_client import ApiError
+from metrics import metrics
+
+# Items-per-action estimate until real observations come in
+DEFAULT_ITEMS_PER_ACTION = 1.0
+
+# Bank when fewer than this many actions' worth of free slots remain
+SAFETY_ACTIONS = 2
+
+# Gold left on the character when banking
+KEEP_GOLD = 0
+
+def _ewma(previous, value, alpha=0.2):
+    """Exponentially weighted moving average"""
+    return value if previous is None else previous + alpha * (value - previous)
+
+def _distance(a, b):
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+def gained_items(response):
+    """Items gained by a fight or gather response, as a list of {code, quantity}"""
+    data = response.get('data') if isinstance(response, dict) else None
+    if not isinstance(data, dict):
+        return []
+    fight = data.get('fight') or {}
+    details = data.get('details') or {}
+    return fight.get('drops') or details.get('items') or []
+
+class InventoryManager:
+    """Track inventory fill rate and run bank trips with batched deposits"""
+
+    def __init__(self, api, executor=None, keep_gold=KEEP_GOLD, safety_actions=SAFETY_ACTIONS):
+        self.api = api
+        self.executor = executor
+        self.keep_gold = keep_gold
+        self.safety_actions = safety_actions
+        self.items_per_action = None
+        self.bulk_deposit = True
+        self.bulk_withdraw = True
+        self.banks = [(tile.x, tile.y) for tile in (api.maps.get(content_type="bank") or [])]
+        self.stats = {'bank_trips': 0, 'deposit_actions': 0, 'items_deposited': 0, 'gold_deposited': 0}
+
+    def observe(self, response):
+        """Learn the fill rate from an action response"""
+        gained = sum(item.get('quantity', 0) for item in gained_items(response))
+        self.items_per_action = _ewma(self.items_per_action, gained)
+        metrics.gauge('inventory.items_per_action', self.items_per_action)
+
+    def free_slots(self, char=None):
+        """Free inventory capacity (item count, not slots)"""
+        return (char or self.api.char).get_inventory_space()
+
+    def actions_until_full(self, char=None):
+        """Predicted number of actions before the inventory fills"""
+        rate = self.items_per_action if self.items_per_action is not None else DEFAULT_ITEMS_PER_ACTION
+        free = self.free_slots(char)
+        return float('inf') if rate <= 0 else free / rate
+
+    def should_bank(self, char=None):
+        """Whether to bank before the next action"""
+        return self.actions_until_full(char) < self.safety_actions
+
+    def cheapest_bank(self, next_location=None, char=None):
+        """Bank tile adding the least travel between here and next_location"""
+        if not self.banks:
+            return None
+        char = char or self.api.char
+        here = (char.pos.x, char.pos.y)
+        if next_location is None:
+            return min(self.banks, key=lambda bank: _distance(here, bank))
+        nxt = (next_location.x, next_location.y) if hasattr(next_location, 'x') else tuple(next_location)
+        return min(self.banks, key=lambda bank: _distance(here, bank) + _distance(bank, nxt) - _distance(here, nxt))
+
+    def _action(self, name, endpoint, json):
+        """Send a bank action, through the executor when there is one"""
+        func = lambda: self.api._make_request("POST", endpoint, json=json, source=name)
+        if self.executor is None:
+            return {'ok': True, 'result': func()}
+        return self.executor.run(name, func)
+
+    def _transfer(self, kind, items):
+        """Deposit or withdraw items in one request, falling back to one request per item
+
+        Raises the error of a failed request.
+        """
+        name = self.api.char.name
+        if getattr(self, f"bulk_{kind}"):
+            try:
+                outcome = self._action(f"bank_{kind}_items", f"my/{name}/action/bank/{kind}/item", items)
+                if outcome['ok']:
+                    return 1
+                error = outcome.get('error')
+            except ApiError as e:
+                error = e
+            # Servers without the bulk endpoint answer 404: remember and fall back
+            if getattr(error, 'code', None) != 404:
+                raise error
+            setattr(self, f"bulk_{kind}", False)
+
+        for item in items:
+            # Not api.actions.bank_deposit_item/bank_withdraw_item: they ignore the quantity argument
+            outcome = self._action(f"bank_{kind}_item", f"my/{name}/action/bank/{kind}", item)
+            if not outcome['ok']:
+                raise outcome['error']
+        return len(items)
+
+    def withdraw_items(self, items):
+        """Withdraw {code, quantity} items in as few actions as possible
+
+        Returns {'ok', 'actions', 'error'}, like the executor's results: a failed
+        request is reported, not raised.
+        """
+        try:
+            actions = self._transfer('withdraw', items)
+        except Exception as e:
+            metrics.incr('inventory.withdraw_failed')
+            return {'ok': False, 'actions': 0, 'error': e}
+        return {'ok': True, 'actions': actions, 'error': None}
+
+    def deposit_all(self):
+        """Deposit every inventory item and the gold above keep_gold
+
+        keep_gold=None leaves all gold on the character. Returns
+        {'ok', 'actions', 'error'}; a failed request is reported, not raised.
+        """
+        items = [{'code': item.code, 'quantity': item.quantity}
+                 for item in self.api.char.inventory if item.code and item.quantity > 0]
+        actions = 0
+        try:
+            if items:
+                actions += self._transfer('deposit', items)
+                self.stats['items_deposited'] += sum(item['quantity'] for item in items)
+
+            gold = self.api.char.gold - self.keep_gold if self.keep_gold is not None else 0
+            if gold > 0:
+                outcome = self._action('bank_deposit_gold', f"my/{self.api.char.name}/action/bank/deposit/gold",
+                                       {'quantity': gold})
+                if not outcome['ok']:
+                    raise outcome['error']
+                actions += 1
+                self.stats['gold_deposited'] += gold
+            error = None
+        except Exception as e:
+            metrics.incr('inventory.deposit_failed')
+            error = e
+
+        self.stats['deposit_actions'] += actions
+        metrics.incr('inventory.deposit_actions', actions)
+        return {'ok': error is None, 'actions': actions, 'error': error}
+
+    def go_to_bank(self, next_location=None):
+        """Move to the cheapest bank for the route; returns False if that failed"""
+        bank = self.cheapest_bank(next_location)
+        if bank is None:
+            return False
+        if (self.api.char.pos.x, self.api.char.pos.y) == bank:
+            return True
+        if self.executor is None:
+            self.api.actions.move(*bank)
+            return True
+        return self.executor.run('move', self.api.actions.move, *bank)['ok']
+
+    def bank_trip(self, next_location=None):
+        """Move to the cheapest bank for the route and empty the inventory; returns False if that failed"""
+        try:
+            if not self.go_to_bank(next_location):
+                return False
+        except Exception:
+            metrics.incr('inventory.bank_move_failed')
+            return False
+
+        if not self.deposit_all()['ok']:
+            return False
+        self.stats['bank_trips'] += 1
+        metrics.incr('inventory.bank_trips')
+        return True
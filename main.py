@@ -1,49 +1,48 @@
-from artifactsmmo_wrapper import wrapper, logger
+from artifactsmmo_wrapper import logger
 from config import config
+from api_client import connect
 from combat_calculator import CombatCalculator
+from warmup import warm_up, print_warmup
 import time
 
 # Load configuration from .env file
-wrapper.token = config.token
-api = wrapper.character(config.character_name)
+api = connect()
 logger.setLevel(config.log_level)
 
 # Create combat calculator
 combat_calc = CombatCalculator(api)
 
-# Health management functions
-def get_health_percentage():
-    """Get current health as a percentage"""
-    if api.char.max_hp == 0:
-        return 100
-    return (api.char.hp / api.char.max_hp) * 100
+# Fetch bank, inventory and static data concurrently before deciding anything
+warm = warm_up(api, combat_calc)
 
+# Health management functions
 def needs_healing(threshold=50):
     """Check if character needs healing"""
-    return api.char.hp < api.char.max_hp and get_health_percentage() < threshold
+    return api.char.hp < api.char.max_hp and api.state_mirror.health_percentage() < threshold
 
 def rest_until_healed(target_health_pct=80):
     """Rest until health reaches target percentage"""
     if not needs_healing(target_health_pct):
-        print(f"✅ Health is good: {api.char.hp}/{api.char.max_hp} ({get_health_percentage():.1f}%)")
+        print(f"✅ Health is good: {api.char.hp}/{api.char.max_hp} ({api.state_mirror.health_percentage():.1f}%)")
         return True
     
-    print(f"💤 Healing from {get_health_percentage():.1f}% to {target_health_pct}%...")
+    print(f"💤 Healing from {api.state_mirror.health_percentage():.1f}% to {target_health_pct}%...")
     
-    while api.char.hp < api.char.max_hp and get_health_percentage() < target_health_pct:
+    while api.char.hp < api.char.max_hp and api.state_mirror.health_percentage() < target_health_pct:
         initial_hp = api.char.hp
         api.actions.rest()
         healed = api.char.hp - initial_hp
         if healed > 0:
-            print(f"   ✅ Healed {healed} HP! Now: {api.char.hp}/{api.char.max_hp} ({get_health_percentage():.1f}%)")
+            print(f"   ✅ Healed {healed} HP! Now: {api.char.hp}/{api.char.max_hp} ({api.state_mirror.health_percentage():.1f}%)")
     
-    print(f"🎉 Healing complete: {api.char.hp}/{api.char.max_hp} ({get_health_percentage():.1f}%)")
+    print(f"🎉 Healing complete: {api.char.hp}/{api.char.max_hp} ({api.state_mirror.health_percentage():.1f}%)")
     return True
 
 print(f"🎮 Character: {config.character_name}")
 print(f"📍 Current Position: ({api.char.pos.x}, {api.char.pos.y})")
 print(f"⚔️ Current Level: {api.char.level}")
-print(f"💚 Health: {api.char.hp}/{api.char.max_hp} ({get_health_percentage():.1f}%)")
+print(f"💚 Health: {api.char.hp}/{api.char.max_hp} ({api.state_mirror.health_percentage():.1f}%)")
+print_warmup(warm)
 
 # Always check health first!
 if needs_healing(70):
@@ -101,7 +100,7 @@ if winnable_monsters:
         fight_result = api.actions.fight()
         print("🏆 Victory! As predicted by combat analysis!")
         print(f"💰 Gold: {api.char.gold}")
-        print(f"💚 Post-fight HP: {api.char.hp}/{api.char.max_hp} ({get_health_percentage():.1f}%)")
+        print(f"💚 Post-fight HP: {api.char.hp}/{api.char.max_hp} ({api.state_mirror.health_percentage():.1f}%)")
         
         # Check if we need healing after the fight
         if needs_healing(50):
@@ -112,7 +111,7 @@ if winnable_monsters:
         print(f"❌ Fight failed: {e}")
         print("🤔 This is unexpected! Our combat analysis should have been accurate.")
         # Emergency healing if health is critically low
-        if get_health_percentage() < 30:
+        if api.state_mirror.health_percentage() < 30:
             print(f"🚨 Emergency healing after failed fight!")
             rest_until_healed(60)
 
@@ -127,7 +126,7 @@ else:
     print(f"\n📊 ANALYSIS: Why you can't win fights")
     problem_monsters = ['yellow_slime', 'green_slime', 'blue_slime', 'red_slime']
     for monster_code in problem_monsters:
-        analysis = combat_calc.analyze_combat(monster_code)
+        analysis = warm['analyses'].get(monster_code) or combat_calc.analyze_combat(monster_code)
         if analysis:
             monster = analysis['monster']
             print(f"   {monster.name}: You deal {analysis['char_damage_per_turn']}/turn, they deal {analysis['monster_damage_per_turn']}/turn")
@@ -0,0 +1,58 @@
+"""
+Metrics - Lightweight in-process counters and timings
+Shared by the bot modules to expose queueing delays, hit rates and throughput
+"""
+import threading
+
+class Metrics:
+    """Thread-safe registry of counters, gauges and observed values"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = {}
+        self.gauges = {}
+        self.observations = {}
+
+    def incr(self, name, amount=1):
+        """Increase a counter"""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def gauge(self, name, value):
+        """Set a gauge to its current value"""
+        with self._lock:
+            self.gauges[name] = value
+
+    def observe(self, name, value):
+        """Record a value (e.g. a wait time) keeping count, total and max"""
+        with self._lock:
+            stat = self.observations.get(name)
+            if stat is None:
+                stat = self.observations[name] = {'count': 0, 'total': 0.0, 'max': 0.0}
+            stat['count'] += 1
+            stat['total'] += value
+            stat['max'] = max(stat['max'], value)
+
+    def snapshot(self):
+        """Copy of all metrics, with averages for observed values"""
+        with self._lock:
+            observations = {}
+            for name, stat in self.observations.items():
+                observations[name] = dict(stat, avg=stat['total'] / stat['count'] if stat['count'] else 0.0)
+            return {
+                'counters': dict(self.counters),
+                'gauges': dict(self.gauges),
+                'observations': observations
+            }
+
+    def reset(self):
+        """Clear every metric"""
+        with self._lock:
+            self.counters.clear()
+            self.gauges.clear()
+            self.observations.clear()
+
+# Process-wide metrics registry
+metrics = Metrics()
+
+__all__ = ['Metrics', 'metrics']
@@ -3,32 +3,27 @@ Monster Hunter Utility
 Advanced monster location and hunting functions for ArtifactsMmo
 Now with automatic health management!
 """
-from artifactsmmo_wrapper import wrapper, logger
+from artifactsmmo_wrapper import logger
 from config import config
+from api_client import connect
+from trace_recorder import trace_span
 import time
 
 # Load configuration
-wrapper.token = config.token
-api = wrapper.character(config.character_name)
+api = connect()
 logger.setLevel(config.log_level)
 
 # Import health management functions
-def get_health_percentage():
-    """Get current health as a percentage"""
-    if api.char.max_hp == 0:
-        return 100
-    return (api.char.hp / api.char.max_hp) * 100
-
 def needs_healing(threshold=50):
     """Check if character needs healing"""
-    return api.char.hp < api.char.max_hp and get_health_percentage() < threshold
+    return api.char.hp < api.char.max_hp and api.state_mirror.health_percentage() < threshold
 
 def rest_until_healed(target_health_pct=80, max_rest_cycles=10):
     """Rest until health reaches target percentage"""
     if not needs_healing(target_health_pct):
         return True
     
-    print(f"💤 Healing: {api.char.hp}/{api.char.max_hp} ({get_health_percentage():.1f}%) -> {target_health_pct}%")
+    print(f"💤 Healing: {api.char.hp}/{api.char.max_hp} ({api.state_mirror.health_percentage():.1f}%) -> {target_health_pct}%")
     
     cycles = 0
     while api.char.hp < api.char.max_hp and cycles < max_rest_cycles:
@@ -36,9 +31,10 @@ def rest_until_healed(target_health_pct=80, max_rest_cycles=10):
         initial_hp = api.char.hp
         
         try:
-            api.actions.rest()
+            with trace_span('rest', 'action'):
+                api.actions.rest()
             healed = api.char.hp - initial_hp
-            health_pct = get_health_percentage()
+            health_pct = api.state_mirror.health_percentage()
             
             if healed > 0:
                 print(f"   ✅ Rest {cycles}: +{healed} HP ({health_pct:.1f}%)")
@@ -51,7 +47,7 @@ def rest_until_healed(target_health_pct=80, max_rest_cycles=10):
             print(f"   ❌ Rest failed: {e}")
             break
     
-    return get_health_percentage() >= target_health_pct
+    return api.state_mirror.health_percentage() >= target_health_pct
 
 def safe_fight():
     """Safely fight with health checking"""
@@ -63,8 +59,9 @@ def safe_fight():
             return False
     
     try:
-        result = api.actions.fight()
-        health_pct = get_health_percentage()
+        with trace_span('fight', 'action'):
+            result = api.actions.fight()
+        health_pct = api.state_mirror.health_percentage()
         print(f"   💚 Post-fight HP: {api.char.hp}/{api.char.max_hp} ({health_pct:.1f}%)")
         return result
     except Exception as e:
@@ -127,7 +124,7 @@ def hunt_monster(monster_code=None, level_range=None, auto_heal=True):
     """Complete monster hunting workflow with health management"""
     print(f"🎮 Character: {config.character_name}")
     print(f"📍 Position: ({api.char.pos.x}, {api.char.pos.y})")
-    print(f"⚔️ Level: {api.char.level} | HP: {api.char.hp}/{api.char.max_hp} ({get_health_percentage():.1f}%)")
+    print(f"⚔️ Level: {api.char.level} | HP: {api.char.hp}/{api.char.max_hp} ({api.state_mirror.health_percentage():.1f}%)")
     
     # Pre-hunt health check
     if auto_heal and needs_healing(70):
@@ -186,7 +183,8 @@ def hunt_monster(monster_code=None, level_range=None, auto_heal=True):
     distance = calculate_distance((api.char.pos.x, api.char.pos.y), (location.x, location.y))
     print(f"\n🚶 Moving to {monster_code} at ({location.x}, {location.y}) - Distance: {distance}")
     
-    api.actions.move(location.x, location.y)
+    with trace_span('move', 'action'):
+        api.actions.move(location.x, location.y)
     print(f"✅ Arrived at ({api.char.pos.x}, {api.char.pos.y})")
     
     # Fight with health management!
@@ -206,7 +204,7 @@ def hunt_monster(monster_code=None, level_range=None, auto_heal=True):
     else:
         print("❌ Hunt failed")
         # Emergency healing if needed
-        if get_health_percentage() < 30:
+        if api.state_mirror.health_percentage() < 30:
             print(f"\n🚨 EMERGENCY HEALING")
             rest_until_healed(60)
         return False
@@ -222,7 +220,7 @@ def continuous_hunt(hunt_count=5, monster_code=None, rest_between_hunts=True):
         print("-" * 30)
         
         # Always check health before each hunt
-        if get_health_percentage() < 70:
+        if api.state_mirror.health_percentage() < 70:
             print("💚 Pre-hunt healing...")
             rest_until_healed(80)
         
@@ -238,7 +236,7 @@ def continuous_hunt(hunt_count=5, monster_code=None, rest_between_hunts=True):
     
     print(f"\n🏆 HUNT SUMMARY")
     print(f"   Successful hunts: {successful_hunts}/{hunt_count}")
-    print(f"   Final HP: {api.char.hp}/{api.char.max_hp} ({get_health_percentage():.1f}%)")
+    print(f"   Final HP: {api.char.hp}/{api.char.max_hp} ({api.state_mirror.health_percentage():.1f}%)")
     print(f"   Final Gold: {api.char.gold}")
 
 if __name__ == "__main__":
@@ -13,8 +13,8 @@ const geistMono = Geist_Mono({
 });
 
 export const metadata: Metadata = {
-  title: "Create Next App",
-  description: "Generated by create next app",
+  title: "Fleet Dashboard",
+  description: "Live status of the ArtifactsMMO bot fleet",
 };
 
 export default function RootLayout({
@@ -1,237 +1,197 @@
 'use client';
 
 import { useState, useEffect } from 'react';
-import { Trash2, Plus, Check } from 'lucide-react';
-
-interface Todo {
-  id: number;
-  text: string;
-  completed: boolean;
-  createdAt: Date;
+import { Activity, Coins, Heart, MapPin, Timer, WifiOff } from 'lucide-react';
+
+// Server-Sent Events stream from status_server.py
+const STATUS_URL = process.env.NEXT_PUBLIC_STATUS_URL ?? 'http://localhost:8765/events';
+
+interface CharacterStatus {
+  phase: string | null;
+  online: boolean;
+  level: number | null;
+  hp: number | null;
+  max_hp: number | null;
+  x: number | null;
+  y: number | null;
+  gold: number | null;
+  gold_per_hour: number | null;
+  task: string | null;
+  task_progress: number | null;
+  task_total: number | null;
+  cooldown_until: number | null;
+  last_action: string | null;
+  hunts: number | null;
 }
 
-type FilterType = 'all' | 'active' | 'completed';
+type Fleet = Record<string, CharacterStatus>;
 
-export default function TodoApp() {
-  const [todos, setTodos] = useState<Todo[]>([]);
-  const [inputValue, setInputValue] = useState('');
-  const [filter, setFilter] = useState<FilterType>('all');
+// A delta carries only changed fields; null removes a character
+type Changes = Record<string, Partial<CharacterStatus> | null>;
 
-  // Load todos from localStorage on component mount
-  useEffect(() => {
-    const savedTodos = localStorage.getItem('todos');
-    if (savedTodos) {
-      const parsedTodos = JSON.parse(savedTodos);
-      // Convert createdAt strings back to Date objects
-      const todosWithDates = parsedTodos.map((todo: { id: number; text: string; completed: boolean; createdAt: string }) => ({
-        ...todo,
-        createdAt: new Date(todo.createdAt)
-      }));
-      setTodos(todosWithDates);
+function applyChanges(fleet: Fleet, changes: Changes): Fleet {
+  const next = { ...fleet };
+  for (const [name, delta] of Object.entries(changes)) {
+    if (delta === null) {
+      delete next[name];
+    } else {
+      next[name] = { ...next[name], ...delta } as CharacterStatus;
     }
-  }, []);
-
-  // Save todos to localStorage whenever todos change
-  useEffect(() => {
-    localStorage.setItem('todos', JSON.stringify(todos));
-  }, [todos]);
-
-  const addTodo = () => {
-    if (inputValue.trim() !== '') {
-      const newTodo: Todo = {
-        id: Date.now(),
-        text: inputValue.trim(),
-        completed: false,
-        createdAt: new Date()
-      };
-      setTodos([newTodo, ...todos]);
-      setInputValue('');
-    }
-  };
-
-  const toggleTodo = (id: number) => {
-    setTodos(todos.map(todo =>
-      todo.id === id ? { ...todo, completed: !todo.completed } : todo
-    ));
-  };
+  }
+  return next;
+}
 
-  const deleteTodo = (id: number) => {
-    setTodos(todos.filter(todo => todo.id !== id));
-  };
+const PHASE_COLORS: Record<string, string> = {
+  fighting: 'bg-red-100 text-red-700 dark:bg-red-900 dark:text-red-300',
+  resting: 'bg-green-100 text-green-700 dark:bg-green-900 dark:text-green-300',
+  moving: 'bg-blue-100 text-blue-700 dark:bg-blue-900 dark:text-blue-300',
+  banking: 'bg-yellow-100 text-yellow-700 dark:bg-yellow-900 dark:text-yellow-300',
+  searching: 'bg-gray-100 text-gray-700 dark:bg-gray-700 dark:text-gray-300',
+};
 
-  const clearCompleted = () => {
-    setTodos(todos.filter(todo => !todo.completed));
-  };
+export default function FleetDashboard() {
+  const [fleet, setFleet] = useState<Fleet>({});
+  const [connected, setConnected] = useState(false);
+  const [now, setNow] = useState(() => Date.now() / 1000);
 
-  const filteredTodos = todos.filter(todo => {
-    switch (filter) {
-      case 'active':
-        return !todo.completed;
-      case 'completed':
-        return todo.completed;
-      default:
-        return true;
-    }
-  });
+  // Snapshot on connect, then deltas; EventSource reconnects by itself
+  useEffect(() => {
+    const source = new EventSource(STATUS_URL);
+    source.onopen = () => setConnected(true);
+    source.onerror = () => setConnected(false);
+    source.addEventListener('snapshot', (event) => {
+      setFleet(JSON.parse((event as MessageEvent).data).characters);
+    });
+    source.addEventListener('delta', (event) => {
+      const { changes } = JSON.parse((event as MessageEvent).data) as { changes: Changes };
+      setFleet((fleet) => applyChanges(fleet, changes));
+    });
+    return () => source.close();
+  }, []);
 
-  const activeTodosCount = todos.filter(todo => !todo.completed).length;
-  const completedTodosCount = todos.filter(todo => todo.completed).length;
+  // Cooldowns count down locally; the server only sends their expiry
+  useEffect(() => {
+    const timer = setInterval(() => setNow(Date.now() / 1000), 500);
+    return () => clearInterval(timer);
+  }, []);
 
-  const handleKeyPress = (e: React.KeyboardEvent) => {
-    if (e.key === 'Enter') {
-      addTodo();
-    }
-  };
+  const names = Object.keys(fleet).sort();
+  const online = names.filter((name) => fleet[name].online).length;
+  const goldPerHour = names.reduce((total, name) => total + (fleet[name].gold_per_hour ?? 0), 0);
 
   return (
     <div className="min-h-screen bg-gradient-to-br from-blue-50 to-indigo-100 dark:from-gray-900 dark:to-gray-800 py-8 px-4">
-      <div className="max-w-2xl mx-auto">
+      <div className="max-w-6xl mx-auto">
         {/* Header */}
         <div className="text-center mb-8">
           <h1 className="text-4xl font-bold text-gray-800 dark:text-white mb-2">
-            Todo App
+            Fleet Dashboard
           </h1>
           <p className="text-gray-600 dark:text-gray-300">
-            Stay organized and get things done
+            {connected ? 'Live bot status' : `Connecting to ${STATUS_URL}...`}
           </p>
         </div>
 
-        {/* Add Todo Input */}
-        <div className="bg-white dark:bg-gray-800 rounded-2xl shadow-lg p-6 mb-6">
-          <div className="flex gap-3">
-            <input
-              type="text"
-              value={inputValue}
-              onChange={(e) => setInputValue(e.target.value)}
-              onKeyPress={handleKeyPress}
-              placeholder="What needs to be done?"
-              className="flex-1 px-4 py-3 border border-gray-200 dark:border-gray-600 rounded-xl focus:outline-none focus:ring-2 focus:ring-blue-500 dark:bg-gray-700 dark:text-white text-lg"
-            />
-            <button
-              onClick={addTodo}
-              className="px-6 py-3 bg-blue-500 hover:bg-blue-600 text-white rounded-xl transition-colors duration-200 flex items-center gap-2 font-medium"
-            >
-              <Plus size={20} />
-              Add
-            </button>
-          </div>
-        </div>
-
         {/* Stats */}
         <div className="bg-white dark:bg-gray-800 rounded-2xl shadow-lg p-6 mb-6">
           <div className="grid grid-cols-3 gap-4 text-center">
             <div>
               <div className="text-2xl font-bold text-blue-600 dark:text-blue-400">
-                {todos.length}
+                {names.length}
               </div>
-              <div className="text-sm text-gray-600 dark:text-gray-300">Total</div>
+              <div className="text-sm text-gray-600 dark:text-gray-300">Characters</div>
             </div>
             <div>
-              <div className="text-2xl font-bold text-yellow-600 dark:text-yellow-400">
-                {activeTodosCount}
+              <div className="text-2xl font-bold text-green-600 dark:text-green-400">
+                {online}
               </div>
-              <div className="text-sm text-gray-600 dark:text-gray-300">Active</div>
+              <div className="text-sm text-gray-600 dark:text-gray-300">Online</div>
             </div>
             <div>
-              <div className="text-2xl font-bold text-green-600 dark:text-green-400">
-                {completedTodosCount}
+              <div className="text-2xl font-bold text-yellow-600 dark:text-yellow-400">
+                {goldPerHour.toLocaleString()}
               </div>
-              <div className="text-sm text-gray-600 dark:text-gray-300">Completed</div>
+              <div className="text-sm text-gray-600 dark:text-gray-300">Gold / hour</div>
             </div>
           </div>
         </div>
 
-        {/* Filter Buttons */}
-        <div className="bg-white dark:bg-gray-800 rounded-2xl shadow-lg p-6 mb-6">
-          <div className="flex gap-2">
-            {(['all', 'active', 'completed'] as FilterType[]).map((filterType) => (
-              <button
-                key={filterType}
-                onClick={() => setFilter(filterType)}
-                className={`px-4 py-2 rounded-lg transition-colors duration-200 text-sm font-medium ${
-                  filter === filterType
-                    ? 'bg-blue-500 text-white'
-                    : 'bg-gray-100 dark:bg-gray-700 text-gray-700 dark:text-gray-300 hover:bg-gray-200 dark:hover:bg-gray-600'
-                }`}
-              >
-                {filterType.charAt(0).toUpperCase() + filterType.slice(1)}
-              </button>
-            ))}
-            {completedTodosCount > 0 && (
-              <button
-                onClick={clearCompleted}
-                className="ml-auto px-4 py-2 bg-red-100 dark:bg-red-900 text-red-700 dark:text-red-300 rounded-lg hover:bg-red-200 dark:hover:bg-red-800 transition-colors duration-200 text-sm font-medium"
-              >
-                Clear Completed
-              </button>
-            )}
-          </div>
-        </div>
-
-        {/* Todo List */}
+        {/* Character List */}
         <div className="bg-white dark:bg-gray-800 rounded-2xl shadow-lg overflow-hidden">
-          {filteredTodos.length === 0 ? (
+          {names.length === 0 ? (
             <div className="p-12 text-center">
               <div className="text-gray-400 dark:text-gray-500 text-lg mb-2">
-                {filter === 'completed' ? 'No completed todos' :
-                 filter === 'active' ? 'No active todos' : 
-                 'No todos yet'}
+                No bots reporting
               </div>
               <div className="text-gray-500 dark:text-gray-400 text-sm">
-                {todos.length === 0 ? 'Add a todo to get started!' : 'Try a different filter'}
+                Start them with fleet_supervisor.py and run status_server.py
               </div>
             </div>
           ) : (
             <div className="divide-y divide-gray-200 dark:divide-gray-700">
-              {filteredTodos.map((todo) => (
-                <div
-                  key={todo.id}
-                  className={`p-4 hover:bg-gray-50 dark:hover:bg-gray-700 transition-colors duration-200 ${
-                    todo.completed ? 'opacity-60' : ''
-                  }`}
-                >
-                  <div className="flex items-center gap-3">
-                    <button
-                      onClick={() => toggleTodo(todo.id)}
-                      className={`flex-shrink-0 w-6 h-6 rounded-full border-2 flex items-center justify-center transition-colors duration-200 ${
-                        todo.completed
-                          ? 'bg-green-500 border-green-500 text-white'
-                          : 'border-gray-300 dark:border-gray-600 hover:border-green-500'
-                      }`}
-                    >
-                      {todo.completed ? <Check size={14} /> : null}
-                    </button>
-                    <div className="flex-1 min-w-0">
-                      <div
-                        className={`text-lg ${
-                          todo.completed
-                            ? 'line-through text-gray-500 dark:text-gray-400'
-                            : 'text-gray-800 dark:text-white'
+              {names.map((name) => {
+                const character = fleet[name];
+                const hpPct = character.max_hp ? Math.round(((character.hp ?? 0) / character.max_hp) * 100) : 0;
+                const cooldown = character.cooldown_until ? Math.max(0, character.cooldown_until - now) : 0;
+                const phase = character.phase ?? 'starting';
+                return (
+                  <div
+                    key={name}
+                    className={`p-4 hover:bg-gray-50 dark:hover:bg-gray-700 transition-colors duration-200 ${
+                      character.online ? '' : 'opacity-60'
+                    }`}
+                  >
+                    <div className="flex items-center gap-4 flex-wrap">
+                      <div className="w-40">
+                        <div className="font-medium text-gray-800 dark:text-white flex items-center gap-2">
+                          {!character.online && <WifiOff size={16} />}
+                          {name}
+                        </div>
+                        <div className="text-sm text-gray-500 dark:text-gray-400">
+                          Level {character.level ?? '?'}
+                        </div>
+                      </div>
+                      <span
+                        className={`px-3 py-1 rounded-lg text-sm font-medium ${
+                          PHASE_COLORS[phase] ?? 'bg-indigo-100 text-indigo-700 dark:bg-indigo-900 dark:text-indigo-300'
                         }`}
                       >
-                        {todo.text}
+                        {phase}
+                      </span>
+                      <div className="flex items-center gap-2 w-48">
+                        <Heart size={16} className="text-red-500" />
+                        <div className="flex-1 h-2 bg-gray-200 dark:bg-gray-700 rounded-full overflow-hidden">
+                          <div className="h-full bg-red-500" style={{ width: `${hpPct}%` }} />
+                        </div>
+                        <span className="text-sm text-gray-600 dark:text-gray-300">
+                          {character.hp ?? '?'}/{character.max_hp ?? '?'}
+                        </span>
+                      </div>
+                      <div className="flex items-center gap-1 text-sm text-gray-600 dark:text-gray-300 w-24">
+                        <MapPin size={16} />({character.x ?? '?'}, {character.y ?? '?'})
                       </div>
-                      <div className="text-xs text-gray-500 dark:text-gray-400 mt-1">
-                        {todo.createdAt.toLocaleDateString()} at {todo.createdAt.toLocaleTimeString()}
+                      <div className="flex items-center gap-1 text-sm text-gray-600 dark:text-gray-300 w-20">
+                        <Timer size={16} />
+                        {cooldown > 0 ? `${cooldown.toFixed(0)}s` : 'ready'}
+                      </div>
+                      <div className="flex items-center gap-1 text-sm text-gray-600 dark:text-gray-300 w-36">
+                        <Coins size={16} className="text-yellow-500" />
+                        {character.gold?.toLocaleString() ?? '?'}
+                        {character.gold_per_hour != null && ` (${character.gold_per_hour.toLocaleString()}/h)`}
+                      </div>
+                      <div className="flex items-center gap-1 text-sm text-gray-500 dark:text-gray-400 ml-auto">
+                        <Activity size={16} />
+                        {character.task
+                          ? `${character.task} ${character.task_progress}/${character.task_total}`
+                          : `${character.hunts ?? 0} hunts`}
                       </div>
                     </div>
-                    <button
-                      onClick={() => deleteTodo(todo.id)}
-                      className="flex-shrink-0 p-2 text-gray-400 hover:text-red-500 transition-colors duration-200"
-                    >
-                      <Trash2 size={18} />
-                    </button>
                   </div>
-                </div>
-              ))}
+                );
+              })}
             </div>
           )}
         </div>
-
-        {/* Footer */}
-        <div className="text-center mt-8 text-gray-500 dark:text-gray-400 text-sm">
-          <p>Built with Next.js and Tailwind CSS</p>
-        </div>
       </div>
     </div>
   );
@@ -0,0 +1,367 @@
+"""
+Pipeline - Gatherers, fighters and a crafter working towards one item
+Each character runs in its own process with a role. Raw materials flow to the
+crafter through the bank, and a shared board (a locked local file) holds the
+plan so every stage is assigned the work that is furthest behind
+"""
+from api_client import connect
+from action_executor import ActionExecutor
+from combat_calculator import CombatCalculator
+from craft_planner import CraftPlanner, bank_contents
+from gathering_engine import GatheringEngine
+from inventory_manager import InventoryManager
+from metrics import metrics
+import json
+import multiprocessing
+import os
+import signal
+import sys
+import time
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows
+    fcntl = None
+
+ROLES = ('gatherer', 'fighter', 'crafter')
+ROLE_ACTIONS = {'gatherer': 'gather', 'fighter': 'fight'}
+
+BOARD_FILE = 'db/pipeline.json'
+
+# Claims not refreshed within this many seconds belong to a dead worker
+CLAIM_TIMEOUT = 120
+
+# Seconds to wait before asking the board again when there is no work
+IDLE_POLL = 15
+
+class PipelineBoard:
+    """Shared plan, claims and stage statistics, stored in a locked local file"""
+
+    def __init__(self, path=BOARD_FILE):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _update(self, func):
+        """Run func(board) under the file lock and write the board back"""
+        with open(self.path, 'a+') as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                try:
+                    board = json.loads(f.read() or '{}')
+                except ValueError:
+                    board = {}
+                board.setdefault('orders', {})
+                board.setdefault('queue', {})
+                board.setdefault('workers', {})
+                result = func(board)
+                f.seek(0)
+                f.truncate()
+                f.write(json.dumps(board))
+                f.flush()
+                return result
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def publish(self, plan, bank):
+        """Replace the open orders with a fresh plan; queue depth is what the bank holds for it"""
+        def _publish(board):
+            claims = {code: order.get('claims', {}) for code, order in board['orders'].items()}
+            board['orders'] = {
+                step['code']: {
+                    'action': step['action'],
+                    'source': step['source'],
+                    'remaining': step['quantity'],
+                    'seconds': step['seconds'],
+                    'claims': claims.get(step['code'], {}),
+                }
+                for step in plan['steps'] if step['action'] in ('gather', 'fight')
+            }
+            board['queue'] = {code: bank[code] for code in plan['inputs'] if bank.get(code)}
+            board['missing'] = plan['missing']
+            board['updated'] = time.time()
+        self._update(_publish)
+
+    def claim(self, worker, action, skip=()):
+        """Claim the order of this action type that is furthest behind, or None"""
+        def _claim(board):
+            now = time.time()
+            best, best_score = None, 0
+            for code, order in board['orders'].items():
+                order['claims'] = {w: t for w, t in order['claims'].items() if now - t < CLAIM_TIMEOUT and w != worker}
+                if order['action'] != action or order['remaining'] <= 0 or code in skip:
+                    continue
+                # Remaining work per worker already on it: spread workers by throughput
+                score = order['seconds'] / (1 + len(order['claims']))
+                if score > best_score:
+                    best, best_score = code, score
+            if best is None:
+                return None
+            board['orders'][best]['claims'][worker] = now
+            return dict(board['orders'][best], code=best)
+        return self._update(_claim)
+
+    def report(self, worker, deposited):
+        """Record items a worker deposited for the plan"""
+        def _report(board):
+            for code, quantity in deposited.items():
+                order = board['orders'].get(code)
+                if order:
+                    share = quantity / max(order['remaining'], 1)
+                    order['remaining'] = max(0, order['remaining'] - quantity)
+                    order['seconds'] = max(0, order['seconds'] * (1 - share))
+                board['queue'][code] = board['queue'].get(code, 0) + quantity
+        self._update(_report)
+
+    def heartbeat(self, worker, role, busy, wall, current=None):
+        """Publish a worker's utilization and current order"""
+        def _heartbeat(board):
+            board['workers'][worker] = {'role': role, 'busy': busy, 'wall': wall,
+                                        'current': current, 'updated': time.time()}
+        self._update(_heartbeat)
+        metrics.gauge(f"pipeline.{role}.utilization", busy / wall if wall else 0)
+
+    def snapshot(self):
+        """Copy of the board"""
+        return self._update(lambda board: json.loads(json.dumps(board)))
+
+    def utilization(self, board=None):
+        """Busy fraction per role across live workers"""
+        board = board or self.snapshot()
+        stages = {}
+        for worker in board['workers'].values():
+            busy, wall = stages.get(worker['role'], (0.0, 0.0))
+            stages[worker['role']] = (busy + worker['busy'], wall + worker['wall'])
+        return {role: busy / wall if wall else 0.0 for role, (busy, wall) in stages.items()}
+
+class Worker:
+    """One character working a pipeline role"""
+
+    def __init__(self, api, role, board, target=None, quantity=1):
+        self.api = api
+        self.role = role
+        self.board = board
+        self.target = target
+        self.quantity = quantity
+        self.name = api.char.name
+        self.executor = ActionExecutor(api)
+        self.inventory = InventoryManager(api, self.executor)
+        self.started = time.time()
+        self.busy = 0.0
+        self.running = True
+        self.skip = set()
+
+    def _busy(self, func, *args):
+        """Call func, counting its time as busy"""
+        started = time.time()
+        try:
+            return func(*args)
+        finally:
+            self.busy += time.time() - started
+
+    def _timed(self, action_name, func, *args):
+        """Run an action through the executor, counting its time as busy"""
+        return self._busy(self.executor.run, action_name, func, *args)
+
+    def _idle(self, seconds=IDLE_POLL):
+        for _ in range(seconds):
+            if not self.running:
+                return
+            time.sleep(1)
+
+    def _heartbeat(self, current=None):
+        self.board.heartbeat(self.name, self.role, self.busy, time.time() - self.started, current)
+
+    def _move(self, tiles):
+        """Move to the nearest of the given tiles"""
+        pos = self.api.char.pos
+        tile = min(tiles, key=lambda t: abs(t.x - pos.x) + abs(t.y - pos.y))
+        if (pos.x, pos.y) == (tile.x, tile.y):
+            return True
+        return self._timed('move', self.api.actions.move, tile.x, tile.y)['ok']
+
+    def _bank(self):
+        """Deposit everything; producers report what went towards the plan"""
+        deposited = {}
+        for item in self.api.char.inventory:
+            if item.code and item.quantity > 0:
+                deposited[item.code] = deposited.get(item.code, 0) + item.quantity
+        if not self._busy(self.inventory.bank_trip):
+            return False
+        # The crafter's intermediates are already counted by the plan it publishes
+        if self.role != 'crafter':
+            self.board.report(self.name, deposited)
+        return True
+
+    def run(self):
+        """Work the role until stopped"""
+        if self.role == 'crafter':
+            return self.run_crafter()
+        return self.run_producer(ROLE_ACTIONS[self.role])
+
+    def run_producer(self, action):
+        """Gather or fight for the order furthest behind, banking the results"""
+        gathering = GatheringEngine(self.api) if action == 'gather' else None
+        combat = CombatCalculator(self.api) if action == 'fight' else None
+
+        while self.running:
+            order = self.board.claim(self.name, action, skip=self.skip)
+            self._heartbeat(order['code'] if order else None)
+            if not order:
+                self._idle()
+                continue
+
+            if action == 'gather':
+                resource = gathering.resources.get(order['source'])
+                if not resource or gathering.skill_level(resource.skill) < resource.level:
+                    self.skip.add(order['code'])
+                    continue
+                tiles = gathering.tiles[order['source']]
+            else:
+                monster = self.api.monsters.get(code=order['source'])
+                if not monster or not combat.analyze_monster(monster)['can_win']:
+                    self.skip.add(order['code'])
+                    continue
+                tiles = self.api.maps.get(content_code=order['source'])
+
+            if not tiles or not self._move(tiles):
+                self.skip.add(order['code'])
+                continue
+
+            # Work the claim until the inventory needs emptying, then bank and re-claim
+            while self.running and not self.inventory.should_bank():
+                if gathering:
+                    result = self._busy(gathering.gather, self.executor, order['source'], self.inventory)
+                elif self.api.char.hp < self.api.char.max_hp * 0.5:
+                    self._timed('rest', self.api.actions.rest)
+                    continue
+                else:
+                    result = self._timed('fight', self.api.actions.fight)
+                    if result['ok']:
+                        self.inventory.observe(result['result'])
+                if not result['ok']:
+                    break
+                self._heartbeat(order['code'])
+
+            self._bank()
+
+    def run_crafter(self):
+        """Keep the plan published and craft whatever the bank already covers"""
+        planner = CraftPlanner(self.api)
+
+        while self.running:
+            bank = bank_contents(self.api)
+            inventory = {item.code: item.quantity for item in self.api.char.inventory if item.code}
+            plan = planner.plan(self.target, self.quantity, inventory=inventory, bank=bank)
+            plan['inputs'] = [code for code in planner.order(self.target) if code != self.target]
+            self.board.publish(plan, bank)
+            self._heartbeat()
+
+            # The finished target is banked, so only withdrawing it is left
+            if all(s['action'] == 'withdraw' and s['code'] == self.target for s in plan['steps']):
+                print(f"🏁 {self.quantity}x {self.target} ready")
+                return True
+
+            # Deepest craft whose ingredients are all in hand or in the bank
+            ready = None
+            for step in (s for s in plan['steps'] if s['action'] == 'craft'):
+                sub = planner.plan(step['code'], step['quantity'] * planner.recipes[step['code']]['quantity'],
+                                   inventory=inventory, bank=bank)
+                if not any(s['action'] in ('gather', 'fight') for s in sub['steps']) and not sub['missing']:
+                    ready = (step, sub)
+                    break
+            if not ready:
+                self._idle()
+                continue
+
+            step, sub = ready
+            withdraws = [{'code': s['code'], 'quantity': s['quantity']} for s in sub['steps'] if s['action'] == 'withdraw']
+            if withdraws:
+                withdrawn = (self._busy(self.inventory.go_to_bank)
+                             and self._busy(self.inventory.withdraw_items, withdraws)['ok'])
+                if not withdrawn:
+                    self._idle()
+                    continue
+
+            for craft in (s for s in sub['steps'] if s['action'] == 'craft'):
+                workshops = self.api.maps.get(content_type="workshop", content_code=craft['skill'])
+                if not workshops or not self._move(workshops):
+                    break
+                result = self._busy(planner.craft, self.executor, craft['code'], craft['quantity'])
+                if not result['ok']:
+                    print(f"❌ Craft failed: {result['error']}")
+                    break
+                print(f"🔨 Crafted {craft['quantity']}x {craft['code']}")
+
+            # Intermediates go back to the bank so the plan sees them
+            if any(item.code for item in self.api.char.inventory):
+                self._bank()
+
+def run_worker(character_name, role, target, quantity, board_path):
+    """Process entry point for one pipeline character"""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # The parent stops workers with SIGTERM
+    api = connect(character_name)
+    worker = Worker(api, role, PipelineBoard(board_path), target=target, quantity=quantity)
+
+    def stop(sig, frame):
+        worker.running = False
+    signal.signal(signal.SIGTERM, stop)
+
+    print(f"🏭 {character_name}: {role}")
+    worker.run()
+
+def print_board(board_path):
+    """Print queue depth, open orders and stage utilization"""
+    board = PipelineBoard(board_path)
+    snapshot = board.snapshot()
+    print("\n📊 PIPELINE STATUS")
+    for role, fraction in sorted(board.utilization(snapshot).items()):
+        print(f"   {role}: {fraction * 100:.0f}% busy")
+    for code, order in snapshot['orders'].items():
+        print(f"   {order['action']} {code} from {order['source']}: {order['remaining']} left, "
+              f"{len(order['claims'])} worker(s)")
+    if snapshot['queue']:
+        print("   🏦 Queued in bank: " + ", ".join(f"{q}x {c}" for c, q in snapshot['queue'].items()))
+    for code, quantity in snapshot['queue'].items():
+        metrics.gauge(f"pipeline.queue.{code}", quantity)
+
+if __name__ == "__main__":
+    # python pipeline.py <item> <quantity> <role>:<character> [<role>:<character> ...]
+    if len(sys.argv) < 4:
+        print("Usage: python pipeline.py <item> <quantity> gatherer:Name fighter:Name crafter:Name")
+        sys.exit(1)
+
+    target, quantity = sys.argv[1], int(sys.argv[2])
+    assignments = [arg.split(':', 1) for arg in sys.argv[3:]]
+    for role, _ in assignments:
+        if role not in ROLES:
+            print(f"❌ Unknown role '{role}' (expected one of {', '.join(ROLES)})")
+            sys.exit(1)
+    if sum(1 for role, _ in assignments if role == 'crafter') != 1:
+        print("❌ Exactly one crafter is required")
+        sys.exit(1)
+
+    workers = [multiprocessing.Process(target=run_worker, args=(name, role, target, quantity, BOARD_FILE), name=name)
+               for role, name in assignments]
+    for process in workers:
+        process.start()
+
+    try:
+        while any(process.is_alive() for process in workers):
+            time.sleep(30)
+            print_board(BOARD_FILE)
+            # The crafter finishing means the target is built
+            if not any(p.is_alive() for p, (role, _) in zip(workers, assignments, strict=True) if role == 'crafter'):
+                break
+    except KeyboardInterrupt:
+        print("\n🛑 Stopping pipeline...")
+
+    for process in workers:
+        if process.is_alive():
+            process.terminate()
+        process.join()
+    print("\n👋 Pipeline stopped")
@@ -0,0 +1,220 @@
+"""
+Rate Limiter - Client-side token buckets shared by every API call
+One bucket per endpoint class (actions vs data), safe across threads, asyncio
+tasks and processes, with 429-aware jittered backoff
+"""
+import asyncio
+import json
+import os
+import random
+import re
+import threading
+import time
+from config import config
+from metrics import metrics
+from trace_recorder import trace_span
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows: fall back to per-process buckets
+    fcntl = None
+
+# Backoff bounds (seconds) when the server rate-limits us without a usable hint
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 60.0
+
+def parse_status_code(error):
+    """HTTP status code of an API error ("Error 429: ..."), or None"""
+    code = getattr(error, 'code', None)
+    if isinstance(code, int):
+        return code
+    match = re.search(r"Error (\d{3})", str(error))
+    return int(match.group(1)) if match else None
+
+def parse_retry_after(error):
+    """Retry hint in seconds from an error message or Retry-After value, or None"""
+    match = re.search(r"(\d+(?:\.\d+)?)\s*(?:s\b|sec|second)", str(error), re.IGNORECASE)
+    if match:
+        return float(match.group(1))
+    try:
+        return float(error)
+    except (TypeError, ValueError):
+        return None
+
+class TokenBucket:
+    """Token bucket for one endpoint class, shared by threads in this process"""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self._lock = threading.Lock()
+        self._state = {'tokens': float(burst), 'updated': time.time(), 'blocked_until': 0.0, 'strikes': 0}
+
+    def _refill(self, state, now):
+        """Add the tokens earned since the last update"""
+        elapsed = max(0.0, now - state['updated'])
+        state['tokens'] = min(float(self.burst), state['tokens'] + elapsed * self.rate)
+        state['updated'] = now
+
+    def _reserve(self, state, now):
+        """Take a token (possibly going into debt) and return how long to wait for it"""
+        self._refill(state, now)
+        state['tokens'] -= 1
+        wait = -state['tokens'] / self.rate if state['tokens'] < 0 else 0.0
+        return max(wait, state['blocked_until'] - now)
+
+    def reserve(self):
+        """Reserve a request slot and return the delay before it may be sent"""
+        with self._lock:
+            return self._reserve(self._state, time.time())
+
+    def block(self, seconds):
+        """Stop issuing requests for this class for a while (server asked us to back off)"""
+        with self._lock:
+            self._block(self._state, seconds)
+
+    def _block(self, state, seconds):
+        state['blocked_until'] = max(state['blocked_until'], time.time() + seconds)
+        state['strikes'] += 1
+
+    def clear_strikes(self):
+        """Reset the backoff counter after a successful request"""
+        with self._lock:
+            self._state['strikes'] = 0
+
+    def strikes(self):
+        """Consecutive rate-limit responses seen for this class"""
+        with self._lock:
+            return self._state['strikes']
+
+class SharedFileBucket(TokenBucket):
+    """Token bucket whose state lives in a locked local file, shared across processes"""
+
+    def __init__(self, rate, burst, path, name):
+        super().__init__(rate, burst)
+        self.path = path
+        self.name = name
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _update(self, func):
+        """Run func(state) while holding both the thread lock and the file lock
+
+        The file is only rewritten when func changed the state.
+        """
+        with self._lock:
+            with open(self.path, 'a+') as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    f.seek(0)
+                    try:
+                        shared = json.loads(f.read() or '{}')
+                    except ValueError:
+                        shared = {}
+                    state = shared.get(self.name) or dict(self._state)
+                    before = dict(state)
+                    result = func(state)
+                    if state == before and self.name in shared:
+                        return result
+                    shared[self.name] = state
+                    f.seek(0)
+                    f.truncate()
+                    f.write(json.dumps(shared))
+                    f.flush()
+                    return result
+                finally:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def reserve(self):
+        return self._update(lambda state: self._reserve(state, time.time()))
+
+    def block(self, seconds):
+        self._update(lambda state: self._block(state, seconds))
+
+    def clear_strikes(self):
+        # Called after every successful request: only a non-zero count needs a write
+        self._update(lambda state: state['strikes'] and state.update(strikes=0))
+
+    def strikes(self):
+        return self._update(lambda state: state['strikes'])
+
+class RateLimiter:
+    """Per-endpoint-class limiter that every API request waits on"""
+
+    def __init__(self, limits=None, shared_file=None):
+        if limits is None:
+            limits = {
+                'actions': (config.rate_limit_actions, config.rate_limit_actions_burst),
+                'data': (config.rate_limit_data, config.rate_limit_data_burst),
+            }
+        self.buckets = {}
+        for name, (rate, burst) in limits.items():
+            if shared_file and fcntl is not None:
+                self.buckets[name] = SharedFileBucket(rate, burst, shared_file, name)
+            else:
+                self.buckets[name] = TokenBucket(rate, burst)
+
+    def _record_wait(self, cls, wait):
+        metrics.observe(f"rate_limit.{cls}.queue_delay", wait)
+        if wait > 0:
+            metrics.incr(f"rate_limit.{cls}.delayed")
+
+    def acquire(self, cls):
+        """Block the calling thread until a request of this class may be sent"""
+        wait = self.buckets[cls].reserve()
+        self._record_wait(cls, wait)
+        if wait > 0:
+            with trace_span('rate_limit.stall', 'rate_limit', endpoint_class=cls):
+                time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, cls):
+        """Asyncio variant of acquire that yields to the event loop while waiting"""
+        wait = self.buckets[cls].reserve()
+        self._record_wait(cls, wait)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def backoff(self, cls, retry_after=None):
+        """Back off the whole class after a rate-limit response; returns the delay applied"""
+        bucket = self.buckets[cls]
+        if retry_after is None:
+            # Exponential backoff with full jitter, growing with consecutive strikes
+            ceiling = min(BACKOFF_MAX, BACKOFF_BASE * (2 ** bucket.strikes()))
+            retry_after = random.uniform(BACKOFF_BASE / 2, ceiling)
+        else:
+            # Small jitter so processes sharing the budget don't all retry at once
+            retry_after += random.uniform(0, 0.25)
+        bucket.block(retry_after)
+        metrics.incr(f"rate_limit.{cls}.throttled")
+        metrics.observe(f"rate_limit.{cls}.backoff", retry_after)
+        return retry_after
+
+    def clear_strikes(self, cls):
+        """Reset a class's backoff after a request that wasn't rate-limited"""
+        self.buckets[cls].clear_strikes()
+
+_shared_limiter = None
+_shared_lock = threading.Lock()
+
+def get_rate_limiter():
+    """Process-wide limiter shared by every character client"""
+    global _shared_limiter
+    with _shared_lock:
+        if _shared_limiter is None:
+            _shared_limiter = RateLimiter(shared_file=config.rate_limit_file)
+        return _shared_limiter
+
+def install_rate_limiter(limiter=None, transport=None):
+    """Make every HTTP request of the shared transport wait on the rate limiter
+
+    Installed on the transport rather than as request middleware, so each
+    request actually sent takes exactly one token: cooldown waits happen
+    before it, and each of the wrapper's retries takes its own.
+    """
+    from http_transport import get_transport
+    limiter = limiter or get_rate_limiter()
+    (transport or get_transport()).limiter = limiter
+    return limiter
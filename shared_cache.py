@@ -0,0 +1,420 @@
+"""
+Shared Cache - One static-data cache for every bot process on the machine
+SQLite in WAL mode: readers use read-only connections and never block, a
+single elected writer (file lock) refreshes on game-version changes, and the
+refresh commits all its changes together so readers switch versions at once.
+Refreshes fetch pages concurrently and only write rows whose content changed;
+readers patch their in-memory copies and notify subscribers per changed row
+"""
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import fields
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from artifactsmmo_wrapper.game_data_classes import Drop, Item, Map, Monster, Resource
+from metrics import metrics
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows: every process refreshes for itself
+    fcntl = None
+
+CACHE_FILE = 'db/shared_cache.db'
+
+# Static data kinds and the endpoint each is fetched from
+KINDS = {'monsters': 'monsters', 'items': 'items', 'resources': 'resources', 'maps': 'maps'}
+
+# How long a connection waits on a locked database before giving up (milliseconds)
+BUSY_TIMEOUT = 5000
+
+# Concurrent page fetches during a refresh (the rate limiter still paces them)
+FETCH_WORKERS = 8
+PAGE_SIZE = 100
+
+def enable_wrapper_wal():
+    """Switch the wrapper's own cache database to WAL so readers don't block its writes"""
+    from artifactsmmo_wrapper.database import cache_db
+    cache_db.execute("PRAGMA journal_mode=WAL")
+    cache_db.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT}")
+
+def _page(api, endpoint, page):
+    return api._make_request("GET", f"{endpoint}?size={PAGE_SIZE}&page={page}", source=f"get_all_{endpoint}")
+
+def fetch_static_data(api, kinds=KINDS, workers=FETCH_WORKERS):
+    """Every row of each kind's paginated endpoint, fetching pages concurrently"""
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        # First pages tell how many more there are
+        first = {kind: pool.submit(_page, api, endpoint, 1) for kind, endpoint in kinds.items()}
+        pages = {kind: [future.result()] for kind, future in first.items()}
+        rest = {(kind, page): pool.submit(_page, api, kinds[kind], page)
+                for kind, [response] in pages.items()
+                for page in range(2, (response.get('pages') or 1) + 1)}
+        for (kind, page), future in sorted(rest.items()):
+            pages[kind].append(future.result())
+    return {kind: [row for response in responses for row in response.get('data') or []]
+            for kind, responses in pages.items()}
+
+def _key(kind, row):
+    """Primary key of a static data row"""
+    if kind == 'maps':
+        return f"{row['x']},{row['y']}"
+    return row['code']
+
+def _hash(data):
+    return hashlib.sha1(data.encode()).hexdigest()
+
+def changed_codes(kind, changes):
+    """Game codes touched by a change set: row codes, or tile content codes for maps"""
+    if kind != 'maps':
+        return set(changes)
+    codes = set()
+    for old, new in changes.values():
+        for row in (old, new):
+            content = (row or {}).get('content') or {}
+            if content.get('code'):
+                codes.add(content['code'])
+    return codes
+
+class SharedCache:
+    """Static data shared across processes, refreshed incrementally"""
+
+    def __init__(self, path=CACHE_FILE):
+        self.path = path
+        self.lock_path = f"{path}.lock"
+        self._local = threading.local()
+        self._lock = threading.RLock()
+        self._memo = {}
+        self._subscribers = []
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._writer() as db:
+            db.execute("CREATE TABLE IF NOT EXISTS meta (k TEXT PRIMARY KEY, v TEXT)")
+            # Caches from before incremental refreshes kept whole copies per version: start over
+            if db.execute("SELECT 1 FROM sqlite_master WHERE name = 'entries'").fetchone():
+                db.execute("DROP TABLE entries")
+                db.execute("DELETE FROM meta")
+            db.execute("CREATE TABLE IF NOT EXISTS records (kind TEXT, key TEXT, hash TEXT, generation INTEGER, "
+                       "data TEXT, PRIMARY KEY (kind, key))")
+            db.execute("CREATE TABLE IF NOT EXISTS tombstones (kind TEXT, key TEXT, generation INTEGER, "
+                       "PRIMARY KEY (kind, key))")
+
+    def _writer(self):
+        """Read-write connection (only the elected writer and schema setup use one)"""
+        db = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT / 1000, isolation_level=None)
+        db.execute("PRAGMA journal_mode=WAL")
+        return _Closing(db)
+
+    def _reader(self):
+        """Per-thread read-only connection"""
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            db = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, timeout=BUSY_TIMEOUT / 1000,
+                                 isolation_level=None)
+            self._local.db = db
+        return db
+
+    def _meta(self, db, key):
+        row = db.execute("SELECT v FROM meta WHERE k = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def version(self):
+        """Game version the readers currently see, or None before the first refresh"""
+        return self._meta(self._reader(), 'version')
+
+    def generation(self):
+        """Counter bumped by every refresh that changed something"""
+        return int(self._meta(self._reader(), 'generation') or 0)
+
+    def subscribe(self, callback):
+        """Call callback(kind, changes) when rows change; changes is {key: (old_row, new_row)}"""
+        self._subscribers.append(callback)
+
+    def rows(self, kind):
+        """All rows of a kind as {key: dict}, loaded once and patched as refreshes land"""
+        with self._lock:
+            generation = self.generation()
+            memo = self._memo.get(kind)
+            if memo is None:
+                cursor = self._reader().execute("SELECT key, data FROM records WHERE kind = ?", (kind,))
+                self._memo[kind] = [generation, {key: json.loads(data) for key, data in cursor}]
+                metrics.incr('shared_cache.loads')
+            elif memo[0] != generation:
+                self._sync(kind, memo, generation)
+            return self._memo[kind][1]
+
+    def _sync(self, kind, memo, generation):
+        """Patch a kind's rows with what changed since it was loaded, and notify subscribers"""
+        seen, rows = memo
+        db = self._reader()
+        db.execute("BEGIN")
+        try:
+            changed = db.execute("SELECT key, data FROM records WHERE kind = ? AND generation > ?", (kind, seen)).fetchall()
+            removed = db.execute("SELECT key FROM tombstones WHERE kind = ? AND generation > ?", (kind, seen)).fetchall()
+            generation = int(self._meta(db, 'generation') or 0)
+        finally:
+            db.execute("COMMIT")
+
+        changes = {}
+        for (key,) in removed:
+            if key in rows:
+                changes[key] = (rows.pop(key), None)
+        for key, data in changed:
+            new = json.loads(data)
+            changes[key] = (rows.get(key), new)
+            rows[key] = new
+        memo[0] = generation
+        metrics.incr('shared_cache.synced_rows', len(changes))
+        if changes:
+            for callback in self._subscribers:
+                callback(kind, changes)
+
+    def poll(self):
+        """Pick up another process's refresh for every kind in use; fires subscribers"""
+        for kind in list(self._memo):
+            self.rows(kind)
+
+    def publish(self, version, data):
+        """Write only the rows that changed and the new version in one commit
+
+        Returns {kind: number of rows written or removed}.
+        """
+        counts = {}
+        with self._writer() as db:
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                generation = int(self._meta(db, 'generation') or 0) + 1
+                for kind, rows in data.items():
+                    current = dict(db.execute("SELECT key, hash FROM records WHERE kind = ?", (kind,)))
+                    upserts = []
+                    keys = set()
+                    for row in rows:
+                        key = _key(kind, row)
+                        encoded = json.dumps(row, sort_keys=True)
+                        digest = _hash(encoded)
+                        keys.add(key)
+                        if current.get(key) != digest:
+                            upserts.append((kind, key, digest, generation, encoded))
+                    removed = [(kind, key, generation) for key in current.keys() - keys]
+
+                    db.executemany("INSERT OR REPLACE INTO records (kind, key, hash, generation, data) "
+                                   "VALUES (?, ?, ?, ?, ?)", upserts)
+                    db.executemany("DELETE FROM records WHERE kind = ? AND key = ?", [r[:2] for r in removed])
+                    db.executemany("INSERT OR REPLACE INTO tombstones (kind, key, generation) VALUES (?, ?, ?)", removed)
+                    db.executemany("DELETE FROM tombstones WHERE kind = ? AND key = ?", [u[:2] for u in upserts])
+                    counts[kind] = len(upserts) + len(removed)
+
+                if any(counts.values()):
+                    db.execute("INSERT OR REPLACE INTO meta (k, v) VALUES ('generation', ?)", (str(generation),))
+                db.execute("INSERT OR REPLACE INTO meta (k, v) VALUES ('version', ?)", (version,))
+                db.execute("COMMIT")
+            except Exception:
+                db.execute("ROLLBACK")
+                raise
+        metrics.incr('shared_cache.refreshes')
+        metrics.incr('shared_cache.rows_written', sum(counts.values()))
+        return counts
+
+    def ensure_current(self, api, version=None):
+        """Refresh the cache if the game version changed, with one writer across processes
+
+        Returns the publish() counts if this process did the refresh, else None.
+        Other processes keep reading the previous data meanwhile; only a process
+        with nothing cached waits.
+        """
+        version = version or api._get_version()
+        if self.version() == version:
+            return None
+
+        with open(self.lock_path, 'a+') as lock:
+            if fcntl is not None:
+                try:
+                    fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    if self.version() is not None:
+                        return None
+                    # Nothing to read yet: wait for the writer, then use what it wrote
+                    fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                # Someone else may have finished the refresh while we waited
+                if self.version() == version:
+                    return None
+                return self.publish(version, fetch_static_data(api))
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+class _Closing:
+    """Context manager that closes a connection on exit"""
+
+    def __init__(self, db):
+        self.db = db
+
+    def __enter__(self):
+        return self.db
+
+    def __exit__(self, *exc):
+        self.db.close()
+
+def _build(cls, row):
+    """Wrapper dataclass from an API row, ignoring fields the dataclass doesn't have"""
+    names = {f.name for f in fields(cls)}
+    return cls(**{name: row.get(name) for name in names})
+
+def _with_drops(cls):
+    """Builder for monsters and resources: drops become Drop objects, like the wrapper returns"""
+    def build(row):
+        obj = _build(cls, row)
+        obj.drops = [_build(Drop, drop) for drop in row.get('drops') or []]
+        return obj
+    return build
+
+def _tile(row):
+    content = row.get('content') or {}
+    return Map(row['x'], row['y'], content.get('code'), content.get('type'))
+
+def _drops_item(obj, code):
+    # The wrapper matches drops with LIKE '%code%'
+    return any(code in drop.code for drop in obj.drops or [])
+
+def _craft(item):
+    craft = item.craft
+    return (json.loads(craft) if isinstance(craft, str) else craft) or {}
+
+# The wrapper's list filters per kind, as predicates on built objects
+LEVEL_FILTERS = {
+    'min_level': lambda obj, level: obj.level >= level,
+    'max_level': lambda obj, level: obj.level <= level,
+}
+FILTERS = {
+    'monsters': dict(LEVEL_FILTERS, drop=_drops_item),
+    'resources': dict(LEVEL_FILTERS, drop=_drops_item, skill=lambda resource, skill: resource.skill == skill),
+    'items': dict(
+        LEVEL_FILTERS,
+        name=lambda item, name: name.lower() in (item.name or '').lower(),
+        item_type=lambda item, item_type: item.type == item_type,
+        craft_skill=lambda item, skill: _craft(item).get('skill') == skill,
+        craft_material=lambda item, code: any(code in part['code'] for part in _craft(item).get('items') or []),
+    ),
+    'maps': {
+        'content_code': lambda tile, code: tile.content_code == code,
+        'content_type': lambda tile, content_type: tile.content_type == content_type,
+    },
+}
+
+class _View:
+    """Built objects for one kind, rebuilt only for the rows a refresh changed"""
+
+    def __init__(self, cache, kind, build, fallback=None):
+        self.cache = cache
+        self.kind = kind
+        self.build = build
+        # The wrapper's own accessor, for filters this view doesn't know
+        self.fallback = fallback
+        self.filters = FILTERS[kind]
+        self._objects = {}
+        cache.subscribe(self._on_change)
+
+    def _on_change(self, kind, changes):
+        if kind != self.kind:
+            return
+        for key, (old, new) in changes.items():
+            self._forget(key, old)
+            if new is not None:
+                self._objects[key] = self.build(new)
+
+    def _forget(self, key, old):
+        self._objects.pop(key, None)
+
+    def _all(self):
+        rows = self.cache.rows(self.kind)
+        if len(self._objects) != len(rows):
+            for key, row in rows.items():
+                if key not in self._objects:
+                    self._objects[key] = self.build(row)
+        return self._objects
+
+    def _select(self, objects, filters):
+        """Objects matching every filter; empty filters are ignored, as the wrapper does"""
+        active = {name: value for name, value in filters.items() if value is not None and value != ''}
+        unknown = active.keys() - self.filters.keys()
+        if unknown:
+            if self.fallback is None:
+                raise TypeError(f"Unsupported {self.kind} filters: {', '.join(sorted(unknown))}")
+            return None
+        return [obj for obj in objects if all(self.filters[name](obj, value) for name, value in active.items())]
+
+    def get(self, code=None, **filters):
+        objects = self._all()
+        if code:
+            return objects.get(code)
+        selected = self._select(objects.values(), filters)
+        return self.fallback.get(**filters) if selected is None else selected
+
+class _MapView(_View):
+    def __init__(self, cache, fallback=None):
+        self._by_code = {}
+        super().__init__(cache, 'maps', _tile, fallback)
+
+    def _forget(self, key, old):
+        tile = self._objects.pop(key, None)
+        if tile is not None:
+            self._by_code.get(tile.content_code, {}).pop(key, None)
+
+    def _all(self):
+        tiles = super()._all()
+        if sum(len(keys) for keys in self._by_code.values()) != len(tiles):
+            self._by_code = {}
+            for key, tile in tiles.items():
+                self._by_code.setdefault(tile.content_code, {})[key] = tile
+        return tiles
+
+    def _on_change(self, kind, changes):
+        super()._on_change(kind, changes)
+        if kind == self.kind:
+            for key, (old, new) in changes.items():
+                if new is not None:
+                    tile = self._objects[key]
+                    self._by_code.setdefault(tile.content_code, {})[key] = tile
+
+    def get(self, x=None, y=None, **filters):
+        tiles = self._all()
+        # Both coordinates: the one tile there, like the wrapper
+        if x is not None and y is not None:
+            return tiles.get(f"{x},{y}")
+        if filters.get('content_code') is not None:
+            tiles = self._by_code.get(filters['content_code'], {})
+        tiles = [t for t in tiles.values() if (x is None or t.x == x) and (y is None or t.y == y)]
+        selected = self._select(tiles, filters)
+        return self.fallback.get(x=x, y=y, **filters) if selected is None else selected
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+def get_shared_cache(path=CACHE_FILE):
+    """Process-wide SharedCache for a file, so clients in one process share its rows and views"""
+    with _caches_lock:
+        if path not in _caches:
+            _caches[path] = SharedCache(path)
+        return _caches[path]
+
+def install_shared_cache(api, cache=None):
+    """Serve api.monsters/maps/items/resources from the shared cache"""
+    cache = cache or get_shared_cache()
+    with _caches_lock:
+        views = getattr(cache, 'views', None)
+        if views is None:
+            cache.ensure_current(api)
+            views = cache.views = {
+                'monsters': _View(cache, 'monsters', _with_drops(Monster), api.monsters),
+                'maps': _MapView(cache, api.maps),
+                'items': _View(cache, 'items', lambda row: _build(Item, row), api.items),
+                'resources': _View(cache, 'resources', _with_drops(Resource), api.resources),
+            }
+    for kind, view in views.items():
+        setattr(api, kind, view)
+    api.shared_cache = cache
+    return cache
@@ -0,0 +1,215 @@
+"""
+Simulated World - Deterministic offline stand-in for the character API
+A small early-game world (monsters, map tiles, fights, resting) driven by a
+seeded RNG and a virtual clock, exposing the parts of the API the bot scripts
+use so strategies can be evaluated without touching the server
+"""
+import math
+import random
+from types import SimpleNamespace
+from dataclasses import dataclass
+
+# code, name, level, hp, attack (fire, earth, water, air), res (fire, earth, water, air), gold range, drops
+MONSTER_DATA = [
+    ('chicken', 'Chicken', 1, 60, (0, 0, 4, 0), (0, 0, 0, 0), (0, 3), [('egg', 10), ('feather', 8)]),
+    ('yellow_slime', 'Yellow Slime', 2, 70, (0, 0, 0, 8), (0, 0, 0, 25), (1, 5), [('yellow_slimeball', 5)]),
+    ('green_slime', 'Green Slime', 2, 70, (0, 8, 0, 0), (0, 25, 0, 0), (1, 5), [('green_slimeball', 5)]),
+    ('blue_slime', 'Blue Slime', 3, 70, (0, 0, 8, 0), (0, 0, 25, 0), (1, 6), [('blue_slimeball', 5)]),
+    ('red_slime', 'Red Slime', 4, 70, (8, 0, 0, 0), (25, 0, 0, 0), (2, 7), [('red_slimeball', 5)]),
+    ('cow', 'Cow', 5, 120, (0, 10, 0, 0), (0, 0, 0, 0), (2, 8), [('cowhide', 8), ('milk_bucket', 12)]),
+    ('mushmush', 'Mushmush', 6, 140, (0, 0, 0, 12), (0, 0, 0, 10), (3, 9), [('mushroom', 6)]),
+    ('flying_serpent', 'Flying Serpent', 8, 160, (0, 0, 0, 14), (0, 0, 20, 0), (4, 12), [('serpent_skin', 8)]),
+    ('wolf', 'Wolf', 10, 200, (0, 18, 0, 0), (10, 0, 0, 10), (6, 15), [('wolf_bone', 8), ('wolf_hair', 6)]),
+]
+
+MONSTER_TILES = [
+    (0, 1, 'chicken'), (3, 1, 'chicken'), (4, -1, 'yellow_slime'), (1, -2, 'green_slime'),
+    (2, -1, 'blue_slime'), (1, -1, 'red_slime'), (0, 2, 'cow'), (5, 3, 'mushmush'),
+    (5, 4, 'flying_serpent'), (-2, 1, 'wolf'), (8, 6, 'wolf'),
+]
+
+# Stand-ins for the wrapper's game data classes (same fields), so the simulation
+# runs without importing the wrapper, which needs credentials and creates db/ and logs/
+@dataclass
+class Position:
+    x: int
+    y: int
+
+@dataclass
+class Drop:
+    code: str
+    rate: int
+    min_quantity: int
+    max_quantity: int
+
+@dataclass
+class Map:
+    x: int
+    y: int
+    content_code: str
+    content_type: str
+
+@dataclass
+class Monster:
+    code: str
+    name: str
+    level: int
+    hp: int
+    attack_fire: int
+    attack_earth: int
+    attack_water: int
+    attack_air: int
+    res_fire: int
+    res_earth: int
+    res_water: int
+    res_air: int
+    min_gold: int
+    max_gold: int
+    drops: list
+
+# Virtual cooldowns (seconds)
+MOVE_SECONDS_PER_TILE = 5
+SECONDS_PER_FIGHT_TURN = 2
+MIN_REST_SECONDS = 3
+HP_PER_REST_SECOND = 5
+
+class VirtualClock:
+    """Simulated time that only moves when actions spend cooldown"""
+
+    def __init__(self, start=0.0):
+        self.now = start
+
+    def time(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+class _Monsters:
+    def __init__(self, monsters):
+        self._monsters = monsters
+
+    def get(self, code=None, min_level=None, max_level=None, **filters):
+        if code:
+            return self._monsters.get(code)
+        return [m for m in self._monsters.values()
+                if (min_level is None or m.level >= min_level) and (max_level is None or m.level <= max_level)]
+
+class _Maps:
+    def __init__(self, tiles):
+        self._tiles = tiles
+
+    def get(self, x=None, y=None, content_code=None, content_type=None):
+        return [t for t in self._tiles
+                if (x is None or t.x == x) and (y is None or t.y == y)
+                and (content_code is None or t.content_code == content_code)
+                and (content_type is None or t.content_type == content_type)]
+
+def _new_character(name):
+    """Level 1 character with starter stats"""
+    return SimpleNamespace(
+        name=name, level=1, xp=0, max_xp=150, gold=0, hp=120, max_hp=120, pos=Position(0, 0),
+        attack_fire=0, attack_earth=10, attack_water=0, attack_air=0,
+        dmg_fire=0, dmg_earth=0, dmg_water=0, dmg_air=0,
+        res_fire=0, res_earth=0, res_water=0, res_air=0,
+        task='', task_type='', task_progress=0, task_total=0,
+        inventory=[], inventory_max_items=100, cooldown=0, cooldown_expiration=None,
+    )
+
+class SimulatedAPI:
+    """Deterministic stand-in for a character API client (monsters, maps, move/fight/rest)"""
+
+    def __init__(self, seed=0, name='sim'):
+        self.rng = random.Random(seed)
+        self.clock = VirtualClock()
+        self.char = _new_character(name)
+        self.stats = {'fights': 0, 'wins': 0, 'losses': 0, 'rests': 0, 'moves': 0, 'gold': 0, 'xp': 0}
+
+        monsters = {}
+        for code, name_, level, hp, attack, res, gold, drops in MONSTER_DATA:
+            monsters[code] = Monster(code, name_, level, hp, *attack, *res, gold[0], gold[1],
+                                     [Drop(item, rate, 1, 1) for item, rate in drops])
+        self.monsters = _Monsters(monsters)
+        self.maps = _Maps([Map(x, y, code, 'monster') for x, y, code in MONSTER_TILES])
+        self.actions = SimpleNamespace(move=self.move, fight=self.fight, rest=self.rest)
+
+    def _respond(self, seconds, extra=None):
+        """Spend cooldown on the virtual clock and build a response like the server's"""
+        self.clock.advance(seconds)
+        data = {'cooldown': {'total_seconds': seconds}, 'character': {'hp': self.char.hp}}
+        data.update(extra or {})
+        return {'data': data}
+
+    def move(self, x, y):
+        distance = abs(self.char.pos.x - x) + abs(self.char.pos.y - y)
+        self.char.pos = Position(x, y)
+        self.stats['moves'] += 1
+        return self._respond(max(1, distance) * MOVE_SECONDS_PER_TILE)
+
+    def rest(self):
+        missing = self.char.max_hp - self.char.hp
+        self.char.hp = self.char.max_hp
+        self.stats['rests'] += 1
+        return self._respond(max(MIN_REST_SECONDS, math.ceil(missing / HP_PER_REST_SECOND)))
+
+    def _damage(self, attacker, defender, attacker_is_char):
+        """One turn of damage with a little randomness"""
+        total = 0
+        for element in ('fire', 'earth', 'water', 'air'):
+            attack = getattr(attacker, f'attack_{element}', 0)
+            if attacker_is_char:
+                attack += getattr(attacker, f'dmg_{element}', 0)
+            if attack <= 0:
+                continue
+            resistance = getattr(defender, f'res_{element}', 0)
+            total += max(1, round(attack * (1 - resistance / 100) * self.rng.uniform(0.85, 1.15)))
+        return max(1, total)
+
+    def fight(self):
+        here = [t for t in self.maps.get(x=self.char.pos.x, y=self.char.pos.y) if t.content_type == 'monster']
+        if not here:
+            raise ValueError("No monster on this tile")
+        monster = self.monsters.get(code=here[0].content_code)
+
+        char_hp, monster_hp, turns = self.char.hp, monster.hp, 0
+        while char_hp > 0 and monster_hp > 0 and turns < 100:
+            turns += 1
+            if turns % 2:
+                monster_hp -= self._damage(self.char, monster, True)
+            else:
+                char_hp -= self._damage(monster, self.char, False)
+
+        won = monster_hp <= 0
+        self.stats['fights'] += 1
+        drops = []
+        if won:
+            self.stats['wins'] += 1
+            gold = self.rng.randint(monster.min_gold, monster.max_gold)
+            xp = monster.level * 10
+            for drop in monster.drops:
+                if self.rng.randrange(drop.rate) == 0:
+                    drops.append({'code': drop.code, 'quantity': 1})
+            self.char.hp = char_hp
+            self.char.gold += gold
+            self._gain_xp(xp)
+            self.stats['gold'] += gold
+            self.stats['xp'] += xp
+        else:
+            # Defeat: back to spawn with 1 HP
+            self.stats['losses'] += 1
+            self.char.hp = 1
+            self.char.pos = Position(0, 0)
+            gold = xp = 0
+
+        fight = {'result': 'win' if won else 'lose', 'turns': turns, 'gold': gold, 'xp': xp, 'drops': drops}
+        return self._respond(turns * SECONDS_PER_FIGHT_TURN, {'fight': fight})
+
+    def _gain_xp(self, xp):
+        """Add XP and apply level ups (more HP and attack per level)"""
+        self.char.xp += xp
+        while self.char.xp >= self.char.max_xp:
+            self.char.xp -= self.char.max_xp
+            self.char.level += 1
+            self.char.max_xp = int(self.char.max_xp * 1.25)
+            self.char.max_hp += 5
+            self.char.attack_earth += 2
@@ -2,12 +2,11 @@
 Simple Monster Location Example
 Shows the key concepts for finding and moving to monsters
 """
-from artifactsmmo_wrapper import wrapper, logger
-from config import config
+from artifactsmmo_wrapper import logger
+from api_client import connect
 
 # Setup
-wrapper.token = config.token
-api = wrapper.character(config.character_name)
+api = connect()
 logger.setLevel("INFO")
 
 print("🔍 MONSTER LOCATION LOOKUP GUIDE")
@@ -0,0 +1,102 @@
+"""
+Single Flight - Coalesce identical concurrent lookups
+When several characters in one process ask the same question at the same time
+(the same data GET, or the same monsters/maps lookup), only the first caller
+does the work; the others wait for it and receive a copy of its result
+"""
+import copy
+import threading
+from api_client import endpoint_class, install_middleware
+from metrics import metrics
+
+# Static lookups whose get() calls are coalesced
+LOOKUPS = ('monsters', 'maps', 'items', 'resources')
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    """Runs one call per key at a time and fans its result out to concurrent callers"""
+
+    def __init__(self, name='single_flight'):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.stats = {'executed': 0, 'coalesced': 0}
+
+    def do(self, key, func, share=copy.copy):
+        """Result of func(), shared with every concurrent caller using the same key
+
+        Waiters receive share(result) so they don't mutate each other's copy.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            with self._lock:
+                self.stats['coalesced'] += 1
+            metrics.incr(f'{self.name}.coalesced')
+            if call.error is not None:
+                raise call.error
+            return share(call.result)
+
+        try:
+            call.result = func()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+                self.stats['executed'] += 1
+            metrics.incr(f'{self.name}.executed')
+            call.done.set()
+
+_requests = SingleFlight('single_flight.requests')
+_lookups = SingleFlight('single_flight.lookups')
+
+def _freeze(value):
+    """Hashable form of call arguments"""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+def install_single_flight(api, requests=None, lookups=None):
+    """Coalesce the client's data GETs and static lookups with other clients in the process"""
+    requests = requests or _requests
+    lookups = lookups or _lookups
+    token = api.headers.get('Authorization') if isinstance(getattr(api, 'headers', None), dict) else None
+
+    def middleware(call_next, method, endpoint, **kwargs):
+        # Only reads are shared; character actions always go out on their own
+        if method != 'GET' or endpoint_class(endpoint) != 'data':
+            return call_next(method, endpoint, **kwargs)
+        key = (token, endpoint.strip('/'), _freeze(kwargs))
+        return requests.do(key, lambda: call_next(method, endpoint, **kwargs), share=copy.deepcopy)
+
+    installed = install_middleware(api, 'single_flight', middleware)
+
+    for kind in LOOKUPS:
+        source = getattr(api, kind, None)
+        get = getattr(source, 'get', None)
+        # Lookup objects may be shared between clients (shared cache views): wrap once
+        if get is None or getattr(get, 'single_flight', False):
+            continue
+
+        def coalesced(*args, _get=get, _kind=kind, **kwargs):
+            return lookups.do((_kind, _freeze(args), _freeze(kwargs)), lambda: _get(*args, **kwargs))
+
+        coalesced.single_flight = True
+        source.get = coalesced
+
+    return installed
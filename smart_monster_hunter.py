@@ -2,36 +2,32 @@
 Smart Monster Hunter - Only fights monsters you can actually beat!
 Uses combat analysis instead of just level matching
 """
-from artifactsmmo_wrapper import wrapper, logger
+from artifactsmmo_wrapper import logger
 from config import config
+from api_client import connect
 from combat_calculator import CombatCalculator
+from warmup import warm_up, print_warmup
+from trace_recorder import trace_span
 import time
 
 # Load configuration
-wrapper.token = config.token
-api = wrapper.character(config.character_name)
+api = connect()
 logger.setLevel(config.log_level)
 
 # Create combat calculator
 combat_calc = CombatCalculator(api)
 
 # Health management functions
-def get_health_percentage():
-    """Get current health as a percentage"""
-    if api.char.max_hp == 0:
-        return 100
-    return (api.char.hp / api.char.max_hp) * 100
-
 def needs_healing(threshold=50):
     """Check if character needs healing"""
-    return api.char.hp < api.char.max_hp and get_health_percentage() < threshold
+    return api.char.hp < api.char.max_hp and api.state_mirror.health_percentage() < threshold
 
 def rest_until_healed(target_health_pct=80, max_rest_cycles=10):
     """Rest until health reaches target percentage"""
     if not needs_healing(target_health_pct):
         return True
     
-    print(f"💤 Healing: {api.char.hp}/{api.char.max_hp} ({get_health_percentage():.1f}%) -> {target_health_pct}%")
+    print(f"💤 Healing: {api.char.hp}/{api.char.max_hp} ({api.state_mirror.health_percentage():.1f}%) -> {target_health_pct}%")
     
     cycles = 0
     while api.char.hp < api.char.max_hp and cycles < max_rest_cycles:
@@ -39,9 +35,10 @@ def rest_until_healed(target_health_pct=80, max_rest_cycles=10):
         initial_hp = api.char.hp
         
         try:
-            api.actions.rest()
+            with trace_span('rest', 'action'):
+                api.actions.rest()
             healed = api.char.hp - initial_hp
-            health_pct = get_health_percentage()
+            health_pct = api.state_mirror.health_percentage()
             
             if healed > 0:
                 print(f"   ✅ Rest {cycles}: +{healed} HP ({health_pct:.1f}%)")
@@ -54,14 +51,21 @@ def rest_until_healed(target_health_pct=80, max_rest_cycles=10):
             print(f"   ❌ Rest failed: {e}")
             break
     
-    return get_health_percentage() >= target_health_pct
+    return api.state_mirror.health_percentage() >= target_health_pct
+
+def find_winnable(max_distance, warm=None):
+    """Winnable monsters, read from warm-up data instead of per-monster lookups when given"""
+    if warm is None:
+        return combat_calc.find_winnable_monsters(max_distance=max_distance)
+    return combat_calc.find_winnable_monsters(max_distance=max_distance, monsters=warm['monsters'],
+                                              locations_by_code=warm['locations'])
 
-def smart_hunt(max_distance=15, hunt_count=5):
-    """Intelligently hunt monsters using combat analysis"""
+def smart_hunt(max_distance=15, hunt_count=5, warm=None):
+    """Intelligently hunt monsters using combat analysis (from warm-up data when given)"""
     print(f"🧠 SMART MONSTER HUNTER")
     print("="*50)
     print(f"🎮 Character: {config.character_name} (Level {api.char.level})")
-    print(f"💚 Health: {api.char.hp}/{api.char.max_hp} ({get_health_percentage():.1f}%)")
+    print(f"💚 Health: {api.char.hp}/{api.char.max_hp} ({api.state_mirror.health_percentage():.1f}%)")
     print(f"📍 Position: ({api.char.pos.x}, {api.char.pos.y})")
     
     # Initial health check
@@ -79,7 +83,7 @@ def smart_hunt(max_distance=15, hunt_count=5):
         
         # Find winnable monsters
         print("🔍 Analyzing available monsters...")
-        winnable_monsters = combat_calc.find_winnable_monsters(max_distance=max_distance)
+        winnable_monsters = find_winnable(max_distance, warm)
         
         if not winnable_monsters:
             print("❌ No winnable monsters found nearby!")
@@ -113,16 +117,18 @@ def smart_hunt(max_distance=15, hunt_count=5):
         
         # Move to target
         print(f"🚶 Moving to {monster.name}...")
-        api.actions.move(location.x, location.y)
+        with trace_span('move', 'action'):
+            api.actions.move(location.x, location.y)
         print(f"✅ Arrived at ({api.char.pos.x}, {api.char.pos.y})")
         
         # Fight with confidence!
         print(f"⚔️ Fighting {monster.name} (PREDICTED WIN!)...")
         try:
-            fight_result = api.actions.fight()
+            with trace_span('fight', 'action', monster=monster.code):
+                fight_result = api.actions.fight()
             print("🏆 Victory! As predicted by combat analysis!")
             print(f"💰 Gold: {api.char.gold}")
-            print(f"💚 Post-fight HP: {api.char.hp}/{api.char.max_hp} ({get_health_percentage():.1f}%)")
+            print(f"💚 Post-fight HP: {api.char.hp}/{api.char.max_hp} ({api.state_mirror.health_percentage():.1f}%)")
             
             successful_hunts += 1
             
@@ -136,7 +142,7 @@ def smart_hunt(max_distance=15, hunt_count=5):
             print("🤔 This shouldn't happen with our combat analysis!")
             
             # Emergency healing
-            if get_health_percentage() < 40:
+            if api.state_mirror.health_percentage() < 40:
                 print(f"🚨 Emergency healing...")
                 rest_until_healed(70)
         
@@ -151,7 +157,7 @@ def smart_hunt(max_distance=15, hunt_count=5):
     print(f"   Success Rate: {(successful_hunts/hunt_count)*100:.1f}%")
     print(f"   Final Level: {api.char.level}")
     print(f"   Final Gold: {api.char.gold}")
-    print(f"   Final HP: {api.char.hp}/{api.char.max_hp} ({get_health_percentage():.1f}%)")
+    print(f"   Final HP: {api.char.hp}/{api.char.max_hp} ({api.state_mirror.health_percentage():.1f}%)")
     
     if successful_hunts == hunt_count:
         print("🎉 Perfect hunting session!")
@@ -160,20 +166,25 @@ def smart_hunt(max_distance=15, hunt_count=5):
     else:
         print("😔 No successful hunts - need better equipment or lower level monsters")
 
-def analyze_current_options():
-    """Analyze what monsters are available to fight"""
+def analyze_current_options(warm=None):
+    """Analyze what monsters are available to fight (from warm-up data when given)"""
     print(f"🔍 CURRENT COMBAT OPTIONS")
     print("="*50)
     
     print("📊 Combat Analysis for Nearby Monsters:")
     
     # Test all slimes
+    monsters = {monster.code: monster for monster in warm['monsters']} if warm else {}
     slime_types = ['yellow_slime', 'green_slime', 'blue_slime', 'red_slime']
     for slime in slime_types:
-        combat_calc.print_combat_analysis(slime)
+        analysis = None
+        if warm:
+            analysis = warm['analyses'].get(slime) or (
+                combat_calc.analyze_monster(monsters[slime]) if slime in monsters else None)
+        combat_calc.print_combat_analysis(slime, analysis)
     
     print(f"\n🎯 RECOMMENDED TARGETS:")
-    winnable = combat_calc.find_winnable_monsters(max_distance=20)
+    winnable = find_winnable(20, warm)
     
     if winnable:
         for i, entry in enumerate(winnable[:3], 1):
@@ -197,11 +208,15 @@ if __name__ == "__main__":
     print("Combat Analysis + Health Management = Safe Hunting!")
     print("="*60)
     
+    # Load everything the analysis needs concurrently, then analyze from memory
+    warm = warm_up(api, combat_calc)
+    print_warmup(warm)
+    
     # First, analyze current options
-    analyze_current_options()
+    analyze_current_options(warm)
     
     print(f"\n" + "="*60)
     
     # Then do smart hunting
     print("\n🎯 STARTING SMART HUNT SESSION")
-    smart_hunt(max_distance=20, hunt_count=3) 
\ No newline at end of file
+    smart_hunt(max_distance=20, hunt_count=3, warm=warm) 
\ No newline at end of file
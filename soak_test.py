@@ -0,0 +1,195 @@
+"""
+Soak Test - Long-run memory and latency drift check for the hunt loop
+Runs the hunter's decision loop (speculative planner, target ranker, loot
+index, combat calibration, event log) against the simulated world for many
+simulated hours, sampling tracemalloc, RSS and per-tick decision time, and
+fails when memory grows or decisions slow down beyond the thresholds
+"""
+import gc
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from combat_calculator import CombatCalculator
+from combat_calibration import CombatCalibration
+from drop_value_index import DropValueIndex, PriceCache
+from event_log import EventLog
+from fleet_supervisor import rss_mb
+from sim_world import SimulatedAPI
+from speculative_planner import SpeculativePlanner
+from target_ranker import TargetRanker
+
+# Simulated seconds between samples, and samples skipped while caches fill up
+SAMPLE_EVERY = 3600
+WARMUP_SAMPLES = 1
+
+# Failure thresholds (growth from the first sample after warm-up to the last one)
+MAX_TRACED_GROWTH_MB = 5.0
+MAX_RSS_GROWTH_MB = 50.0
+MAX_DECISION_DRIFT = 2.0        # last p95 / baseline p95
+MIN_DECISION_DRIFT_MS = 1.0     # ...and at least this many ms slower, to ignore timer noise
+
+# Simulated price updates, like the hunter's periodic Grand Exchange refresh
+PRICE_UPDATE_EVERY = 25
+
+# Frames kept per allocation: one is enough to group by call site, and deeper stacks slow the loop a lot
+TRACE_FRAMES = 1
+
+# Frames from the profiler itself are not the loop's allocations
+TRACE_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    tracemalloc.Filter(False, '<unknown>'),
+]
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] if ordered else 0.0
+
+def soak(hours=24.0, seed=0, sample_every=SAMPLE_EVERY, max_traced_growth_mb=MAX_TRACED_GROWTH_MB,
+         max_rss_growth_mb=MAX_RSS_GROWTH_MB, max_decision_drift=MAX_DECISION_DRIFT, top=10):
+    """Run the loop for simulated hours; returns samples, failures and top allocation growth"""
+    workdir = tempfile.mkdtemp(prefix='soak-')
+    api = SimulatedAPI(seed=seed)
+    calibration = CombatCalibration(os.path.join(workdir, 'calibration.json'))
+    combat_calc = CombatCalculator(api, calibration=calibration)
+    loot_index = DropValueIndex(api, prices=PriceCache(os.path.join(workdir, 'prices.json')))
+    # The whole bestiary stays in range: the character soon outlevels the small simulated world
+    ranker = TargetRanker(combat_calc, max_distance=20, value_index=loot_index,
+                          level_range=(1, max(monster.level for monster in api.monsters.get())))
+    planner = SpeculativePlanner(ranker)
+    log = EventLog('soak', path=os.path.join(workdir, 'events.jsonl'), console=False)
+    items = sorted(loot_index.monsters_by_item)
+
+    tracemalloc.start(TRACE_FRAMES)
+    samples = []
+    baseline = None
+    window = []
+    next_sample = sample_every
+    hunts = 0
+    started = time.time()
+
+    try:
+        while api.clock.now < hours * 3600:
+            # The decision: what the hunter does at the top of each hunt
+            tick = time.perf_counter()
+            target = planner.resolve(api.char)
+            if hunts % PRICE_UPDATE_EVERY == 0:
+                changed = set()
+                for code in api.rng.sample(items, min(5, len(items))):
+                    changed |= loot_index.update_price(code, api.rng.randint(1, 50))
+                ranker.invalidate(changed)
+                target = ranker.best()
+            window.append(time.perf_counter() - tick)
+            hunts += 1
+
+            if api.char.hp < api.char.max_hp * 0.6:
+                api.actions.rest()
+                log.debug('rest.cycle', hp=api.char.hp)
+            elif target is None:
+                api.clock.advance(10)
+                log.warning('hunt.no_target', hunt=hunts)
+            else:
+                monster, location, analysis = target['monster'], target['location'], target['analysis']
+                if (api.char.pos.x, api.char.pos.y) != (location.x, location.y):
+                    api.actions.move(location.x, location.y)
+                    log.debug('hunt.moved', x=location.x, y=location.y)
+                hp_before = api.char.hp
+                response = api.actions.fight()
+                loot_index.observe_fight(monster.code, response)
+                if calibration.record(monster, analysis, hp_before, response):
+                    ranker.invalidate([monster.code], reanalyze=True)
+                planner.speculate(planner.predict_after_fight(api.char, analysis))
+                log.info('fight.done', hunt=hunts, monster=monster.code, result=response['data']['fight']['result'])
+
+            if api.clock.now >= next_sample:
+                next_sample += sample_every
+                gc.collect()
+                traced, _ = tracemalloc.get_traced_memory()
+                sample = {
+                    'hour': round(api.clock.now / 3600, 2),
+                    'hunts': hunts,
+                    'traced_mb': traced / 1024 / 1024,
+                    'rss_mb': rss_mb(os.getpid()),
+                    'decision_p50_ms': statistics.median(window) * 1000 if window else 0.0,
+                    'decision_p95_ms': _percentile(window, 0.95) * 1000,
+                    'ticks': len(window),
+                }
+                samples.append(sample)
+                window = []
+                if len(samples) == WARMUP_SAMPLES + 1:
+                    baseline = tracemalloc.take_snapshot().filter_traces(TRACE_FILTERS)
+    finally:
+        planner.close()
+        log.close()
+
+    final = tracemalloc.take_snapshot().filter_traces(TRACE_FILTERS)
+    tracemalloc.stop()
+
+    failures = []
+    top_growth = []
+    measured = samples[WARMUP_SAMPLES:]
+    if len(measured) >= 2:
+        first, last = measured[0], measured[-1]
+        traced_growth = last['traced_mb'] - first['traced_mb']
+        if traced_growth > max_traced_growth_mb:
+            failures.append(f"traced memory grew {traced_growth:.2f}MB (limit {max_traced_growth_mb}MB)")
+        if first['rss_mb'] is not None and last['rss_mb'] is not None:
+            rss_growth = last['rss_mb'] - first['rss_mb']
+            if rss_growth > max_rss_growth_mb:
+                failures.append(f"RSS grew {rss_growth:.1f}MB (limit {max_rss_growth_mb}MB)")
+        slower = last['decision_p95_ms'] - first['decision_p95_ms']
+        if (last['decision_p95_ms'] > first['decision_p95_ms'] * max_decision_drift
+                and slower > MIN_DECISION_DRIFT_MS):
+            failures.append(f"decision p95 drifted {first['decision_p95_ms']:.2f}ms -> "
+                            f"{last['decision_p95_ms']:.2f}ms (limit {max_decision_drift}x)")
+    if baseline is not None:
+        for stat in final.compare_to(baseline, 'lineno')[:top]:
+            if stat.size_diff > 0:
+                top_growth.append(str(stat))
+
+    return {
+        'passed': not failures,
+        'failures': failures,
+        'samples': samples,
+        'top_growth': top_growth,
+        'hunts': hunts,
+        'stats': dict(api.stats),
+        'wall_seconds': time.time() - started,
+    }
+
+def print_report(report):
+    """Samples table, failures and the call sites that grew the most"""
+    print(f"\n📈 SAMPLES")
+    print(f"{'hour':>6} {'hunts':>7} {'traced MB':>10} {'RSS MB':>8} {'p50 ms':>7} {'p95 ms':>7}")
+    for sample in report['samples']:
+        rss = f"{sample['rss_mb']:.1f}" if sample['rss_mb'] is not None else '-'
+        print(f"{sample['hour']:>6} {sample['hunts']:>7} {sample['traced_mb']:>10.2f} {rss:>8} "
+              f"{sample['decision_p50_ms']:>7.3f} {sample['decision_p95_ms']:>7.3f}")
+
+    if report['top_growth']:
+        print(f"\n🔬 TOP ALLOCATION GROWTH (since warm-up):")
+        for line in report['top_growth']:
+            print(f"   {line}")
+
+    print(f"\n   {report['hunts']} hunts, {report['stats']['fights']} fights in {report['wall_seconds']:.1f}s wall time")
+    if report['passed']:
+        print("✅ Soak test passed: memory and decision time stayed flat")
+    else:
+        print("❌ Soak test failed:")
+        for failure in report['failures']:
+            print(f"   • {failure}")
+
+if __name__ == "__main__":
+    # python soak_test.py [simulated hours] [seed]
+    hours = float(sys.argv[1]) if len(sys.argv) > 1 else 24.0
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+
+    print(f"🧪 SOAK TEST")
+    print("="*60)
+    print(f"   {hours:g} simulated hours, seed {seed}, sampling every {SAMPLE_EVERY // 60} simulated minutes")
+    report = soak(hours=hours, seed=seed)
+    print_report(report)
+    sys.exit(0 if report['passed'] else 1)
@@ -0,0 +1,112 @@
+"""
+Speculative Planner - Decide the next hunt target while the current action runs
+Plans against the predicted post-action state on a background worker, then
+validates (or cheaply re-plans) the moment the real state arrives
+"""
+from concurrent.futures import ThreadPoolExecutor
+import copy
+import threading
+from trace_recorder import trace_span
+
+class SpeculativePlanner:
+    """Overlap target selection with action cooldowns using a TargetRanker"""
+
+    def __init__(self, ranker):
+        self.ranker = ranker
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="planner")
+        self._lock = threading.Lock()
+        self._pending = None
+        self.stats = {'speculations': 0, 'hits': 0, 'replans': 0, 'errors': 0}
+
+    def predict_after_fight(self, char, analysis, rest_below=None):
+        """Predicted character snapshot when the next hunt is planned after winning the analyzed fight
+
+        rest_below is the HP percentage under which the hunter rests before its
+        next hunt; resting heals fully, so the prediction is then back at max HP.
+        """
+        predicted = copy.copy(char)
+        # The live character's position changes while the worker plans
+        predicted.pos = copy.copy(char.pos)
+        hp_loss = analysis['monster_damage_per_turn'] * analysis['char_turns_to_kill']
+        predicted.hp = max(1, char.hp - hp_loss)
+        if rest_below is not None and char.max_hp and predicted.hp / char.max_hp * 100 < rest_below:
+            predicted.hp = char.max_hp
+        return predicted
+
+    def predict_after_move(self, char, location):
+        """Predicted character snapshot after moving to a location"""
+        predicted = copy.copy(char)
+        predicted.pos = copy.copy(char.pos)
+        predicted.pos.x, predicted.pos.y = location.x, location.y
+        return predicted
+
+    def speculate(self, predicted_char):
+        """Start planning for the predicted state on the background worker"""
+        # The ranker must have loaded its monster window on the main thread first;
+        # a predicted state keeps the level, so the worker never touches the data cache
+        if self.ranker._levels is None:
+            return
+        self._pending = self._executor.submit(self._plan, predicted_char)
+        self.stats['speculations'] += 1
+
+    def _plan(self, char):
+        """Rank targets for a character snapshot"""
+        with self._lock, trace_span('plan.speculative', 'planning'):
+            self.ranker.update(char)
+            return self.ranker.best()
+
+    def resolve(self, char=None):
+        """Best target for the real state, reusing the speculative plan when it still holds"""
+        if char is None:
+            char = self.ranker.api.char
+
+        speculative = None
+        speculated = self._pending is not None
+        if speculated:
+            try:
+                speculative = self._pending.result()
+            except Exception:
+                self.stats['errors'] += 1
+            self._pending = None
+
+        with self._lock, trace_span('plan.resolve', 'planning', speculated=speculated):
+            self.ranker.update(char)
+            best = self.ranker.best()
+
+        if speculated:
+            if speculative is not None and best is not None and self._same_target(speculative, best):
+                self.stats['hits'] += 1
+            else:
+                self.stats['replans'] += 1
+
+        return best
+
+    def best(self):
+        """Best target from the current ranking, without updating it"""
+        with self._lock:
+            return self.ranker.best()
+
+    def invalidate(self, codes, reanalyze=False):
+        """TargetRanker.invalidate, kept out of the way of a running speculation"""
+        with self._lock:
+            self.ranker.invalidate(codes, reanalyze=reanalyze)
+
+    def invalidate_static(self, codes):
+        """TargetRanker.invalidate_static, kept out of the way of a running speculation"""
+        with self._lock:
+            self.ranker.invalidate_static(codes)
+
+    def read(self, func):
+        """Call func(ranker) while no speculation can change the ranking"""
+        with self._lock:
+            return func(self.ranker)
+
+    def _same_target(self, a, b):
+        """Whether two ranking entries point at the same monster tile"""
+        return (a['monster'].code == b['monster'].code
+                and a['location'].x == b['location'].x
+                and a['location'].y == b['location'].y)
+
+    def close(self):
+        """Stop the background worker"""
+        self._executor.shutdown(wait=False)
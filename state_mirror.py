@@ -0,0 +1,122 @@
+"""
+State Mirror - Local character state kept in sync from action responses
+Applies the character snapshot every action returns instead of re-fetching the
+character after each request, and only does a full fetch on drift or schedule
+"""
+import threading
+import time
+from api_client import endpoint_class, install_middleware
+from cooldown_tracker import parse_timestamp
+from metrics import metrics
+
+# Character fields compared when checking the mirror against a full fetch
+DRIFT_FIELDS = ('hp', 'max_hp', 'gold', 'level', 'xp', 'task', 'task_progress', 'inventory_max_items')
+
+class StateMirror:
+    """Mirror of api.char that is updated from responses rather than extra fetches"""
+
+    def __init__(self, api, refresh_interval=300):
+        self.api = api
+        self.refresh_interval = refresh_interval
+        self._fetch = api.get_character
+        self._local = threading.local()
+        self.stale = False
+        self.last_fetch = time.time()
+        self.last_snapshot = time.time()
+        self.stats = {'snapshots_applied': 0, 'refreshes_skipped': 0, 'full_fetches': 0, 'drift_detected': 0}
+
+    def get_character(self, data=None, character_name=None):
+        """Drop-in for api.get_character that skips the wrapper's automatic refreshes"""
+        if data is not None or character_name is not None:
+            return self._fetch(data=data, character_name=character_name)
+
+        # Called from inside a request: the wrapper refreshing after it, not our own code
+        if getattr(self._local, 'depth', 0) and not self.needs_fetch():
+            self.stats['refreshes_skipped'] += 1
+            metrics.incr('state_mirror.refreshes_skipped')
+            return self.api.char
+
+        return self.refresh()
+
+    def needs_fetch(self):
+        """Whether the mirror is due a full character fetch"""
+        return self.stale or time.time() - self.last_fetch >= self.refresh_interval
+
+    def refresh(self):
+        """Full character fetch, recording any fields that drifted from the mirror"""
+        previous = self.api.char
+        char = self._fetch()
+        self.stats['full_fetches'] += 1
+        metrics.incr('state_mirror.full_fetches')
+
+        drifted = self.diff(previous, char)
+        if drifted:
+            self.stats['drift_detected'] += 1
+            metrics.incr('state_mirror.drift_detected')
+
+        self.stale = False
+        self.last_fetch = self.last_snapshot = time.time()
+        return char
+
+    def diff(self, previous, current):
+        """Names of mirrored fields that differ between two character snapshots"""
+        if previous is None or current is None:
+            return []
+        drifted = [field for field in DRIFT_FIELDS if getattr(previous, field, None) != getattr(current, field, None)]
+        if (previous.pos.x, previous.pos.y) != (current.pos.x, current.pos.y):
+            drifted.append('pos')
+        return drifted
+
+    def apply(self, character_data):
+        """Apply a character snapshot returned by an action"""
+        self._fetch(data=character_data)
+        self.last_snapshot = time.time()
+        self.stats['snapshots_applied'] += 1
+
+    def predicted_cooldown(self, now=None):
+        """Seconds until the character can act again, without asking the server"""
+        expiry = parse_timestamp(getattr(self.api.char, 'cooldown_expiration', None))
+        if expiry is None:
+            return 0.0
+        tracker = getattr(self.api, 'cooldown_tracker', None)
+        offset = tracker.offset if tracker else 0.0
+        return max(0.0, expiry - offset - (now or time.time()))
+
+    def health_percentage(self):
+        """Current health as a percentage"""
+        if self.api.char.max_hp == 0:
+            return 100
+        return (self.api.char.hp / self.api.char.max_hp) * 100
+
+    def middleware(self, call_next, method, endpoint, **kwargs):
+        """Request middleware: apply character snapshots carried by responses"""
+        self._local.depth = getattr(self._local, 'depth', 0) + 1
+        try:
+            response = call_next(method, endpoint, **kwargs)
+        except Exception:
+            # A rejected action means our view of the character may be wrong
+            if endpoint_class(endpoint) == 'actions':
+                self.stale = True
+            raise
+        finally:
+            self._local.depth -= 1
+
+        data = response.get('data') if isinstance(response, dict) else None
+        if isinstance(data, dict) and isinstance(data.get('character'), dict):
+            self.apply(data['character'])
+        elif endpoint_class(endpoint) == 'actions' and self._local.depth == 0:
+            # Action without a snapshot (e.g. "already at destination"): resync now
+            self.refresh()
+        return response
+
+def install_state_mirror(api, refresh_interval=300):
+    """Mirror character state from responses instead of re-fetching after every request"""
+    existing = getattr(api, 'state_mirror', None)
+    if existing is not None:
+        return existing
+
+    mirror = StateMirror(api, refresh_interval=refresh_interval)
+    api.get_character = mirror.get_character
+    install_middleware(api, 'state_mirror', mirror.middleware)
+    api.state_mirror = mirror
+    return mirror
@@ -0,0 +1,253 @@
+"""
+Status Server - Live per-character bot status over Server-Sent Events
+Watches the fleet heartbeat files and pushes only what changed: a client gets
+one full snapshot when it connects, then small delta events, so watching many
+characters costs next to nothing. Cooldowns are sent as their expiry time and
+counted down by the client instead of being re-sent every second
+"""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import collections
+import glob
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from cooldown_tracker import parse_timestamp
+from fleet_supervisor import FLEET_DIR
+
+# How often heartbeat files are checked, and the SSE keep-alive interval (seconds)
+POLL_INTERVAL = 1.0
+KEEPALIVE_SECONDS = 15
+# A character whose heartbeat hasn't changed for this long is shown offline
+OFFLINE_AFTER = 300
+# Window for the gold per hour estimate
+GOLD_WINDOW = 3600
+
+# Events a slow client may have pending before it is dropped
+CLIENT_QUEUE_SIZE = 256
+
+# Local only unless exposed explicitly; browsers may read the stream only from the dashboard's origin
+HOST = '127.0.0.1'
+PUBLIC_HOST = '0.0.0.0'
+ALLOWED_ORIGINS = ('http://localhost:3000', 'http://127.0.0.1:3000')
+
+def character_status(heartbeat, now=None):
+    """Flat status of one character from its heartbeat record"""
+    now = now or time.time()
+    character = heartbeat.get('character') or {}
+    expiry = parse_timestamp(character.get('cooldown_expiration'))
+    return {
+        'phase': heartbeat.get('phase'),
+        'online': now - heartbeat.get('ts', 0) < OFFLINE_AFTER,
+        'level': character.get('level'),
+        'hp': character.get('hp'),
+        'max_hp': character.get('max_hp'),
+        'x': character.get('x'),
+        'y': character.get('y'),
+        'gold': character.get('gold'),
+        'task': character.get('task') or None,
+        'task_progress': character.get('task_progress'),
+        'task_total': character.get('task_total'),
+        'cooldown_until': round(expiry, 1) if expiry else None,
+        'last_action': heartbeat.get('last_action'),
+        'hunts': (heartbeat.get('state') or {}).get('total_hunts'),
+    }
+
+class StatusHub:
+    """Current status per character, fanned out to subscribers as delta events"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.states = {}
+        self.version = 0
+        self._subscribers = set()
+        self._gold = {}
+
+    def _gold_per_hour(self, name, gold, now):
+        """Gold earned per hour over the last GOLD_WINDOW seconds, None until there is a minute of data"""
+        samples = self._gold.setdefault(name, collections.deque())
+        if gold is None:
+            return None
+        # Samples are only kept when gold changes; the oldest one before the window is the baseline
+        if not samples or samples[-1][1] != gold:
+            samples.append((now, gold))
+        while len(samples) > 1 and now - samples[1][0] >= GOLD_WINDOW:
+            samples.popleft()
+        elapsed = min(now - samples[0][0], GOLD_WINDOW)
+        # Rounded so small fluctuations don't produce deltas
+        return round((gold - samples[0][1]) * 3600 / elapsed) if elapsed >= 60 else None
+
+    def update(self, statuses, now=None):
+        """Apply the latest status of each character; publishes one event with all changes"""
+        now = now or time.time()
+        changes = {}
+        with self._lock:
+            for name, status in statuses.items():
+                status['gold_per_hour'] = self._gold_per_hour(name, status.get('gold'), now)
+                previous = self.states.get(name)
+                if previous is None:
+                    changes[name] = status
+                else:
+                    delta = {key: value for key, value in status.items() if previous.get(key) != value}
+                    if delta:
+                        changes[name] = delta
+                self.states[name] = status
+
+            # Characters whose heartbeat disappeared
+            for name in list(self.states):
+                if name not in statuses:
+                    del self.states[name]
+                    self._gold.pop(name, None)
+                    changes[name] = None
+
+            if not changes:
+                return None
+            self.version += 1
+            event = {'v': self.version, 'changes': changes}
+            self._publish('delta', event)
+        return event
+
+    def _publish(self, kind, payload):
+        message = f"event: {kind}\ndata: {json.dumps(payload, separators=(',', ':'))}\n\n"
+        for subscriber in list(self._subscribers):
+            try:
+                subscriber.put_nowait(message)
+            except queue.Full:
+                # Too far behind: drop it, the browser reconnects and gets a fresh snapshot
+                self._subscribers.discard(subscriber)
+                with subscriber.mutex:
+                    subscriber.queue.clear()
+                subscriber.put_nowait(None)
+
+    def subscribe(self):
+        """New subscriber queue, starting with a full snapshot"""
+        subscriber = queue.Queue(maxsize=CLIENT_QUEUE_SIZE)
+        with self._lock:
+            snapshot = {'v': self.version, 'characters': self.states}
+            subscriber.put(f"event: snapshot\ndata: {json.dumps(snapshot, separators=(',', ':'))}\n\n")
+            self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def snapshot(self):
+        with self._lock:
+            return {'v': self.version, 'characters': dict(self.states)}
+
+class HeartbeatWatcher:
+    """Polls a directory of heartbeat files, re-reading only files that changed"""
+
+    def __init__(self, hub, directory=FLEET_DIR, interval=POLL_INTERVAL):
+        self.hub = hub
+        self.directory = directory
+        self.interval = interval
+        self._seen = {}
+        self._statuses = {}
+
+    def poll(self):
+        now = time.time()
+        paths = glob.glob(os.path.join(self.directory, '*.json'))
+        names = set()
+        for path in paths:
+            name = os.path.splitext(os.path.basename(path))[0]
+            names.add(name)
+            try:
+                mtime = os.stat(path).st_mtime
+                if self._seen.get(name) != mtime:
+                    with open(path) as f:
+                        heartbeat = json.load(f)
+                    self._seen[name] = mtime
+                    self._statuses[name] = heartbeat
+            except (OSError, ValueError):
+                continue
+
+        for name in list(self._statuses):
+            if name not in names:
+                del self._statuses[name]
+                self._seen.pop(name, None)
+        return self.hub.update({name: character_status(hb, now) for name, hb in self._statuses.items()}, now)
+
+    def run(self):
+        while True:
+            self.poll()
+            time.sleep(self.interval)
+
+def make_handler(hub, origins=ALLOWED_ORIGINS):
+    class StatusHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def _headers(self, content_type, length=None):
+            self.send_response(200)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Cache-Control', 'no-cache')
+            origin = self.headers.get('Origin')
+            if origin in origins:
+                self.send_header('Access-Control-Allow-Origin', origin)
+                self.send_header('Vary', 'Origin')
+            if length is not None:
+                self.send_header('Content-Length', str(length))
+            self.end_headers()
+
+        def do_GET(self):
+            if self.path.startswith('/events'):
+                self._stream()
+            elif self.path.startswith('/status'):
+                body = json.dumps(hub.snapshot()).encode()
+                self._headers('application/json', len(body))
+                self.wfile.write(body)
+            else:
+                self.send_error(404)
+
+        def _stream(self):
+            self._headers('text/event-stream')
+            subscriber = hub.subscribe()
+            try:
+                while True:
+                    try:
+                        message = subscriber.get(timeout=KEEPALIVE_SECONDS)
+                    except queue.Empty:
+                        message = ": keep-alive\n\n"
+                    if message is None:
+                        return
+                    self.wfile.write(message.encode())
+                    self.wfile.flush()
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+            finally:
+                hub.unsubscribe(subscriber)
+
+        def log_message(self, format, *args):
+            pass
+
+    return StatusHandler
+
+def serve(port=8765, directory=FLEET_DIR, host=HOST, origins=ALLOWED_ORIGINS):
+    """Run the watcher and the SSE server until interrupted"""
+    hub = StatusHub()
+    watcher = HeartbeatWatcher(hub, directory)
+    threading.Thread(target=watcher.run, name='heartbeat-watcher', daemon=True).start()
+    server = ThreadingHTTPServer((host, port), make_handler(hub, origins))
+    server.daemon_threads = True
+    print(f"📡 STATUS SERVER on http://{host}:{port}/events (watching {directory})")
+    if host != HOST:
+        print(f"⚠️  Listening on {host}: anyone who can reach this port can read fleet status")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n👋 Status server stopped.")
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    # python status_server.py [port] [heartbeat directory] [--public] [--origin=URL ...]
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    flags = [arg for arg in sys.argv[1:] if arg.startswith('--')]
+    port = int(args[0]) if args else 8765
+    directory = args[1] if len(args) > 1 else FLEET_DIR
+    host = PUBLIC_HOST if '--public' in flags else HOST
+    origins = ALLOWED_ORIGINS + tuple(flag.split('=', 1)[1] for flag in flags if flag.startswith('--origin='))
+    serve(port, directory, host, origins)
@@ -0,0 +1,131 @@
+"""
+Strategy Tournament - Rank hunting strategy configurations in simulation
+Runs every configuration of a parameter grid against several seeded simulated
+worlds in parallel (one process per CPU) on virtual time, and ranks them by
+gold and XP per simulated hour with 95% confidence intervals
+"""
+from combat_calculator import CombatCalculator, PROB_WEIGHT
+from sim_world import SimulatedAPI, MOVE_SECONDS_PER_TILE, SECONDS_PER_FIGHT_TURN
+import itertools
+import math
+import multiprocessing
+import statistics
+import sys
+import time
+
+# Parameters swept by default (mirrors the knobs of continuous_hunter)
+GRID = {
+    'max_distance': [5, 10, 20, 30],
+    'heal_threshold': [40, 60, 80],
+    'heal_target': [75, 100],
+    'rest_between_hunts': [False, True],
+    'sort_key': ['probability', 'distance', 'gold_rate'],
+}
+
+def strategy_grid(grid=GRID):
+    """Every combination of the grid's values, as config dicts"""
+    keys = list(grid)
+    return [dict(zip(keys, values, strict=True)) for values in itertools.product(*(grid[key] for key in keys))]
+
+def _sort_key(name, entry):
+    """Target ordering for a strategy; lower sorts first"""
+    analysis, distance, monster = entry['analysis'], entry['distance'], entry['monster']
+    if name == 'distance':
+        return (distance, -PROB_WEIGHT[analysis['win_probability']])
+    if name == 'gold_rate':
+        seconds = distance * MOVE_SECONDS_PER_TILE + analysis['char_turns_to_kill'] * 2 * SECONDS_PER_FIGHT_TURN
+        return (-(monster.min_gold + monster.max_gold) / 2 / max(seconds, 1),)
+    # 'probability': continuous_hunter's default ordering
+    return (-PROB_WEIGHT[analysis['win_probability']], distance)
+
+def simulate(config, seed, hours=4.0):
+    """Run one strategy in a simulated world; returns gold/hour, XP/hour and fight stats"""
+    api = SimulatedAPI(seed=seed)
+    calc = CombatCalculator(api)
+    end = hours * 3600
+
+    def health_pct():
+        return api.char.hp / api.char.max_hp * 100
+
+    while api.clock.now < end:
+        if health_pct() < config['heal_threshold']:
+            api.actions.rest()
+            continue
+
+        targets = calc.find_winnable_monsters(max_distance=config['max_distance'])
+        if not targets:
+            # Nothing winnable in reach: same 10 second back-off as the hunter
+            api.clock.advance(10)
+            continue
+        target = min(targets, key=lambda entry: _sort_key(config['sort_key'], entry))
+
+        location = target['location']
+        if (api.char.pos.x, api.char.pos.y) != (location.x, location.y):
+            api.actions.move(location.x, location.y)
+        api.actions.fight()
+
+        if config['rest_between_hunts'] and health_pct() < config['heal_target']:
+            api.actions.rest()
+
+    sim_hours = api.clock.now / 3600
+    return {
+        'gold_per_hour': api.stats['gold'] / sim_hours,
+        'xp_per_hour': api.stats['xp'] / sim_hours,
+        'fights': api.stats['fights'],
+        'losses': api.stats['losses'],
+        'level': api.char.level,
+    }
+
+def _run(job):
+    index, config, seed, hours = job
+    return index, simulate(config, seed, hours)
+
+def _summary(values):
+    """Mean and 95% confidence half-width (normal approximation)"""
+    mean = statistics.fmean(values)
+    if len(values) < 2:
+        return mean, 0.0
+    return mean, 1.96 * statistics.stdev(values) / math.sqrt(len(values))
+
+def run_tournament(configs, seeds=5, hours=4.0, processes=None, metric='gold_per_hour'):
+    """Simulate every config on every seed in parallel; returns results ranked by metric"""
+    jobs = [(i, config, seed, hours) for i, config in enumerate(configs) for seed in range(seeds)]
+    runs = [[] for _ in configs]
+
+    with multiprocessing.Pool(processes=processes) as pool:
+        for index, result in pool.imap_unordered(_run, jobs, chunksize=max(1, len(jobs) // (8 * (processes or multiprocessing.cpu_count())))):
+            runs[index].append(result)
+
+    results = []
+    for config, config_runs in zip(configs, runs, strict=True):
+        entry = {'config': config}
+        for key in ('gold_per_hour', 'xp_per_hour'):
+            entry[key], entry[f'{key}_ci'] = _summary([run[key] for run in config_runs])
+        entry['loss_rate'] = sum(run['losses'] for run in config_runs) / max(1, sum(run['fights'] for run in config_runs))
+        results.append(entry)
+
+    results.sort(key=lambda entry: entry[metric], reverse=True)
+    return results
+
+if __name__ == "__main__":
+    # python strategy_tournament.py [seeds] [simulated hours] [gold_per_hour|xp_per_hour]
+    seeds = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    hours = float(sys.argv[2]) if len(sys.argv) > 2 else 4.0
+    metric = sys.argv[3] if len(sys.argv) > 3 else 'gold_per_hour'
+
+    configs = strategy_grid()
+    print("🏟️ STRATEGY TOURNAMENT")
+    print("="*60)
+    print(f"   {len(configs)} strategies x {seeds} seeds x {hours:g} simulated hours on {multiprocessing.cpu_count()} CPUs")
+
+    started = time.time()
+    results = run_tournament(configs, seeds=seeds, hours=hours, metric=metric)
+    print(f"   Finished in {time.time() - started:.1f}s")
+
+    print(f"\n🏆 TOP 10 by {metric}:")
+    for rank, entry in enumerate(results[:10], 1):
+        config = entry['config']
+        print(f"{rank:2}. gold/h {entry['gold_per_hour']:7.1f} ±{entry['gold_per_hour_ci']:5.1f}   "
+              f"xp/h {entry['xp_per_hour']:7.1f} ±{entry['xp_per_hour_ci']:5.1f}   losses {entry['loss_rate'] * 100:4.1f}%")
+        print(f"    max_distance={config['max_distance']} heal {config['heal_threshold']}%->{config['heal_target']}% "
+              f"rest_between_hunts={config['rest_between_hunts']} sort={config['sort_key']}")
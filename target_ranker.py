@@ -0,0 +1,245 @@
+"""
+Target Ranker - Incremental monster ranking for hunt loops
+Keeps per-monster combat analysis and nearest locations between iterations,
+recomputing only what changed since the last update
+"""
+import heapq
+from combat_calculator import PROB_WEIGHT
+from timings import MOVE_SECONDS_PER_TILE
+
+# Character stats that feed into combat analysis
+COMBAT_STATS = (
+    'level', 'hp', 'max_hp',
+    'attack_fire', 'attack_earth', 'attack_water', 'attack_air',
+    'dmg_fire', 'dmg_earth', 'dmg_water', 'dmg_air',
+    'res_fire', 'res_earth', 'res_water', 'res_air',
+)
+
+def combat_signature(char):
+    """Snapshot of the character stats that affect combat analysis"""
+    return tuple(getattr(char, stat, 0) for stat in COMBAT_STATS)
+
+class TargetRanker:
+    """Keep winnable monsters ranked as the character moves and its stats change"""
+
+    def __init__(self, combat_calc, max_distance=20, level_range=None, value_index=None):
+        self.combat_calc = combat_calc
+        self.api = combat_calc.api
+        self.max_distance = max_distance
+        self.level_range = level_range
+        self.value_index = value_index
+
+        # Per-monster state, keyed by monster code
+        self.monsters = {}
+        self.order = {}
+        self.locations = {}
+        self.analyses = {}
+        self.nearest = {}
+
+        # Heap of (-prob_weight, -loot_per_second, distance, order, code, version); stale entries are skipped lazily
+        self._heap = []
+        self._versions = {}
+        # Current heap key of every valid target; its size is the number of live heap entries
+        self._keys = {}
+
+        self._levels = None
+        self._position = None
+        self._signature = None
+        self.stats = {'reloads': 0, 'distance_updates': 0, 'combat_updates': 0}
+
+    def _level_bounds(self, char):
+        """Monster level window for the character"""
+        if self.level_range is None:
+            return (max(1, char.level - 2), char.level + 1)
+        return tuple(self.level_range)
+
+    def _monsters_in(self, levels):
+        """Monsters in a level window, as a list whatever shape the API returns"""
+        min_level, max_level = levels
+        all_monsters = self.api.monsters.get(min_level=min_level, max_level=max_level)
+        if not hasattr(all_monsters, '__iter__'):
+            all_monsters = [all_monsters] if all_monsters else []
+        return list(all_monsters)
+
+    def _locations_of(self, code):
+        """Map tiles of a monster, as a list"""
+        locations = self.api.maps.get(content_code=code)
+        if locations and not hasattr(locations, '__iter__'):
+            locations = [locations]
+        return list(locations or [])
+
+    def _load_monsters(self, levels):
+        """Load monsters in the level window and their map locations"""
+        self.monsters = {monster.code: monster for monster in self._monsters_in(levels)}
+        self.order = {code: i for i, code in enumerate(self.monsters)}
+
+        for code in self.monsters:
+            if code not in self.locations:
+                self.locations[code] = self._locations_of(code)
+
+        self.analyses = {code: a for code, a in self.analyses.items() if code in self.monsters}
+        self.nearest = {code: n for code, n in self.nearest.items() if code in self.monsters}
+        self.stats['reloads'] += 1
+
+    def _find_nearest(self, code, position):
+        """Closest location of a monster within max_distance"""
+        closest_location = None
+        min_distance = float('inf')
+
+        for location in self.locations.get(code, []):
+            distance = abs(location.x - position[0]) + abs(location.y - position[1])
+            if distance < min_distance and distance <= self.max_distance:
+                min_distance = distance
+                closest_location = location
+
+        return (closest_location, min_distance) if closest_location else None
+
+    def _rank_key(self, code):
+        """Heap key for a monster, or None if it is not a valid target"""
+        analysis = self.analyses.get(code)
+        nearest = self.nearest.get(code)
+        if not analysis or not analysis['can_win'] or not nearest:
+            return None
+        loot = self.value_index.value_per_second(code, nearest[1] * MOVE_SECONDS_PER_TILE) if self.value_index else 0
+        return (-PROB_WEIGHT[analysis['win_probability']], -loot, nearest[1], self.order[code])
+
+    def update(self, char=None):
+        """Sync the ranking with the character's state, touching only what changed"""
+        if char is None:
+            char = self.api.char
+
+        levels = self._level_bounds(char)
+        position = (char.pos.x, char.pos.y)
+        signature = combat_signature(char)
+
+        reload = levels != self._levels
+        if reload:
+            self._load_monsters(levels)
+            self._levels = levels
+
+        dirty = set()
+
+        # Position delta: only distances change
+        if reload or position != self._position:
+            for code in self.monsters:
+                nearest = self._find_nearest(code, position)
+                if nearest != self.nearest.get(code):
+                    self.nearest[code] = nearest
+                    dirty.add(code)
+            self._position = position
+            self.stats['distance_updates'] += 1
+
+        # Stat change: only combat scores change
+        if reload or signature != self._signature:
+            for code, monster in self.monsters.items():
+                analysis = self.combat_calc.analyze_monster(monster, char)
+                previous = self.analyses.get(code)
+                if (previous is None
+                        or previous['can_win'] != analysis['can_win']
+                        or previous['win_probability'] != analysis['win_probability']):
+                    dirty.add(code)
+                self.analyses[code] = analysis
+            self._signature = signature
+            self.stats['combat_updates'] += 1
+
+        if reload:
+            self._rebuild()
+        elif dirty:
+            self._reindex(dirty)
+
+        return len(dirty)
+
+    def _reindex(self, codes):
+        """Push fresh heap entries for monsters whose rank changed"""
+        for code in codes:
+            self._versions[code] = self._versions.get(code, 0) + 1
+            key = self._rank_key(code)
+            if key is None:
+                self._keys.pop(code, None)
+            else:
+                self._keys[code] = key
+
+        # Too many stale entries: a full heapify is cheaper than popping them one by one
+        if len(self._heap) + len(codes) > 2 * max(len(self._keys), 8):
+            self._heapify()
+            return
+
+        for code in codes:
+            if code in self._keys:
+                heapq.heappush(self._heap, self._keys[code] + (code, self._versions[code]))
+
+    def invalidate(self, codes, reanalyze=False):
+        """Re-rank monsters whose score changed outside update() (e.g. new loot prices)
+
+        reanalyze re-runs combat analysis for them first (e.g. after calibration changed).
+        """
+        codes = [code for code in codes if code in self.monsters]
+        if reanalyze:
+            char = self.api.char
+            for code in codes:
+                self.analyses[code] = self.combat_calc.analyze_monster(self.monsters[code], char)
+        if codes:
+            self._reindex(codes)
+
+    def invalidate_static(self, codes):
+        """Reload monsters or locations whose static data changed (e.g. after a game update)"""
+        if self._levels is None:
+            return
+        codes = set(codes)
+        for code in codes:
+            self.locations.pop(code, None)
+
+        # Monsters may have entered or left the level window: reload the window's list
+        current = {monster.code: monster for monster in self._monsters_in(self._levels)}
+        if set(current) != set(self.monsters):
+            self._levels = None
+            self.update()
+            return
+
+        char = self.api.char
+        dirty = [code for code in codes if code in self.monsters]
+        for code in dirty:
+            self.monsters[code] = current[code]
+            self.locations[code] = self._locations_of(code)
+            self.nearest[code] = self._find_nearest(code, self._position)
+            self.analyses[code] = self.combat_calc.analyze_monster(current[code], char)
+        if dirty:
+            self._reindex(dirty)
+
+    def _rebuild(self):
+        """Re-rank every monster and rebuild the heap"""
+        keys = ((code, self._rank_key(code)) for code in self.monsters)
+        self._keys = {code: key for code, key in keys if key is not None}
+        self._heapify()
+
+    def _heapify(self):
+        """Rebuild the heap from the current keys in O(n), dropping stale entries"""
+        self._versions = {code: self._versions.get(code, 0) + 1 for code in self.monsters}
+        self._heap = [key + (code, self._versions[code]) for code, key in self._keys.items()]
+        heapq.heapify(self._heap)
+
+    def _entry(self, code):
+        """Build a ranking entry in the same shape as find_winnable_monsters"""
+        location, distance = self.nearest[code]
+        return {
+            'monster': self.monsters[code],
+            'analysis': self.analyses[code],
+            'location': location,
+            'distance': distance,
+            'loot_value': self.value_index.value_per_kill(code) if self.value_index else None
+        }
+
+    def best(self):
+        """Best target for the current state, or None"""
+        while self._heap:
+            top = self._heap[0]
+            code, version = top[-2], top[-1]
+            if self._versions.get(code) == version:
+                return self._entry(code)
+            heapq.heappop(self._heap)
+        return None
+
+    def ranked(self):
+        """All current targets, best first"""
+        keyed = [(self._rank_key(code), code) for code in self.monsters]
+        return [self._entry(code) for key, code in sorted(k for k in keyed if k[0] is not None)]
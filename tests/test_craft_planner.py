@@ -0,0 +1,79 @@
+"""Craft planning: recipe order, netting against inventory and bank, and drop sources"""
+from types import SimpleNamespace
+from craft_planner import CraftPlanner
+from sim_world import Drop, SimulatedAPI
+
+def _item(code, skill=None, parts=(), quantity=1, level=1):
+    craft = {'skill': skill, 'level': level, 'quantity': quantity,
+             'items': [{'code': part, 'quantity': count} for part, count in parts]} if parts else None
+    return SimpleNamespace(code=code, craft=craft)
+
+ITEMS = [
+    _item('copper', 'mining', [('copper_ore', 10)]),
+    _item('copper_dagger', 'weaponcrafting', [('copper', 6), ('feather', 2)]),
+    _item('feather_cap', 'gearcrafting', [('feather', 5), ('mystery_thread', 1)]),
+    _item('copper_ore'),
+    _item('feather'),
+]
+RESOURCES = [SimpleNamespace(code='copper_rocks', drops=[Drop('copper_ore', 1, 1, 1)])]
+
+def _planner():
+    api = SimulatedAPI(seed=0)
+    return CraftPlanner(api, items=ITEMS, resources=RESOURCES, monsters=api.monsters.get())
+
+def _steps(plan, action):
+    return {step['code']: step for step in plan['steps'] if step['action'] == action}
+
+def test_order_puts_items_before_their_ingredients():
+    order = _planner().order('copper_dagger')
+
+    assert order[0] == 'copper_dagger'
+    assert order.index('copper') < order.index('copper_ore')
+    assert set(order) == {'copper_dagger', 'copper', 'copper_ore', 'feather'}
+
+def test_plan_from_scratch_gathers_fights_then_crafts_deepest_first():
+    plan = _planner().plan('copper_dagger', inventory={}, bank={})
+
+    assert _steps(plan, 'gather')['copper_ore']['quantity'] == 60
+    assert _steps(plan, 'gather')['copper_ore']['source'] == 'copper_rocks'
+    # Chickens drop feathers 1 in 8, the only source in the simulated world
+    feather = _steps(plan, 'fight')['feather']
+    assert (feather['source'], feather['quantity'], feather['actions']) == ('chicken', 2, 16)
+    crafts = [step['code'] for step in plan['steps'] if step['action'] == 'craft']
+    assert crafts == ['copper', 'copper_dagger']
+    assert _steps(plan, 'craft')['copper']['quantity'] == 6
+    assert plan['seconds'] == sum(step['seconds'] for step in plan['steps'])
+    assert plan['missing'] == []
+
+def test_inventory_and_bank_are_used_before_obtaining():
+    plan = _planner().plan('copper_dagger', inventory={'copper': 2, 'feather': 2}, bank={'copper_ore': 15})
+
+    assert _steps(plan, 'withdraw')['copper_ore']['quantity'] == 15
+    assert _steps(plan, 'gather')['copper_ore']['quantity'] == 25
+    assert 'feather' not in _steps(plan, 'fight')
+    assert _steps(plan, 'craft')['copper']['quantity'] == 4
+
+def test_items_without_a_source_are_missing():
+    plan = _planner().plan('feather_cap', inventory={}, bank={})
+
+    assert plan['missing'] == ['mystery_thread']
+    assert 'feather' in _steps(plan, 'fight')
+
+def test_gathering_is_preferred_over_better_monster_drops():
+    api = SimulatedAPI(seed=0)
+    # A slow feather bush still beats the chicken's drop, however likely
+    bush = SimpleNamespace(code='feather_bush', drops=[Drop('feather', 20, 1, 1)])
+    chicken = SimpleNamespace(code='chicken', drops=[Drop('feather', 1, 1, 1)])
+    planner = CraftPlanner(api, items=ITEMS, resources=RESOURCES + [bush], monsters=[chicken])
+
+    assert planner.sources['feather']['source'] == 'feather_bush'
+    assert planner.sources['copper_ore']['action'] == 'gather'
+
+def test_craft_sends_the_quantity_through_the_executor():
+    planner = _planner()
+    sent = []
+    planner.api._make_request = lambda method, endpoint, json=None, source=None: sent.append((endpoint, json))
+    executor = SimpleNamespace(run=lambda name, func, *args, **kwargs: {'ok': True, 'result': func(*args, **kwargs)})
+
+    assert planner.craft(executor, 'copper', 6)['ok']
+    assert sent == [('my/sim/action/crafting', {'code': 'copper', 'quantity': 6})]
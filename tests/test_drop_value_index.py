@@ -0,0 +1,46 @@
+"""Loot prices: unsold items keep the default value and failed fetches keep the cache"""
+import pytest
+from api_client import ApiError
+from drop_value_index import DropValueIndex, PriceCache
+from sim_world import SimulatedAPI
+
+class _Exchange:
+    def __init__(self, orders):
+        self.orders = orders
+
+    def get_sell_orders(self, item_code):
+        orders = self.orders.get(item_code)
+        if isinstance(orders, Exception):
+            raise orders
+        return orders
+
+def _index(tmp_path, orders):
+    api = SimulatedAPI(seed=0)
+    api.ge = _Exchange(orders)
+    return DropValueIndex(api, prices=PriceCache(str(tmp_path / 'prices.json')))
+
+def test_unsold_items_keep_the_default_value(tmp_path):
+    index = _index(tmp_path, {'feather': [{'price': 40}], 'egg': []})
+    index.refresh_prices()
+
+    assert index.value_of('feather') == 40
+    assert index.value_of('egg') == 1
+    assert index.prices.stale(['egg']) == []  # checked, not re-fetched every refresh
+
+    # Nobody selling it any more: back to the default
+    gold = index.value_per_kill('chicken') - index.drops['chicken']['feather'] * 40
+    index.update_price('feather', None)
+    assert index.value_of('feather') == 1
+    assert index.value_per_kill('chicken') == pytest.approx(gold)
+
+def test_failed_fetches_keep_the_cached_price(tmp_path):
+    index = _index(tmp_path, {'feather': ApiError(503, "unavailable")})
+    index.update_price('feather', 40)
+    index.prices.prices['feather']['updated'] = 0
+
+    index.refresh_prices()
+    assert index.value_of('feather') == 40
+
+    index.api.ge = _Exchange({'feather': ValueError("bug")})
+    with pytest.raises(ValueError):
+        index.refresh_prices()
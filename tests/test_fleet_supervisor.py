@@ -0,0 +1,63 @@
+"""Heartbeats and stall detection: no action within N x the cooldown, or no productive action"""
+import os
+import time
+from types import SimpleNamespace
+from fleet_supervisor import FleetSupervisor, Heartbeat, MIN_STALL_SECONDS, STALL_FACTOR, STARTUP_GRACE
+from sim_world import SimulatedAPI
+
+def _worker(tmp_path):
+    supervisor = FleetSupervisor(['sim'], directory=str(tmp_path), progress_timeout=900)
+    worker = supervisor.workers[0]
+    # This process stands in for the worker: the heartbeat carries its pid
+    worker.process = SimpleNamespace(pid=os.getpid())
+    worker.started = time.time()
+    return supervisor, worker, Heartbeat(worker.heartbeat_path)
+
+def _act(heartbeat, api, action):
+    """Send a simulated action through the heartbeat middleware"""
+    return heartbeat.middleware(lambda method, endpoint, **kwargs: getattr(api, action)(), 'POST',
+                                f"my/sim/action/{action}")
+
+def test_fresh_worker_gets_a_startup_grace(tmp_path):
+    supervisor, worker, heartbeat = _worker(tmp_path)
+    now = time.time()
+
+    assert supervisor.stall_reason(worker, now) is None
+    assert supervisor.stall_reason(worker, now + STARTUP_GRACE + 1) == 'no first action'
+
+def test_no_action_within_the_cooldown_limit_is_a_stall(tmp_path):
+    supervisor, worker, heartbeat = _worker(tmp_path)
+    api = SimulatedAPI()
+    api.char.pos.x, api.char.pos.y = 0, 1
+    _act(heartbeat, api, 'fight')
+
+    beat = worker.heartbeat()
+    assert beat['last_action'] == 'fight' and beat['cooldown'] > 0
+    limit = max(MIN_STALL_SECONDS, STALL_FACTOR * beat['cooldown'])
+    last = beat['last_action_ts']
+    assert supervisor.stall_reason(worker, last + limit - 1) is None
+    assert supervisor.stall_reason(worker, last + limit + 1).startswith('no action for')
+
+def test_only_rests_and_moves_is_a_stall(tmp_path):
+    supervisor, worker, heartbeat = _worker(tmp_path)
+    api = SimulatedAPI()
+    heartbeat.record['started'] = time.time() - supervisor.progress_timeout - 10
+
+    # Actions keep coming, but none of them is productive
+    _act(heartbeat, api, 'rest')
+    beat = worker.heartbeat()
+    assert beat['last_progress_ts'] is None
+    assert supervisor.stall_reason(worker, beat['last_action_ts'] + 1).startswith('no progress for')
+
+    # A fight is progress
+    api.char.pos.x, api.char.pos.y = 0, 1
+    _act(heartbeat, api, 'fight')
+    beat = worker.heartbeat()
+    assert supervisor.stall_reason(worker, beat['last_action_ts'] + 1) is None
+
+def test_heartbeat_of_another_process_is_ignored(tmp_path):
+    supervisor, worker, heartbeat = _worker(tmp_path)
+    heartbeat.beat('fight', 5)
+    worker.process = SimpleNamespace(pid=os.getpid() + 1)
+
+    assert worker.heartbeat() is None
@@ -0,0 +1,51 @@
+"""Bank trips: gold above the reserve is deposited with the items and failed requests don't raise"""
+from types import SimpleNamespace
+from api_client import ApiError
+from inventory_manager import InventoryManager
+
+class _BankAPI:
+    """Character at a bank tile whose bank requests can be made to fail"""
+
+    def __init__(self, fail=None, fail_code=500):
+        self.fail = fail
+        self.fail_code = fail_code
+        self.requests = []
+        self.char = SimpleNamespace(name='tester', gold=500, pos=SimpleNamespace(x=4, y=1),
+                                    inventory=[SimpleNamespace(code='egg', quantity=3)])
+        self.maps = SimpleNamespace(get=lambda **filters: [SimpleNamespace(x=4, y=1)])
+
+    def _make_request(self, method, endpoint, json=None, source=None):
+        self.requests.append(endpoint)
+        if self.fail and endpoint.endswith(self.fail):
+            raise ApiError(self.fail_code, "bank error")
+        return {'data': {}}
+
+def test_gold_above_the_reserve_is_deposited():
+    api = _BankAPI()
+    inventory = InventoryManager(api)
+    assert inventory.bank_trip()
+    assert api.requests[-1].endswith('/deposit/gold')
+    assert inventory.stats['gold_deposited'] == 500
+
+    inventory = InventoryManager(api, keep_gold=100)
+    assert inventory.bank_trip()
+    assert inventory.stats['gold_deposited'] == 400
+
+    api.requests.clear()
+    assert InventoryManager(api, keep_gold=None).bank_trip()
+    assert not any(endpoint.endswith('/gold') for endpoint in api.requests)
+
+def test_failed_deposit_fails_the_trip_without_raising():
+    inventory = InventoryManager(_BankAPI(fail='/deposit/item'))
+
+    assert inventory.bank_trip() is False
+    assert inventory.stats['bank_trips'] == 0
+    result = inventory.deposit_all()
+    assert not result['ok'] and isinstance(result['error'], ApiError)
+
+def test_bulk_endpoint_missing_falls_back_to_single_requests():
+    inventory = InventoryManager(_BankAPI(fail='/withdraw/item', fail_code=404))
+
+    result = inventory.withdraw_items([{'code': 'egg', 'quantity': 1}, {'code': 'feather', 'quantity': 2}])
+    assert result == {'ok': True, 'actions': 2, 'error': None}
+    assert inventory.bulk_withdraw is False
@@ -0,0 +1,41 @@
+"""Pipeline crafter: finishing once the target is banked, and what reaches the board"""
+from types import SimpleNamespace
+import pipeline
+from craft_planner import CraftPlanner
+from sim_world import SimulatedAPI
+
+def _item(code, skill=None, parts=()):
+    craft = {'skill': skill, 'level': 1, 'quantity': 1,
+             'items': [{'code': part, 'quantity': count} for part, count in parts]} if parts else None
+    return SimpleNamespace(code=code, craft=craft)
+
+ITEMS = [_item('copper_dagger', 'weaponcrafting', [('copper', 6)]), _item('copper', 'mining', [('copper_ore', 10)]),
+         _item('copper_ore')]
+
+def _crafter(tmp_path, monkeypatch, bank):
+    api = SimulatedAPI(seed=0)
+    api._make_request = lambda method, endpoint, json=None, source=None: {'data': {}}
+    monkeypatch.setattr(pipeline, 'CraftPlanner', lambda api: CraftPlanner(api, items=ITEMS, resources=[], monsters=[]))
+    monkeypatch.setattr(pipeline, 'bank_contents', lambda api: dict(bank))
+    board = pipeline.PipelineBoard(str(tmp_path / 'board.json'))
+    return pipeline.Worker(api, 'crafter', board, target='copper_dagger', quantity=1)
+
+def test_crafter_finishes_when_the_target_is_banked(tmp_path, monkeypatch):
+    worker = _crafter(tmp_path, monkeypatch, {'copper_dagger': 1})
+    monkeypatch.setattr(worker, '_idle', lambda: (_ for _ in ()).throw(AssertionError("crafter idled")))
+
+    assert worker.run_crafter() is True
+
+def test_crafter_deposits_are_not_reported(tmp_path, monkeypatch):
+    worker = _crafter(tmp_path, monkeypatch, {})
+    worker.board.publish({'steps': [{'action': 'gather', 'code': 'copper_ore', 'source': 'copper_rocks',
+                                     'quantity': 60, 'seconds': 60}], 'inputs': [], 'missing': []}, {})
+    worker.api.char.inventory = [SimpleNamespace(code='copper_ore', quantity=10)]
+    monkeypatch.setattr(worker.inventory, 'bank_trip', lambda: True)
+
+    assert worker._bank()
+    assert worker.board.snapshot()['orders']['copper_ore']['remaining'] == 60
+
+    worker.role = 'gatherer'
+    assert worker._bank()
+    assert worker.board.snapshot()['orders']['copper_ore']['remaining'] == 50
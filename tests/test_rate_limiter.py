@@ -0,0 +1,70 @@
+"""Rate limiting on the shared transport: one token per HTTP request, 429 backoff, file writes"""
+from types import SimpleNamespace
+import rate_limiter
+from http_transport import Transport
+from rate_limiter import RateLimiter, SharedFileBucket
+
+class _Limiter(RateLimiter):
+    """Limiter that records what the transport asked of it instead of sleeping"""
+
+    def __init__(self):
+        super().__init__(limits={'actions': (1, 5), 'data': (10, 20)})
+        self.calls = []
+
+    def acquire(self, cls):
+        self.calls.append(('acquire', cls))
+        return 0.0
+
+    def backoff(self, cls, retry_after=None):
+        self.calls.append(('backoff', cls, retry_after))
+        return super().backoff(cls, retry_after)
+
+def _transport(statuses, limiter):
+    transport = Transport()
+    transport.limiter = limiter
+    responses = iter(statuses)
+
+    def request(method, url, timeout=None, **kwargs):
+        status, headers = next(responses)
+        return SimpleNamespace(status_code=status, headers=headers, content=b'{}', request=SimpleNamespace(body=None))
+    transport.session.request = request
+    return transport
+
+def test_every_request_takes_one_token_of_its_class():
+    limiter = _Limiter()
+    transport = _transport([(200, {}), (200, {})], limiter)
+
+    transport.request('POST', 'https://api.example.com/my/tester/action/fight')
+    transport.request('GET', 'https://api.example.com/monsters?page=2')
+
+    assert limiter.calls == [('acquire', 'actions'), ('acquire', 'data')]
+
+def test_429_backs_off_at_once_and_success_clears_strikes():
+    limiter = _Limiter()
+    transport = _transport([(429, {'Retry-After': '3'}), (200, {})], limiter)
+    bucket = limiter.buckets['actions']
+
+    transport.request('POST', 'https://api.example.com/my/tester/action/fight')
+    assert limiter.calls[-1] == ('backoff', 'actions', 3.0)
+    assert bucket.strikes() == 1 and transport.take_retry_after() == 3.0
+
+    transport.request('POST', 'https://api.example.com/my/tester/action/fight')
+    assert bucket.strikes() == 0
+
+def test_shared_bucket_only_writes_when_state_changes(tmp_path, monkeypatch):
+    bucket = SharedFileBucket(1, 5, str(tmp_path / 'rate_limit.json'), 'actions')
+    bucket.reserve()
+    writes = []
+    dumps = rate_limiter.json.dumps
+    monkeypatch.setattr(rate_limiter.json, 'dumps', lambda data: writes.append(data) or dumps(data))
+
+    # Reading the count and clearing a zero count leave the file alone
+    assert bucket.strikes() == 0
+    bucket.clear_strikes()
+    assert writes == []
+
+    bucket.block(1)
+    assert bucket.strikes() == 1
+    bucket.clear_strikes()
+    assert bucket.strikes() == 0
+    assert len(writes) == 2
@@ -0,0 +1,155 @@
+"""Shared cache views: wrapper-shaped objects, list filters and incremental refreshes"""
+import importlib
+from types import SimpleNamespace
+import pytest
+
+VERSION = '1.0'
+
+MONSTERS = [
+    {'code': 'chicken', 'name': 'Chicken', 'level': 1, 'hp': 60, 'min_gold': 0, 'max_gold': 3,
+     'drops': [{'code': 'egg', 'rate': 10, 'min_quantity': 1, 'max_quantity': 1}]},
+    {'code': 'wolf', 'name': 'Wolf', 'level': 10, 'hp': 200, 'min_gold': 6, 'max_gold': 15,
+     'drops': [{'code': 'wolf_bone', 'rate': 8, 'min_quantity': 1, 'max_quantity': 1}]},
+]
+RESOURCES = [
+    {'code': 'copper_rocks', 'name': 'Copper Rocks', 'skill': 'mining', 'level': 1,
+     'drops': [{'code': 'copper_ore', 'rate': 1, 'min_quantity': 1, 'max_quantity': 1}]},
+    {'code': 'ash_tree', 'name': 'Ash Tree', 'skill': 'woodcutting', 'level': 1,
+     'drops': [{'code': 'ash_wood', 'rate': 1, 'min_quantity': 1, 'max_quantity': 1}]},
+]
+ITEMS = [
+    {'code': 'copper_ore', 'name': 'Copper Ore', 'type': 'resource', 'level': 1, 'craft': None},
+    {'code': 'copper', 'name': 'Copper', 'type': 'resource', 'level': 1,
+     'craft': {'skill': 'mining', 'level': 1, 'quantity': 1, 'items': [{'code': 'copper_ore', 'quantity': 10}]}},
+]
+MAPS = [
+    {'x': 0, 'y': 1, 'content': {'code': 'chicken', 'type': 'monster'}},
+    {'x': 2, 'y': 0, 'content': {'code': 'copper_rocks', 'type': 'resource'}},
+    {'x': 4, 'y': 1, 'content': {'code': 'bank', 'type': 'bank'}},
+]
+
+@pytest.fixture
+def shared_cache(tmp_path, monkeypatch):
+    # Importing the wrapper creates db/ and logs/ in the working directory
+    monkeypatch.chdir(tmp_path)
+    pytest.importorskip('artifactsmmo_wrapper')
+    return importlib.import_module('shared_cache')
+
+@pytest.fixture
+def cache(shared_cache, tmp_path):
+    cache = shared_cache.SharedCache(str(tmp_path / 'cache.db'))
+    cache.publish(VERSION, {'monsters': MONSTERS, 'resources': RESOURCES, 'items': ITEMS, 'maps': MAPS})
+    return cache
+
+class _Wrapped:
+    """The wrapper accessor a view falls back to; records what it was asked"""
+
+    def __init__(self):
+        self.calls = []
+
+    def get(self, *args, **filters):
+        self.calls.append(filters)
+        return ['from wrapper']
+
+def _api(shared_cache, cache):
+    api = SimpleNamespace(_get_version=lambda: VERSION, monsters=_Wrapped(), resources=_Wrapped(),
+                          items=_Wrapped(), maps=_Wrapped())
+    shared_cache.install_shared_cache(api, cache)
+    return api
+
+def test_monster_and_resource_drops_are_drop_objects(shared_cache, cache):
+    from artifactsmmo_wrapper.game_data_classes import Drop, Monster, Resource
+    api = _api(shared_cache, cache)
+
+    monster = api.monsters.get('chicken')
+    resource = api.resources.get('copper_rocks')
+
+    assert type(monster) is Monster and type(resource) is Resource
+    assert type(monster.drops[0]) is Drop and monster.drops[0].code == 'egg'
+    assert type(resource.drops[0]) is Drop and resource.drops[0].code == 'copper_ore'
+
+    # Rebuilt after a refresh, the drops keep their shape
+    changed = dict(RESOURCES[0], drops=[{'code': 'tin_ore', 'rate': 2, 'min_quantity': 1, 'max_quantity': 1}])
+    cache.publish('1.1', {'resources': [changed, RESOURCES[1]]})
+    cache.poll()
+    resource = api.resources.get('copper_rocks')
+    assert type(resource.drops[0]) is Drop and resource.drops[0].code == 'tin_ore'
+
+def test_gathering_engine_values_cached_resources(shared_cache, cache):
+    from gathering_engine import GatheringEngine
+    api = _api(shared_cache, cache)
+    engine = GatheringEngine(api)
+
+    assert engine.expected_value(api.resources.get('copper_rocks')) > 0
+
+def test_list_filters_apply(shared_cache, cache):
+    api = _api(shared_cache, cache)
+
+    assert [m.code for m in api.monsters.get(min_level=5)] == ['wolf']
+    assert [m.code for m in api.monsters.get(max_level=5)] == ['chicken']
+    assert [m.code for m in api.monsters.get(drop='bone')] == ['wolf']
+    assert [r.code for r in api.resources.get(skill='mining')] == ['copper_rocks']
+    assert [r.code for r in api.resources.get(drop='ash')] == ['ash_tree']
+    assert [i.code for i in api.items.get(craft_material='copper_ore')] == ['copper']
+    assert [i.code for i in api.items.get(craft_skill='mining')] == ['copper']
+    assert sorted(i.code for i in api.items.get(name='copper')) == ['copper', 'copper_ore']
+    # Empty filters are ignored, like the wrapper's
+    assert len(api.items.get(name='', max_level=None)) == 2
+
+    assert [(t.x, t.y) for t in api.maps.get(content_type='bank')] == [(4, 1)]
+    assert [(t.x, t.y) for t in api.maps.get(content_code='chicken')] == [(0, 1)]
+    assert [t.content_code for t in api.maps.get(y=1, content_type='monster')] == ['chicken']
+    # Both coordinates name one tile
+    assert api.maps.get(x=2, y=0).content_code == 'copper_rocks'
+    assert api.maps.get(x=9, y=9) is None
+
+def test_unknown_filters_fall_through_to_wrapper(shared_cache, cache):
+    api = _api(shared_cache, cache)
+
+    assert api.items.get(subtype='mob') == ['from wrapper']
+    assert api.items.fallback.calls == [{'subtype': 'mob'}]
+
+    view = shared_cache._View(cache, 'items', lambda row: row)
+    with pytest.raises(TypeError):
+        view.get(subtype='mob')
+
+def test_refresh_writes_only_changed_rows_and_tombstones(shared_cache, cache):
+    changes = []
+    cache.rows('monsters')
+    cache.subscribe(lambda kind, diff: changes.append((kind, diff)))
+    generation = cache.generation()
+
+    # Same data: nothing written, generation unchanged
+    assert cache.publish('1.1', {'monsters': MONSTERS}) == {'monsters': 0}
+    assert cache.generation() == generation
+
+    # One monster changed, one removed, one added
+    chicken = dict(MONSTERS[0], hp=65)
+    cow = {'code': 'cow', 'name': 'Cow', 'level': 5, 'hp': 120, 'min_gold': 2, 'max_gold': 8, 'drops': []}
+    assert cache.publish('1.2', {'monsters': [chicken, cow]}) == {'monsters': 3}
+    assert cache.generation() == generation + 1
+
+    cache.poll()
+    [(kind, diff)] = changes
+    assert kind == 'monsters'
+    assert diff['chicken'] == (MONSTERS[0], chicken)
+    assert diff['wolf'] == (MONSTERS[1], None)
+    assert diff['cow'] == (None, cow)
+    assert set(cache.rows('monsters')) == {'chicken', 'cow'}
+
+    # A removed row that comes back clears its tombstone
+    cache.publish('1.3', {'monsters': [chicken, cow, MONSTERS[1]]})
+    cache.poll()
+    assert changes[-1][1] == {'wolf': (None, MONSTERS[1])}
+    assert shared_cache.changed_codes('monsters', changes[-1][1]) == {'wolf'}
+
+def test_view_follows_incremental_refresh(shared_cache, cache):
+    api = _api(shared_cache, cache)
+    assert api.maps.get(content_code='bank')
+
+    moved = {'x': 5, 'y': 1, 'content': {'code': 'bank', 'type': 'bank'}}
+    cache.publish('1.1', {'maps': MAPS[:2] + [moved]})
+    cache.poll()
+
+    assert [(t.x, t.y) for t in api.maps.get(content_code='bank')] == [(5, 1)]
+    assert api.maps.get(x=4, y=1) is None
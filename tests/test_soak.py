@@ -0,0 +1,10 @@
+"""Short soak run: the hunt loop's memory and decision time stay flat on the simulated world"""
+from soak_test import soak
+
+def test_short_soak_stays_flat():
+    report = soak(hours=4, seed=1, sample_every=1800)
+
+    assert report['passed'], report['failures']
+    # Warm-up sample plus enough measured samples to compare first and last
+    assert len(report['samples']) >= 3
+    assert report['stats']['fights'] > 0
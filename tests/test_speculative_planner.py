@@ -0,0 +1,54 @@
+"""Speculative planning: predictions that match the state the next hunt starts from"""
+from combat_calculator import CombatCalculator
+from sim_world import SimulatedAPI
+from speculative_planner import SpeculativePlanner
+from target_ranker import TargetRanker
+
+def _planner(seed=0):
+    api = SimulatedAPI(seed=seed)
+    ranker = TargetRanker(CombatCalculator(api), max_distance=10)
+    ranker.update()
+    return api, SpeculativePlanner(ranker)
+
+def test_prediction_includes_the_rest_before_the_next_hunt():
+    api, planner = _planner()
+    target = planner.best()
+
+    predicted = planner.predict_after_fight(api.char, target['analysis'], rest_below=80)
+    assert predicted.hp == api.char.max_hp
+    assert api.char.hp == api.char.max_hp  # the real snapshot is untouched
+    assert predicted.pos is not api.char.pos  # nor shared with the main thread
+
+    # Without a rest the damage taken stays in the prediction
+    assert planner.predict_after_fight(api.char, target['analysis']).hp < api.char.max_hp
+    planner.close()
+
+def test_speculation_hits_after_fight_and_rest():
+    api, planner = _planner()
+    target = planner.resolve()
+    location = target['location']
+    api.actions.move(location.x, location.y)
+    planner.resolve()
+
+    planner.speculate(planner.predict_after_fight(api.char, target['analysis'], rest_below=80))
+    api.actions.fight()
+    api.actions.rest()
+
+    planner._pending.result()
+    hits = planner.stats['hits']
+    combat_updates = planner.ranker.stats['combat_updates']
+
+    # The real state matches the speculated one: no combat re-analysis when resolving
+    assert planner.resolve() is not None
+    assert planner.stats['hits'] == hits + 1
+    assert planner.ranker.stats['combat_updates'] == combat_updates
+    planner.close()
+
+def test_ranker_changes_go_through_the_planner():
+    api, planner = _planner()
+    best = planner.best()
+
+    planner.invalidate([best['monster'].code], reanalyze=True)
+    assert planner.best()['monster'].code == best['monster'].code
+    assert planner.read(lambda ranker: ranker is planner.ranker)
+    planner.close()
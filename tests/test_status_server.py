@@ -0,0 +1,113 @@
+"""Status events: one snapshot per client, then deltas with only the changed fields"""
+import json
+from fleet_supervisor import Heartbeat
+from sim_world import SimulatedAPI
+from status_server import CLIENT_QUEUE_SIZE, GOLD_WINDOW, HeartbeatWatcher, StatusHub, make_handler
+
+def _event(message):
+    """Event kind and payload of an SSE message"""
+    kind, data = message.strip().split('\n')
+    return kind.removeprefix('event: '), json.loads(data.removeprefix('data: '))
+
+def test_snapshot_then_deltas_of_changed_fields():
+    hub = StatusHub()
+    hub.update({'alice': {'hp': 100, 'x': 0, 'gold': 5}}, now=1000)
+    subscriber = hub.subscribe()
+
+    kind, snapshot = _event(subscriber.get_nowait())
+    assert kind == 'snapshot'
+    assert snapshot['characters']['alice']['hp'] == 100
+
+    hub.update({'alice': {'hp': 80, 'x': 0, 'gold': 5}}, now=1001)
+    kind, delta = _event(subscriber.get_nowait())
+    assert kind == 'delta'
+    assert delta == {'v': snapshot['v'] + 1, 'changes': {'alice': {'hp': 80}}}
+
+    # Nothing changed: no event at all
+    assert hub.update({'alice': {'hp': 80, 'x': 0, 'gold': 5}}, now=1002) is None
+    assert subscriber.empty()
+
+def test_new_and_removed_characters():
+    hub = StatusHub()
+    hub.update({'alice': {'hp': 100}}, now=1000)
+    subscriber = hub.subscribe()
+    subscriber.get_nowait()
+
+    hub.update({'bob': {'hp': 50}}, now=1001)
+    _, delta = _event(subscriber.get_nowait())
+    assert delta['changes'] == {'bob': {'hp': 50, 'gold_per_hour': None}, 'alice': None}
+
+def test_gold_per_hour_follows_the_window_when_gold_stops_changing():
+    hub = StatusHub()
+    hub.update({'alice': {'gold': 0}}, now=1000)
+    hub.update({'alice': {'gold': 100}}, now=2800)
+    assert hub.states['alice']['gold_per_hour'] == 200
+
+    # No more gold: the rate keeps falling as the window slides past the earnings
+    hub.update({'alice': {'gold': 100}}, now=4600)
+    assert hub.states['alice']['gold_per_hour'] == 100
+    hub.update({'alice': {'gold': 100}}, now=2800 + GOLD_WINDOW)
+    assert hub.states['alice']['gold_per_hour'] == 0
+
+def test_cors_only_for_allowed_origins():
+    class Handler(make_handler(StatusHub())):
+        def __init__(self, origin):
+            self.headers = {'Origin': origin} if origin else {}
+            self.sent = {}
+
+        def send_response(self, code):
+            pass
+
+        def send_header(self, key, value):
+            self.sent[key] = value
+
+        def end_headers(self):
+            pass
+
+    def allowed(origin):
+        handler = Handler(origin)
+        handler._headers('application/json')
+        return handler.sent.get('Access-Control-Allow-Origin')
+
+    assert allowed('http://localhost:3000') == 'http://localhost:3000'
+    assert allowed('http://evil.example') is None
+    assert allowed(None) is None
+
+def test_slow_subscriber_is_dropped():
+    hub = StatusHub()
+    subscriber = hub.subscribe()
+    for hp in range(CLIENT_QUEUE_SIZE + 1):
+        hub.update({'alice': {'hp': hp}}, now=1000 + hp)
+
+    # Cleared and closed: the browser reconnects for a fresh snapshot
+    assert subscriber.get_nowait() is None
+    assert subscriber not in hub._subscribers
+
+def test_watcher_streams_simulated_actions(tmp_path):
+    hub = StatusHub()
+    watcher = HeartbeatWatcher(hub, str(tmp_path))
+    heartbeat = Heartbeat(str(tmp_path / 'sim.json'))
+    api = SimulatedAPI(name='sim')
+
+    def act(action):
+        def call(method, endpoint, **kwargs):
+            response = getattr(api, action)()
+            response['data']['character'] = {'name': 'sim', 'hp': api.char.hp, 'x': api.char.pos.x,
+                                              'y': api.char.pos.y, 'gold': api.char.gold}
+            return response
+        heartbeat.middleware(call, 'POST', f"my/sim/action/{action}")
+
+    act('rest')
+    watcher.poll()
+    subscriber = hub.subscribe()
+    _, snapshot = _event(subscriber.get_nowait())
+    assert snapshot['characters']['sim']['last_action'] == 'rest'
+
+    api.move(0, 1)
+    act('fight')
+    watcher._seen.clear()  # heartbeat writes within one mtime tick
+    assert watcher.poll() is not None
+    _, delta = _event(subscriber.get_nowait())
+    changes = delta['changes']['sim']
+    assert changes['last_action'] == 'fight'
+    assert 'level' not in changes  # unchanged fields are left out
@@ -0,0 +1,79 @@
+"""Incremental target ranking on the simulated world: heap order and lazy stale entries"""
+from combat_calculator import CombatCalculator, PROB_WEIGHT
+from sim_world import SimulatedAPI, Position
+from target_ranker import TargetRanker
+
+def _ranker(max_distance=10, **kwargs):
+    api = SimulatedAPI(seed=0)
+    ranker = TargetRanker(CombatCalculator(api), max_distance=max_distance, **kwargs)
+    ranker.update()
+    return api, ranker
+
+def test_best_matches_full_ranking():
+    api, ranker = _ranker()
+    ranked = ranker.ranked()
+
+    assert ranked and ranker.best()['monster'].code == ranked[0]['monster'].code
+    keys = [(-PROB_WEIGHT[e['analysis']['win_probability']], e['distance']) for e in ranked]
+    assert keys == sorted(keys)
+
+def test_stale_entries_are_skipped_after_a_move():
+    api, ranker = _ranker()
+    first = ranker.best()
+
+    # Move next to a different winnable monster: the old entries go stale
+    other = next(entry for entry in ranker.ranked()[1:]
+                 if entry['analysis']['win_probability'] == first['analysis']['win_probability'])
+    api.char.pos = Position(other['location'].x, other['location'].y)
+    assert ranker.update() > 0
+
+    best = ranker.best()
+    assert best['monster'].code == ranker.ranked()[0]['monster'].code
+    assert best['distance'] == 0
+    # Entries left in the heap are either current or get skipped by best()
+    live = [entry for entry in ranker._heap if ranker._versions.get(entry[-2]) == entry[-1]]
+    assert len(live) == len(ranker._keys)
+
+def test_unchanged_state_touches_nothing():
+    api, ranker = _ranker()
+    stats = dict(ranker.stats)
+
+    assert ranker.update() == 0
+    assert ranker.stats == stats
+
+def test_target_out_of_range_drops_out():
+    api, ranker = _ranker(max_distance=0)
+
+    assert ranker.best() is None
+    api.char.pos = Position(0, 1)  # a chicken tile
+    ranker.update()
+    assert ranker.best()['monster'].code == 'chicken'
+
+def test_invalidate_rebuilds_or_pushes_without_losing_order():
+    api, ranker = _ranker()
+    codes = list(ranker.monsters)
+    for _ in range(10):
+        ranker.invalidate(codes)
+
+    # Repeated invalidations never let the heap grow past twice the live entries
+    assert len(ranker._heap) <= 2 * max(len(ranker._keys), 8)
+    assert ranker.best()['monster'].code == ranker.ranked()[0]['monster'].code
+
+def test_invalidate_only_reranks_the_given_codes():
+    api, ranker = _ranker()
+    ranked = []
+    rank_key = ranker._rank_key
+    ranker._rank_key = lambda code: ranked.append(code) or rank_key(code)
+
+    code = next(iter(ranker.monsters))
+    ranker.invalidate([code])
+    assert ranked == [code]
+
+def test_invalidate_static_accepts_a_single_monster():
+    api, ranker = _ranker(level_range=(1, 1))
+    [chicken] = api.monsters.get(min_level=1, max_level=1)
+    # The wrapper returns a bare object when only one monster matches
+    api.monsters.get = lambda **filters: chicken
+
+    ranker.invalidate_static(['chicken'])
+    assert ranker.best()['monster'].code == 'chicken'
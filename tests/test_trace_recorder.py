@@ -0,0 +1,17 @@
+"""Trace recorder: a trace file that can't be written drops events instead of raising"""
+import shutil
+from trace_recorder import TraceRecorder
+
+def test_close_counts_an_unwritable_flush_as_dropped(tmp_path):
+    directory = tmp_path / 'logs'
+    recorder = TraceRecorder(str(directory / 'trace.json'))
+    # Writer already gone (as when close's join times out), so close flushes the queue itself
+    recorder._stop.set()
+    recorder._writer.join()
+    recorder._stop.clear()
+    shutil.rmtree(directory)
+    recorder.instant('marker', 'test')
+    queued = recorder._queue.qsize()
+
+    recorder.close()  # runs at exit: must not raise
+    assert queued and recorder.stats['dropped'] == queued
@@ -0,0 +1,16 @@
+"""
+Timings - Cooldown estimates shared by the planners and rankers
+Used until real observations come in (each ranker learns its own from responses)
+"""
+
+# Move cooldown per tile of Manhattan distance
+MOVE_SECONDS_PER_TILE = 5
+
+# One gather, one fight, one crafted unit, one bank deposit/withdraw
+DEFAULT_GATHER_SECONDS = 25
+FIGHT_SECONDS = 20
+CRAFT_SECONDS_PER_UNIT = 5
+BANK_SECONDS = 3
+
+# Accepting or turning in a task at a task master
+TASK_ACTION_SECONDS = 3
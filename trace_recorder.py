@@ -0,0 +1,233 @@
+"""
+Trace Recorder - Chrome/Perfetto timeline of every bot's actions and waits
+Spans for actions, API calls, HTTP round trips, cooldown waits, rate-limit
+stalls and planning go to a bounded queue and a background writer appends
+them to one trace file shared by all bot processes (Trace Event Format, JSON
+array). Each process is a track named after its characters, each thread a
+row, so overlaps and idle gaps across the fleet show up side by side in
+chrome://tracing or ui.perfetto.dev
+"""
+import atexit
+import contextlib
+import fcntl
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from api_client import endpoint_class, install_middleware
+from config import config
+from metrics import metrics
+
+# Events waiting for the writer before new ones are dropped (the bot never blocks on tracing)
+TRACE_BUFFER = 10000
+
+# The writer appends a batch once this many events are queued, or after FLUSH_SECONDS
+FLUSH_EVENTS = 500
+FLUSH_SECONDS = 1.0
+
+# Waits shorter than this (seconds) are not worth a span
+MIN_WAIT_SECONDS = 0.001
+
+class TraceRecorder:
+    """Per-process trace event producer with a bounded buffer and a streaming writer"""
+
+    def __init__(self, path, buffer_size=TRACE_BUFFER):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.pid = os.getpid()
+        self.characters = []
+        self.stats = {'events': 0, 'dropped': 0, 'flushes': 0}
+        self._named_threads = set()
+        self._lock = threading.Lock()
+        self._queue = queue.Queue(maxsize=buffer_size)
+        self._stop = threading.Event()
+        self._writer = threading.Thread(target=self._run, name='trace-writer', daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+        self._put({'ph': 'M', 'name': 'process_name', 'pid': self.pid, 'tid': 0,
+                   'args': {'name': os.path.basename(sys.argv[0]) or 'python'}})
+
+    def _put(self, event):
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self.stats['dropped'] += 1
+            metrics.incr('trace.dropped')
+            return
+        self.stats['events'] += 1
+
+    def _emit(self, event):
+        """Queue an event on the calling thread's row, naming the row the first time"""
+        tid = threading.get_native_id()
+        if tid not in self._named_threads:
+            with self._lock:
+                self._named_threads.add(tid)
+            self._put({'ph': 'M', 'name': 'thread_name', 'pid': self.pid, 'tid': tid,
+                       'args': {'name': threading.current_thread().name}})
+        event['pid'] = self.pid
+        event['tid'] = tid
+        self._put(event)
+
+    def add_character(self, name):
+        """Label this process's track with the characters it runs"""
+        with self._lock:
+            if name in self.characters:
+                return
+            self.characters.append(name)
+            label = ', '.join(self.characters)
+        self._put({'ph': 'M', 'name': 'process_name', 'pid': self.pid, 'tid': 0, 'args': {'name': label}})
+
+    def complete(self, name, cat, start, duration, **args):
+        """Record a span that already happened (start is epoch seconds)"""
+        event = {'ph': 'X', 'name': name, 'cat': cat, 'ts': round(start * 1e6), 'dur': round(duration * 1e6)}
+        if args:
+            event['args'] = args
+        self._emit(event)
+
+    @contextlib.contextmanager
+    def span(self, name, cat, **args):
+        """Time the block as one span; the yielded dict becomes the span's args"""
+        start = time.time()
+        started = time.perf_counter()
+        try:
+            yield args
+        finally:
+            self.complete(name, cat, start, time.perf_counter() - started, **args)
+
+    def instant(self, name, cat, **args):
+        """Record a point-in-time marker on the calling thread's row"""
+        event = {'ph': 'i', 's': 't', 'name': name, 'cat': cat, 'ts': round(time.time() * 1e6)}
+        if args:
+            event['args'] = args
+        self._emit(event)
+
+    def _write(self, batch):
+        """Append a batch to the shared file; the first writer opens the JSON array"""
+        lines = ',\n'.join(json.dumps(event, default=str, separators=(',', ':')) for event in batch)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0, os.SEEK_END)
+                # No closing bracket: other processes keep appending, and the viewers accept it
+                f.write(('[\n' if f.tell() == 0 else ',\n') + lines)
+                f.flush()
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+        self.stats['flushes'] += 1
+
+    def _drain(self, limit):
+        batch = []
+        while len(batch) < limit:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while not self._stop.is_set():
+            deadline = time.monotonic() + FLUSH_SECONDS
+            while self._queue.qsize() < FLUSH_EVENTS and time.monotonic() < deadline and not self._stop.is_set():
+                self._stop.wait(0.05)
+            batch = self._drain(FLUSH_EVENTS)
+            if batch:
+                self._flush(batch)
+
+    def _flush(self, batch):
+        """Write a batch, counting it as dropped if the file can't be written"""
+        try:
+            self._write(batch)
+        except OSError:
+            self.stats['dropped'] += len(batch)
+            metrics.incr('trace.dropped', len(batch))
+
+    def close(self):
+        """Stop the writer and flush everything still queued"""
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        self._writer.join(timeout=5)
+        batch = self._drain(self._queue.qsize() + 1)
+        while batch:
+            self._flush(batch)
+            batch = self._drain(FLUSH_EVENTS)
+
+_recorder = None
+_recorder_lock = threading.Lock()
+
+def get_trace_recorder():
+    """Process-wide recorder writing to TRACE_FILE, or None when tracing is off"""
+    global _recorder
+    if not config.trace_file:
+        return None
+    with _recorder_lock:
+        if _recorder is None:
+            _recorder = TraceRecorder(config.trace_file)
+        return _recorder
+
+def trace_span(name, cat, **args):
+    """Context manager timing a block as a span; a no-op when tracing is off"""
+    recorder = get_trace_recorder()
+    return recorder.span(name, cat, **args) if recorder else contextlib.nullcontext(args)
+
+def trace_wait(name, cat, start, duration, **args):
+    """Record a wait that already happened, if it was long enough to matter"""
+    recorder = get_trace_recorder()
+    if recorder and duration >= MIN_WAIT_SECONDS:
+        recorder.complete(name, cat, start, duration, **args)
+
+def install_tracer(api):
+    """Trace every API call of a character client, from its middleware to the response"""
+    recorder = get_trace_recorder()
+    if recorder is None:
+        return None
+    recorder.add_character(api.char.name)
+
+    def tracer(call_next, method, endpoint, **kwargs):
+        with recorder.span(f"{method} /{endpoint.strip('/')}", endpoint_class(endpoint)) as args:
+            try:
+                return call_next(method, endpoint, **kwargs)
+            except Exception as e:
+                args['error'] = getattr(e, 'code', None) or type(e).__name__
+                raise
+
+    install_middleware(api, 'tracer', tracer)
+    return recorder
+
+def load_trace(path):
+    """Events of a trace file, closing the array the writers leave open"""
+    with open(path, encoding='utf-8') as f:
+        text = f.read().rstrip().rstrip(',')
+    if not text:
+        return []
+    return json.loads(text if text.endswith(']') else text + '\n]')
+
+def summarize(events):
+    """Total span seconds per track and category (nested spans count in each)"""
+    names = {}
+    totals = {}
+    for event in events:
+        if event.get('ph') == 'M' and event.get('name') == 'process_name':
+            names[event['pid']] = event['args']['name']
+        elif event.get('ph') == 'X':
+            per_cat = totals.setdefault(event['pid'], {})
+            per_cat[event['cat']] = per_cat.get(event['cat'], 0.0) + event['dur'] / 1e6
+    return {names.get(pid, str(pid)): per_cat for pid, per_cat in totals.items()}
+
+if __name__ == "__main__":
+    # python trace_recorder.py [trace file]
+    path = sys.argv[1] if len(sys.argv) > 1 else (config.trace_file or 'logs/trace.json')
+    events = load_trace(path)
+    print(f"🧵 TRACE SUMMARY: {path} ({len(events)} events)")
+    print("="*60)
+    for track, per_cat in sorted(summarize(events).items()):
+        print(f"\n🎮 {track}")
+        for cat, seconds in sorted(per_cat.items(), key=lambda item: -item[1]):
+            print(f"   {cat:<12} {seconds:>10.1f}s")
+    print(f"\n💡 Open {path} in https://ui.perfetto.dev or chrome://tracing for the timeline")
@@ -0,0 +1,101 @@
+"""
+Warm-up - Concurrent startup fetches before the first decision
+Bank, inventory and static game data are fetched at the same time on a small
+thread pool instead of one after another, the lookup indexes are built from
+the results, and the time from process start to the first action is recorded
+"""
+from concurrent.futures import ThreadPoolExecutor
+import time
+from api_client import endpoint_class, install_middleware
+from craft_planner import bank_contents
+from metrics import metrics
+
+# Importing this module early in a script marks the start of the process
+PROCESS_START = time.time()
+
+# Concurrent startup fetches (the rate limiter still paces them)
+WARMUP_WORKERS = 6
+
+def install_first_action_probe(api, started=PROCESS_START):
+    """Record startup.time_to_first_action when the first character action is sent"""
+    sent = []
+
+    def probe(call_next, method, endpoint, **kwargs):
+        if not sent and endpoint_class(endpoint) == 'actions':
+            sent.append(True)
+            seconds = time.time() - started
+            metrics.gauge('startup.time_to_first_action', seconds)
+            metrics.observe('startup.time_to_first_action', seconds)
+        return call_next(method, endpoint, **kwargs)
+
+    return install_middleware(api, 'first_action_probe', probe)
+
+def _as_list(result):
+    if result is None:
+        return []
+    return list(result) if hasattr(result, '__iter__') else [result]
+
+def warm_up(api, combat_calc=None, ranker=None, workers=WARMUP_WORKERS):
+    """Fetch everything the first decision needs concurrently and build the indexes
+
+    Returns {'char', 'inventory', 'bank', 'monsters', 'maps', 'items', 'resources',
+    'locations', 'analyses', 'seconds'}. Static data is only fetched off the main
+    thread when it comes from the shared cache: the wrapper's own sqlite cache is
+    a single connection that must stay on the thread that created it.
+    """
+    started = time.time()
+    install_first_action_probe(api)
+
+    static = {
+        'monsters': lambda: _as_list(api.monsters.get()),
+        'maps': lambda: _as_list(api.maps.get()),
+        'items': lambda: _as_list(api.items.get()),
+        'resources': lambda: _as_list(api.resources.get()),
+    }
+    concurrent_static = getattr(api, 'shared_cache', None) is not None
+
+    warm = {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {'bank': pool.submit(bank_contents, api)}
+        if api.char is None:
+            futures['char'] = pool.submit(api.get_character)
+        if concurrent_static:
+            futures.update({name: pool.submit(fetch) for name, fetch in static.items()})
+        else:
+            warm.update({name: fetch() for name, fetch in static.items()})
+
+        for name, future in futures.items():
+            try:
+                warm[name] = future.result()
+            except Exception as e:
+                print(f"⚠️  Warm-up fetch '{name}' failed: {e}")
+                warm[name] = {} if name == 'bank' else []
+
+    warm['char'] = warm.get('char') or api.char
+    warm['inventory'] = {slot.code: slot.quantity for slot in getattr(warm['char'], 'inventory', None) or []
+                         if getattr(slot, 'code', None)}
+
+    # Indexes the first decision reads
+    locations = {}
+    for tile in warm['maps']:
+        if tile.content_code:
+            locations.setdefault(tile.content_code, []).append(tile)
+    warm['locations'] = locations
+
+    warm['analyses'] = {}
+    if combat_calc is not None:
+        level = warm['char'].level
+        for monster in warm['monsters']:
+            if max(1, level - 2) <= monster.level <= level + 1:
+                warm['analyses'][monster.code] = combat_calc.analyze_monster(monster, warm['char'])
+    if ranker is not None:
+        ranker.update(warm['char'])
+
+    warm['seconds'] = time.time() - started
+    metrics.observe('startup.warmup_seconds', warm['seconds'])
+    return warm
+
+def print_warmup(warm):
+    """One-line summary of what the warm-up loaded"""
+    print(f"🔥 Warm-up: {len(warm['monsters'])} monsters, {len(warm['maps'])} tiles, {len(warm['items'])} items, "
+          f"{len(warm['bank'])} bank stacks in {warm['seconds']:.2f}s")